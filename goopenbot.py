@@ -14,6 +14,8 @@ from src.goopenbot.commands.run import run_command
 from src.goopenbot.commands.models import models_command
 from src.goopenbot.commands.session import session_command
 from src.goopenbot.commands.agent import agent_command
+from src.goopenbot.commands.batch import batch_command
+from src.goopenbot.commands.serve import serve_command
 from src.goopenbot.core.provider import check_ollama_connection, print_welcome
 from src.goopenbot.core.config import load_config
 
@@ -33,26 +35,33 @@ def run(
     session_id: str = typer.Option(None, "--session", "-s", help="Continue a specific session"),
     model: str = typer.Option(None, "--model", "-m", help="Model to use"),
     dir: str = typer.Option(None, "--dir", "-d", help="Working directory"),
+    repo_map: bool = typer.Option(
+        None, "--repo-map/--no-repo-map", help="Add a map of the repository to the system prompt"
+    ),
+    agent: str = typer.Option(None, "--agent", "-a", help="Run as the agent defined in agents/<name>.md"),
 ):
     """Run goopenbot with a message (main command)."""
-    asyncio.run(run_command(message, continue_session, session_id, model, dir))
+    asyncio.run(run_command(message, continue_session, session_id, model, dir, repo_map, agent))
 
 
 @app.command()
 def models(
     refresh: bool = typer.Option(False, "--refresh", help="Refresh model list"),
+    stats: bool = typer.Option(False, "--stats", help="Show per-model latency and tool success"),
 ):
     """List available models from Ollama."""
-    asyncio.run(models_command(refresh))
+    asyncio.run(models_command(refresh, stats))
 
 
 @app.command()
 def session(
     list_sessions: bool = typer.Option(False, "--list", "-l", help="List all sessions"),
     delete: str = typer.Option(None, "--delete", help="Delete a session by ID"),
+    rollback: str = typer.Option(None, "--rollback", help="Restore files changed by a session by ID"),
+    to: int = typer.Option(0, "--to", help="Turn to roll back to (0 = before the session)"),
 ):
     """Manage sessions."""
-    asyncio.run(session_command(list_sessions, delete))
+    asyncio.run(session_command(list_sessions, delete, rollback, to))
 
 
 @app.command()
@@ -65,6 +74,27 @@ def agent(
     asyncio.run(agent_command(list_agents, create, name))
 
 
+@app.command()
+def batch(
+    tasks_file: str = typer.Argument(..., help="JSONL file with one task per line"),
+    output: str = typer.Option(None, "--output", "-o", help="Results file (default: <tasks>.results.jsonl)"),
+    concurrency: int = typer.Option(None, "--concurrency", "-j", help="Tasks to run at once"),
+    timeout: int = typer.Option(None, "--timeout", help="Seconds allowed per task"),
+    resume: bool = typer.Option(False, "--resume", help="Skip tasks that already succeeded"),
+):
+    """Run many tasks from a JSONL file in one process."""
+    asyncio.run(batch_command(tasks_file, output, concurrency, timeout, resume))
+
+
+@app.command()
+def serve():
+    """Keep models, sessions and indexes warm for run, session and models."""
+    try:
+        asyncio.run(serve_command())
+    except KeyboardInterrupt:
+        console.print("\n[dim]Daemon stopped[/dim]")
+
+
 @app.callback(invoke_without_command=True)
 def main(ctx: typer.Context):
     """goopenbot - AI-powered development tool."""
@@ -74,6 +104,8 @@ def main(ctx: typer.Context):
         console.print("  python goopenbot.py run <message>    Run with a message")
         console.print("  python goopenbot.py models          List available models")
         console.print("  python goopenbot.py session --list  List sessions")
+        console.print("  python goopenbot.py batch <file>    Run tasks from a JSONL file")
+        console.print("  python goopenbot.py serve           Keep goopenbot warm for faster commands")
         console.print("  python goopenbot.py --help          Show this help")
 
 
@@ -4,5 +4,7 @@ from .run import run_command
 from .models import models_command
 from .session import session_command
 from .agent import agent_command
+from .batch import batch_command
+from .serve import serve_command
 
-__all__ = ["run_command", "models_command", "session_command", "agent_command"]
+__all__ = ["run_command", "models_command", "session_command", "agent_command", "batch_command", "serve_command"]
@@ -37,6 +37,7 @@ tools:
   - bash
   - glob
   - grep
+max_iterations: 50
 ---
 
 # {name} Agent
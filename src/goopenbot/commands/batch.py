@@ -0,0 +1,60 @@
+"""Batch command - run many tasks from a JSONL file."""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+from rich.console import Console
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.goopenbot.core.batch import load_tasks, run_batch
+from src.goopenbot.core.provider import check_ollama_connection
+from src.goopenbot.commands.run import build_system_prompt
+
+console = Console()
+
+
+async def batch_command(
+    tasks_file: str,
+    output: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    timeout: Optional[int] = None,
+    resume: bool = False,
+):
+    """Run every task in a JSONL file and write JSONL results."""
+    if not await check_ollama_connection():
+        console.print("[red]Error: Cannot connect to Ollama[/red]")
+        console.print("[yellow]Make sure Ollama is running: ollama serve[/yellow]")
+        return
+
+    tasks_path = Path(tasks_file)
+    try:
+        tasks = load_tasks(tasks_path)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return
+
+    output_path = Path(output) if output else tasks_path.with_suffix(".results.jsonl")
+
+    def report(result):
+        style = "green" if result["status"] == "ok" else "red"
+        console.print(
+            f"[{style}]{result['status']:>7}[/{style}] {result['id']} "
+            f"[dim]({result['duration_s']:.1f}s, "
+            f"{result['prompt_tokens'] + result['completion_tokens']} tokens)[/dim]"
+        )
+
+    results = await run_batch(
+        tasks, output_path, build_system_prompt, concurrency, timeout, resume, on_result=report
+    )
+    failed = sum(1 for result in results if result["status"] != "ok")
+    skipped = len(tasks) - len(results)
+    console.print(
+        f"\n{len(results) - failed} succeeded, {failed} failed"
+        + (f", {skipped} already done" if skipped else "")
+        + f" - results in {output_path}"
+    )
+    if failed:
+        console.print("[dim]Re-run with --resume to retry only the failed tasks[/dim]")
@@ -9,19 +9,35 @@ from rich.table import Table
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.goopenbot.core.provider import OllamaProvider, check_ollama_connection
+from src.goopenbot.core.client import open_client
+from src.goopenbot.core.router import ModelStatsStore
 
 console = Console()
 
 
-async def models_command(refresh: bool = False):
+async def models_command(refresh: bool = False, stats: bool = False):
     """List available models from Ollama."""
-    if not await check_ollama_connection():
-        console.print("[red]Error: Cannot connect to Ollama[/red]")
-        console.print("[yellow]Make sure Ollama is running: ollama serve[/yellow]")
+    if stats:
+        print_model_stats()
         return
 
-    provider = OllamaProvider()
-    models = await provider.list_models()
+    client = await open_client()
+    if client is not None:
+        # The daemon keeps the model list for a while
+        try:
+            reply = await client.call("models", refresh=refresh)
+        except (RuntimeError, ConnectionError) as e:
+            console.print(f"[red]Error: {e}[/red]")
+            return
+        models, current = reply["models"], reply["model"]
+    else:
+        if not await check_ollama_connection():
+            console.print("[red]Error: Cannot connect to Ollama[/red]")
+            console.print("[yellow]Make sure Ollama is running: ollama serve[/yellow]")
+            return
+
+        provider = OllamaProvider()
+        models, current = await provider.list_models(), provider.model
 
     if not models:
         console.print("[yellow]No models found[/yellow]")
@@ -36,4 +52,35 @@ async def models_command(refresh: bool = False):
         table.add_row(model["name"], model["id"])
 
     console.print(table)
-    console.print(f"\n[dim]Using model: {provider.model}[/dim]")
+    console.print(f"\n[dim]Using model: {current}[/dim]")
+
+
+def print_model_stats():
+    """Print the latency and success counters the model router is tuned with."""
+    rows = ModelStatsStore().list()
+    if not rows:
+        console.print(
+            "[yellow]No model stats recorded yet "
+            "(they are kept while router.enabled is set)[/yellow]"
+        )
+        return
+
+    table = Table(title="Model Stats")
+    table.add_column("Model", style="cyan")
+    table.add_column("Requests", style="green")
+    table.add_column("Errors", style="red")
+    table.add_column("Avg latency", style="yellow")
+    table.add_column("Tool calls ok", style="green")
+
+    for row in rows:
+        tool_calls = row["tool_calls"]
+        ok = tool_calls - row["tool_failures"]
+        table.add_row(
+            row["model"],
+            str(row["calls"]),
+            str(row["errors"]),
+            f"{row['avg_seconds']:.1f}s",
+            f"{ok}/{tool_calls} ({ok / tool_calls:.0%})" if tool_calls else "-",
+        )
+
+    console.print(table)
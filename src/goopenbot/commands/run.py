@@ -1,39 +1,69 @@
 """Run command - main execution."""
 
 import asyncio
-import json
 import os
 import sys
 from pathlib import Path
 from typing import Any, Optional
 
 from rich.console import Console
-from rich.markdown import Markdown
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+# Only light modules at the top: forwarding a message to a running daemon
+# should not pay for importing the tools and indexes
 from src.goopenbot.core.provider import OllamaProvider, check_ollama_connection, print_welcome
 from src.goopenbot.core.session import Session, SessionStore
-from src.goopenbot.tools import get_tool_by_name, get_tools_schema
+from src.goopenbot.core.checkpoint import CheckpointStore
 from src.goopenbot.core.config import load_config
+from src.goopenbot.core.agents import AgentDefinition, load_agent
+from src.goopenbot.core.orchestrator import run_agent
+from src.goopenbot.core.client import DaemonClient, open_client
+from src.goopenbot.core.memo import get_tool_memo
+from src.goopenbot.core.prefetch import get_prefetcher
 
 console = Console()
 
-SYSTEM_PROMPT = """You are an AI coding assistant. Your role is to help the user with software development tasks.
+TOOL_CALL_INSTRUCTIONS = """IMPORTANT: When you need to use a tool, output ONLY a JSON object like this:
+{"name": "tool_name", "arguments": {"param1": "value1", "param2": "value2"}}
+
+Do not include any other text when using tools. Just output the JSON."""
+
+SYSTEM_PROMPT = (
+    """You are an AI coding assistant. Your role is to help the user with software development tasks.
 
 You have access to several tools to help you:
 - read: Read files to understand code
+- read_many: Read several files in one call
 - write: Create or overwrite files
 - edit: Modify existing files
-- bash: Execute shell commands
+- multi_edit: Apply several edits to one or more files at once
+- bash: Execute shell commands (background=true for long runs)
+- job_status, job_output, job_kill: Follow background bash jobs
 - glob: Find files by pattern
 - grep: Search for text in files
+- search: Find the files most relevant to some words or identifiers
+- symbols: Find Python definitions, class members and importers
+- semantic_search: Find code by meaning when you don't know the exact words
+- git: Repository status, diff, log and blame
+- test: Run the tests affected by your changes
+- task: Hand independent sub-tasks to sub-agents that run in parallel
 
-IMPORTANT: When you need to use a tool, output ONLY a JSON object like this:
-{"name": "tool_name", "arguments": {"param1": "value1", "param2": "value2"}}
+"""
+    + TOOL_CALL_INSTRUCTIONS
+)
 
-Do not include any other text when using tools. Just output the JSON."""
+
+def build_system_prompt(agent: Optional[AgentDefinition] = None) -> str:
+    """The agent's prompt with its tool list, or the default SYSTEM_PROMPT."""
+    if agent is None:
+        return SYSTEM_PROMPT
+    from src.goopenbot.tools import get_tools_schema
+
+    tools = [schema["function"]["name"] for schema in get_tools_schema(agent.tools)]
+    prompt = agent.system_prompt or f"You are the {agent.name} agent."
+    return f"{prompt}\n\nYou have access to these tools: {', '.join(tools)}\n\n{TOOL_CALL_INSTRUCTIONS}"
 
 
 async def run_command(
@@ -42,8 +72,19 @@ async def run_command(
     session_id: Optional[str],
     model: Optional[str],
     dir: Optional[str],
+    repo_map: Optional[bool] = None,
+    agent: Optional[str] = None,
 ):
     """Main run command."""
+    # A running `goopenbot serve` daemon handles single messages with warm state
+    if message:
+        client = await open_client()
+        if client is not None:
+            await run_remote(
+                client, message, continue_session, session_id, model, dir, repo_map, agent
+            )
+            return
+
     # Check Ollama connection
     if not await check_ollama_connection():
         console.print("[red]Error: Cannot connect to Ollama[/red]")
@@ -59,6 +100,14 @@ async def run_command(
     # Load config
     config = load_config()
 
+    definition = None
+    if agent:
+        definition = load_agent(agent)
+        if not definition:
+            console.print(f"[red]Agent not found: {agent}[/red]")
+            return
+        model = model or definition.model
+
     # Get or create session
     store = SessionStore()
 
@@ -76,12 +125,23 @@ async def run_command(
     else:
         session = Session.create(model=model or config.provider.model)
 
+    # Snapshot files before tools modify them, for session rollback
+    session.checkpoints = CheckpointStore()
+    session.agent = definition
+
     # Initialize provider
     provider = OllamaProvider(model=session.model)
 
     # Add system message if new session
     if not session.messages:
-        session.add_message("system", SYSTEM_PROMPT)
+        system_prompt = build_system_prompt(definition)
+        if repo_map if repo_map is not None else config.repo_map.enabled:
+            from src.goopenbot.core.repomap import get_repo_map
+
+            workspace_map = get_repo_map(Path.cwd(), config.repo_map.token_budget)
+            if workspace_map:
+                system_prompt += f"\n\n{workspace_map}"
+        session.add_message("system", system_prompt)
 
     # If a message was provided, add it and process
     if message:
@@ -93,6 +153,69 @@ async def run_command(
 
     # Save session
     store.save(session)
+    print_cache_stats(get_tool_memo().stats(), get_prefetcher().stats())
+
+
+def print_cache_stats(memo: dict[str, Any], prefetch: Optional[dict[str, Any]] = None):
+    """Print how much work the tool memo and the read prefetcher saved, if any."""
+    from src.goopenbot.tools.read import format_size
+
+    if memo["hits"]:
+        console.print(
+            f"[dim]Tool memo: {memo['hits']} of {memo['hits'] + memo['misses']} read-only "
+            f"tool calls answered from memory ({memo['hit_rate']:.0%})[/dim]"
+        )
+    if prefetch and prefetch["prefetched"]:
+        console.print(
+            f"[dim]Prefetch: {prefetch['used']} of {prefetch['prefetched']} files read "
+            f"({prefetch['accuracy']:.0%}), {format_size(prefetch['wasted_bytes'])} wasted[/dim]"
+        )
+
+
+async def run_remote(
+    client: DaemonClient,
+    message: str,
+    continue_session: bool,
+    session_id: Optional[str],
+    model: Optional[str],
+    dir: Optional[str],
+    repo_map: Optional[bool] = None,
+    agent: Optional[str] = None,
+):
+    """Run a message in the daemon, printing its events as they stream in."""
+    print_welcome()
+    async for event in client.request(
+        "run",
+        message=message,
+        dir=str(Path(dir or ".").resolve()),
+        continue_session=continue_session,
+        session_id=session_id,
+        model=model,
+        repo_map=repo_map,
+        agent=agent,
+    ):
+        if event["type"] == "done":
+            if event.get("memo"):
+                print_cache_stats(event["memo"], event.get("prefetch"))
+        else:
+            print_event(event)
+
+
+def print_event(event: dict[str, Any]):
+    """Print one event of an agent run, local or streamed from the daemon."""
+    kind = event["type"]
+    if kind == "notice":
+        console.print(f"[yellow]{event['message']}[/yellow]")
+    elif kind == "assistant":
+        console.print("\n[bold cyan]Assistant:[/bold cyan]")
+        console.print(event["content"])
+    elif kind == "tool":
+        console.print(f"\n[yellow]Using tool: {event['name']}[/yellow]")
+    elif kind == "tool_result":
+        console.print(f"\n[dim]{event.get('title', event['name'])}[/dim]")
+        console.print(event.get("output", "")[:500])
+    elif kind == "error":
+        console.print(f"[red]Error: {event['message']}[/red]")
 
 
 async def process_message(
@@ -101,90 +224,21 @@ async def process_message(
     store: SessionStore,
 ):
     """Process a single message with the AI."""
-    tools_schema = get_tools_schema()
-
-    # Convert messages to OpenAI format
-    messages = [
-        {"role": m["role"], "content": m["content"]}
-        for m in session.messages
-    ]
+    agent = session.agent
 
-    # Get response
-    response = await provider.chat(messages, tools=tools_schema, stream=False)
-
-    # Handle response
-    choice = response.choices[0]
-    message = choice.message
+    def on_event(event: dict[str, Any]) -> None:
+        print_event(event)
+        if event["type"] == "tool_result":
+            # Save after tool execution
+            store.save(session)
 
-    # Print assistant response
-    if message.content:
-        console.print("\n[bold cyan]Assistant:[/bold cyan]")
-        session.add_message("assistant", message.content)
-
-    # Handle tool calls
-    tool_calls = message.tool_calls
-    tool_response_text = ""
-
-    # Fallback: Parse tool calls from content if not in tool_calls field
-    if not tool_calls and message.content:
-        import re
-        # Try multiple patterns to find tool calls
-        patterns = [
-            r'```json\s*(\{.*?\})\s*```',  # JSON in markdown
-            r'```\s*(\{.*?\})\s*```',  # JSON in any code block
-            r'\{"name":\s*"[^"]+",\s*"arguments":\s*\{.*?\}\}',  # Direct JSON
-        ]
-
-        for pattern in patterns:
-            json_match = re.search(pattern, message.content, re.DOTALL)
-            if json_match:
-                try:
-                    tool_data = json.loads(json_match.group())
-                    if "name" in tool_data and "arguments" in tool_data:
-                        tool_calls = [type('obj', (object,), {
-                            'id': f"call_{hash(tool_data['name'])}",
-                            'function': type('obj', (object,), {
-                                'name': tool_data['name'],
-                                'arguments': json.dumps(tool_data['arguments'])
-                            })()
-                        })()]
-                        tool_response_text = message.content.replace(json_match.group(), '').strip()
-                        break
-                except json.JSONDecodeError:
-                    pass
-
-    # Print non-tool response text
-    if tool_response_text:
-        console.print(tool_response_text)
-
-    if tool_calls:
-        for tool_call in tool_calls:
-            tool_name = tool_call.function.name
-            args = tool_call.function.arguments
-
-            # Parse arguments
-            if isinstance(args, str):
-                args = json.loads(args)
-
-            console.print(f"\n[yellow]Using tool: {tool_name}[/yellow]")
-
-            # Get and execute tool
-            tool = get_tool_by_name(tool_name)
-            if tool:
-                result = tool().execute(**args)
-                console.print(f"\n[dim]{result.get('title', tool_name)}[/dim]")
-                console.print(result.get("output", "")[:500])
-
-                # Add tool result
-                session.add_tool_result(tool_call.id, json.dumps(result))
-            else:
-                console.print(f"[red]Tool not found: {tool_name}[/red]")
-
-        # Save after tool execution
-        store.save(session)
-
-        # Continue conversation
-        await process_message(provider, session, store)
+    await run_agent(
+        provider,
+        session,
+        agent.tools if agent else None,
+        (agent and agent.max_iterations) or load_config().agent.max_iterations,
+        on_event=on_event,
+    )
 
 
 async def interactive_mode(
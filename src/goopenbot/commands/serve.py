@@ -0,0 +1,36 @@
+"""Serve command - keep goopenbot warm in a long-lived daemon."""
+
+import sys
+from pathlib import Path
+
+from rich.console import Console
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.goopenbot.core.provider import check_ollama_connection
+from src.goopenbot.commands.run import build_system_prompt
+
+console = Console()
+
+
+async def serve_command():
+    """Serve run, session and models commands over a Unix socket."""
+    if not await check_ollama_connection():
+        console.print("[red]Error: Cannot connect to Ollama[/red]")
+        console.print("[yellow]Make sure Ollama is running: ollama serve[/yellow]")
+        return
+
+    # Imported here so other commands don't load what the daemon keeps warm
+    from src.goopenbot.core.daemon import Daemon
+
+    daemon = Daemon(build_system_prompt)
+    try:
+        await daemon.start()
+    except (RuntimeError, OSError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return
+
+    console.print(f"[green]Listening on {daemon.path}[/green]")
+    console.print("[dim]run, session --list and models now use this daemon. Ctrl+C to stop.[/dim]")
+    await daemon.serve_forever()
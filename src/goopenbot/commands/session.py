@@ -9,25 +9,73 @@ from rich.table import Table
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.goopenbot.core.session import SessionStore
+from src.goopenbot.core.checkpoint import CheckpointStore
+from src.goopenbot.core.client import open_client
 
 console = Console()
 
 
-async def session_command(list_sessions: bool = False, delete: str = None):
+async def session_command(
+    list_sessions: bool = False,
+    delete: str = None,
+    rollback: str = None,
+    to: int = 0,
+):
     """Manage sessions."""
+    if list_sessions and not delete and not rollback:
+        client = await open_client()
+        if client is not None:
+            try:
+                reply = await client.call("sessions")
+            except (RuntimeError, ConnectionError) as e:
+                console.print(f"[red]Error: {e}[/red]")
+                return
+            print_sessions(reply["sessions"])
+            return
+
     store = SessionStore()
 
     if delete:
         store.delete(delete)
+        CheckpointStore().delete_session(delete)
         console.print(f"[green]Deleted session: {delete}[/green]")
         return
 
+    if rollback:
+        if not store.get(rollback):
+            console.print(f"[red]Session not found: {rollback}[/red]")
+            return
+
+        restored = CheckpointStore().rollback(rollback, to)
+        if not restored:
+            console.print(f"[yellow]No file changes after turn {to}[/yellow]")
+            return
+
+        for path, action in restored:
+            console.print(f"  [dim]{action}[/dim] {path}")
+        console.print(f"[green]Rolled back {len(restored)} files to turn {to}[/green]")
+        return
+
     if not list_sessions:
-        console.print("[yellow]Use --list to list sessions or --delete to delete[/yellow]")
+        console.print("[yellow]Use --list to list sessions, --delete to delete or --rollback to restore files[/yellow]")
         return
 
-    sessions = store.list()
+    print_sessions(
+        [
+            {
+                "id": session.id,
+                "created_at": session.created_at,
+                "updated_at": session.updated_at,
+                "messages": len(session.messages),
+                "model": session.model,
+            }
+            for session in store.list()
+        ]
+    )
+
 
+def print_sessions(sessions: list[dict]):
+    """Print a table of session summaries."""
     if not sessions:
         console.print("[yellow]No sessions found[/yellow]")
         return
@@ -41,11 +89,11 @@ async def session_command(list_sessions: bool = False, delete: str = None):
 
     for session in sessions:
         table.add_row(
-            session.id[:8] + "...",
-            session.created_at[:19],
-            session.updated_at[:19],
-            str(len(session.messages)),
-            session.model,
+            session["id"][:8] + "...",
+            session["created_at"][:19],
+            session["updated_at"][:19],
+            str(session["messages"]),
+            session["model"],
         )
 
     console.print(table)
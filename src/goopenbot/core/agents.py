@@ -0,0 +1,106 @@
+"""Agent definitions loaded from agents/*.md files."""
+
+from pathlib import Path
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from .config import get_config_dir
+
+# path -> (mtime_ns, definition)
+_cache: dict[Path, tuple[int, "AgentDefinition"]] = {}
+
+
+class AgentDefinition(BaseModel):
+    """An agent: model, tool subset, system prompt and iteration limit."""
+
+    name: str
+    description: str = ""
+    model: Optional[str] = None
+    # None means all tools
+    tools: Optional[list[str]] = None
+    system_prompt: str = ""
+    max_iterations: Optional[int] = None
+
+
+def _parse_value(value: str) -> Any:
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        return [_parse_value(item) for item in value[1:-1].split(",") if item.strip()]
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    if value.lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+def parse_frontmatter(text: str) -> tuple[dict[str, Any], str]:
+    """Split '---' delimited frontmatter from a markdown body.
+
+    Supports the subset written by `agent --create`: 'key: value' pairs,
+    inline '[a, b]' lists and indented '- item' lists.
+    """
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != "---":
+        return {}, text
+    try:
+        end = next(i for i in range(1, len(lines)) if lines[i].strip() == "---")
+    except StopIteration:
+        return {}, text
+
+    data: dict[str, Any] = {}
+    key = None
+    for line in lines[1:end]:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and key is not None:
+            if not isinstance(data.get(key), list):
+                data[key] = []
+            data[key].append(_parse_value(stripped[2:]))
+        elif ":" in stripped:
+            key, value = stripped.split(":", 1)
+            key = key.strip()
+            data[key] = _parse_value(value) if value.strip() else None
+    return data, "\n".join(lines[end + 1 :]).strip()
+
+
+def agents_dirs() -> list[Path]:
+    """Directories searched for agent files: ./agents first, then the project's."""
+    dirs = [Path("agents").resolve(), get_config_dir() / "agents"]
+    return list(dict.fromkeys(dirs))
+
+
+def load_agent_file(path: Path) -> AgentDefinition:
+    """Parse an agent file, reusing the cached definition while it is unchanged."""
+    path = Path(path).resolve()
+    mtime = path.stat().st_mtime_ns
+    cached = _cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    data, body = parse_frontmatter(path.read_text(encoding="utf-8"))
+    tools = data.get("tools")
+    if isinstance(tools, str):
+        tools = [tools]
+    definition = AgentDefinition(
+        name=str(data.get("name") or path.stem),
+        description=str(data.get("description") or ""),
+        model=data.get("model"),
+        tools=tools,
+        system_prompt=body,
+        max_iterations=data.get("max_iterations"),
+    )
+    _cache[path] = (mtime, definition)
+    return definition
+
+
+def load_agent(name: str) -> Optional[AgentDefinition]:
+    """Find and load the agent called name."""
+    for directory in agents_dirs():
+        path = directory / f"{name}.md"
+        if path.is_file():
+            return load_agent_file(path)
+    return None
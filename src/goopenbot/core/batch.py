@@ -0,0 +1,154 @@
+"""Run many independent tasks from a JSONL file inside one process."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .agents import AgentDefinition, load_agent
+from .checkpoint import CheckpointStore
+from .config import load_config
+from .orchestrator import run_agent
+from .provider import OllamaProvider
+from .session import Session, SessionStore
+
+
+def load_tasks(path: Path) -> list[dict[str, Any]]:
+    """Tasks from a JSONL file; each gets an id (its own or its line number)."""
+    tasks = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                task = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON ({e})") from None
+            if not isinstance(task, dict) or not task.get("message"):
+                raise ValueError(f"{path}:{number}: a task needs a message")
+            task.setdefault("id", str(number))
+            task["id"] = str(task["id"])
+            tasks.append(task)
+    return tasks
+
+
+def completed_task_ids(output: Path) -> set[str]:
+    """Ids of tasks that already succeeded in a previous run."""
+    done = set()
+    try:
+        with open(output, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by an interrupted run
+                if result.get("status") == "ok":
+                    done.add(str(result.get("id")))
+    except OSError:
+        pass
+    return done
+
+
+async def run_batch_task(
+    task: dict[str, Any],
+    timeout: float,
+    system_prompt: Callable[[Optional[AgentDefinition]], str],
+    store: SessionStore,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> dict[str, Any]:
+    """Run one task in a new session and describe the outcome."""
+    config = load_config()
+    started = time.monotonic()
+    result: dict[str, Any] = {"id": task["id"], "status": "ok", "answer": None, "session_id": None}
+    usage: dict[str, int] = {}
+    try:
+        agent = None
+        if task.get("agent"):
+            agent = load_agent(task["agent"])
+            if agent is None:
+                raise ValueError(f"Agent not found: {task['agent']}")
+        session = Session.create(
+            model=task.get("model") or (agent and agent.model) or config.provider.model
+        )
+        session.agent = agent
+        session.checkpoints = checkpoints
+        session.add_message("system", system_prompt(agent))
+        session.add_message("user", task["message"])
+        result["session_id"] = session.id
+        result["model"] = session.model
+
+        cwd = Path(task["dir"]).resolve() if task.get("dir") else None
+        if cwd is not None and not cwd.is_dir():
+            raise ValueError(f"Not a directory: {task['dir']}")
+        max_iterations = (agent and agent.max_iterations) or config.agent.max_iterations
+        try:
+            result["answer"] = await asyncio.wait_for(
+                run_agent(
+                    OllamaProvider(model=session.model),
+                    session,
+                    agent.tools if agent else None,
+                    max_iterations,
+                    cwd,
+                    usage,
+                ),
+                timeout=task.get("timeout") or timeout,
+            )
+        except asyncio.TimeoutError:
+            result["status"] = "timeout"
+            result["error"] = f"Timed out after {task.get('timeout') or timeout} seconds"
+        finally:
+            store.save(session)
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+
+    result["prompt_tokens"] = usage.get("prompt_tokens", 0)
+    result["completion_tokens"] = usage.get("completion_tokens", 0)
+    result["duration_s"] = round(time.monotonic() - started, 3)
+    return result
+
+
+async def run_batch(
+    tasks: list[dict[str, Any]],
+    output: Path,
+    system_prompt: Callable[[Optional[AgentDefinition]], str],
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    resume: bool = False,
+    on_result: Optional[Callable[[dict[str, Any]], None]] = None,
+) -> list[dict[str, Any]]:
+    """Run tasks concurrently, appending one JSON result line per finished task.
+
+    With resume, tasks that already succeeded according to output are skipped.
+    """
+    config = load_config()
+    concurrency = concurrency or config.batch.concurrency
+    timeout = timeout or config.batch.timeout
+    if resume:
+        done = completed_task_ids(output)
+        tasks = [task for task in tasks if task["id"] not in done]
+    elif output.exists():
+        output.unlink()
+
+    store = SessionStore()
+    checkpoints = CheckpointStore()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: list[dict[str, Any]] = []
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output, "a", encoding="utf-8") as out:
+
+        async def run_one(task: dict[str, Any]) -> None:
+            async with semaphore:
+                result = await run_batch_task(task, timeout, system_prompt, store, checkpoints)
+            # Stream each result as soon as its task finishes
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+        await asyncio.gather(*(run_one(task) for task in tasks))
+    return results
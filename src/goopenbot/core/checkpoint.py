@@ -0,0 +1,189 @@
+"""Content-addressed checkpoints of files before tools modify them."""
+
+import hashlib
+import os
+import sqlite3
+import stat
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .config import get_data_dir
+from .workspace import file_mode, notify_file_changed
+
+
+def _write_bytes_atomic(path: Path, data: bytes, mode: Optional[int] = None) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_name, file_mode(path) if mode is None else mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+class CheckpointStore:
+    """Deduplicated blob store of file pre-images, indexed per session turn.
+
+    Before a tool first modifies a file during a turn, the file's current
+    bytes are hashed and stored once as a zlib-compressed blob named by
+    its SHA-256; identical content is never stored twice. The file's
+    permission bits are kept with the checkpoint so rollback restores them
+    too. A missing file is recorded with a NULL blob so rollback can delete
+    it again.
+    """
+
+    def __init__(self, data_dir: Optional[Path] = None):
+        data_dir = data_dir or get_data_dir()
+        self.db_path = data_dir / "sessions.db"
+        self.blob_dir = data_dir / "checkpoints"
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize the database."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                session_id TEXT NOT NULL,
+                turn INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                blob TEXT,
+                mode INTEGER,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (session_id, turn, path)
+            )
+            """
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(checkpoints)")}
+        if "mode" not in columns:
+            conn.execute("ALTER TABLE checkpoints ADD COLUMN mode INTEGER")
+        conn.commit()
+        conn.close()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest[2:]
+
+    def _put_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_bytes_atomic(blob_path, zlib.compress(data, 1))
+        return digest
+
+    def _get_blob(self, digest: str) -> bytes:
+        return zlib.decompress(self._blob_path(digest).read_bytes())
+
+    def snapshot(self, session_id: str, turn: int, path: Path) -> None:
+        """Record the current content of path, once per session turn."""
+        path = Path(path).resolve()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM checkpoints WHERE session_id = ? AND turn = ? AND path = ?",
+                (session_id, turn, str(path)),
+            ).fetchone()
+            if exists:
+                return
+
+            digest = mode = None
+            if path.is_file():
+                mode = stat.S_IMODE(path.stat().st_mode)
+                digest = self._put_blob(path.read_bytes())
+            conn.execute(
+                # OR IGNORE: concurrent sub-agents may snapshot the same file
+                "INSERT OR IGNORE INTO checkpoints "
+                "(session_id, turn, path, blob, mode, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, turn, str(path), digest, mode, datetime.now().isoformat()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def list_turns(self, session_id: str) -> list[tuple[int, int]]:
+        """(turn, files changed) for every turn with checkpoints."""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(
+            "SELECT turn, COUNT(*) FROM checkpoints WHERE session_id = ? GROUP BY turn ORDER BY turn",
+            (session_id,),
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def rollback(self, session_id: str, turn: int) -> list[tuple[str, str]]:
+        """Restore every file to its state at the end of turn.
+
+        Each file touched after that turn is reset to its earliest later
+        pre-image. Returns (path, "restored" | "deleted") pairs.
+        """
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(
+            """
+            SELECT path, blob, mode FROM checkpoints c
+            WHERE session_id = ? AND turn = (
+                SELECT MIN(turn) FROM checkpoints
+                WHERE session_id = c.session_id AND path = c.path AND turn > ?
+            )
+            """,
+            (session_id, turn),
+        ).fetchall()
+        conn.close()
+
+        restored = []
+        for path_str, digest, mode in rows:
+            path = Path(path_str)
+            if digest is None:
+                if path.exists():
+                    path.unlink()
+                restored.append((path_str, "deleted"))
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Checkpoints from before modes were recorded have none
+                _write_bytes_atomic(path, self._get_blob(digest), mode)
+                restored.append((path_str, "restored"))
+            notify_file_changed(path)
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "DELETE FROM checkpoints WHERE session_id = ? AND turn > ?", (session_id, turn)
+        )
+        conn.commit()
+        conn.close()
+        self._collect_garbage()
+        return restored
+
+    def delete_session(self, session_id: str) -> None:
+        """Drop all checkpoints of a session and their unreferenced blobs."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM checkpoints WHERE session_id = ?", (session_id,))
+        conn.commit()
+        conn.close()
+        self._collect_garbage()
+
+    def _collect_garbage(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        used = {row[0] for row in conn.execute("SELECT DISTINCT blob FROM checkpoints")}
+        conn.close()
+        if not self.blob_dir.exists():
+            return
+        for blob_path in self.blob_dir.glob("*/*"):
+            if blob_path.parent.name + blob_path.name not in used:
+                blob_path.unlink(missing_ok=True)
+
+
+def checkpoint_file(session, path: Path) -> None:
+    """Snapshot path for session's current turn if checkpoints are enabled.
+
+    Sub-agent sessions snapshot into the turn of the session they work for,
+    so rolling that session back also undoes their changes.
+    """
+    while session is not None and session.parent is not None:
+        session = session.parent
+    if session is not None and session.checkpoints is not None:
+        session.checkpoints.snapshot(session.id, session.turn, path)
@@ -0,0 +1,68 @@
+"""Client side of the daemon protocol.
+
+Kept apart from daemon.py so that forwarding a command to a running daemon
+only imports the config, not the tools, provider and indexes the daemon
+keeps warm.
+"""
+
+import asyncio
+import json
+import socket
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from .config import get_data_dir, load_config
+
+
+def socket_path() -> Path:
+    """Path of the daemon's Unix socket."""
+    configured = load_config().daemon.socket
+    return Path(configured).expanduser() if configured else get_data_dir() / "goopenbot.sock"
+
+
+class DaemonClient:
+    """Connection to a running daemon."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, op: str, **params) -> AsyncIterator[dict[str, Any]]:
+        """Send one request and yield its events, ending with done or error."""
+        try:
+            self.writer.write((json.dumps({"op": op, **params}) + "\n").encode())
+            await self.writer.drain()
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    raise ConnectionError("Daemon closed the connection")
+                event = json.loads(line)
+                yield event
+                if event.get("type") in ("done", "error"):
+                    return
+        finally:
+            self.writer.close()
+
+    async def call(self, op: str, **params) -> dict[str, Any]:
+        """Send one request and return its done event, raising on error."""
+        async for event in self.request(op, **params):
+            if event["type"] == "error":
+                raise RuntimeError(event["message"])
+            if event["type"] == "done":
+                return event
+        return {}
+
+
+async def open_client(path: Optional[Path] = None) -> Optional[DaemonClient]:
+    """Connect to the daemon, or None when it is disabled or not running."""
+    if path is None:
+        if not load_config().daemon.enabled:
+            return None
+        path = socket_path()
+    if not hasattr(socket, "AF_UNIX") or not Path(path).exists():
+        return None
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(path), limit=2**24)
+    except OSError:
+        return None  # stale socket left by a daemon that was killed
+    return DaemonClient(reader, writer)
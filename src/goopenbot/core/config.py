@@ -14,6 +14,23 @@ class ProviderConfig(BaseModel):
     base_url: str = "http://localhost:11434/v1"
     model: str = "qwen2.5-coder:7b"
     api_key: Optional[str] = None
+    embedding_model: str = "nomic-embed-text"
+    # Constrain models without native tool calls to a JSON action per turn
+    constrained_tool_calls: bool = True
+
+
+class BashConfig(BaseModel):
+    """Per-command resource limits for the bash tool (None = unlimited)."""
+
+    timeout: int = 60
+    cpu_seconds: Optional[int] = None
+    memory_mb: Optional[int] = None
+    max_open_files: Optional[int] = None
+    max_output_bytes: int = 200_000
+    nice: int = 0
+    # Background jobs (bash with background=true)
+    background_timeout: int = 3600
+    max_spool_bytes: int = 50_000_000
 
 
 class ToolConfig(BaseModel):
@@ -21,6 +38,12 @@ class ToolConfig(BaseModel):
 
     allowed_commands: list[str] = ["*"]
     denied_commands: list[str] = []
+    bash: BashConfig = BashConfig()
+    # Byte budget for memoised results of pure tools (0 disables the memo)
+    memo_max_bytes: int = 16_000_000
+    # Files read ahead after grep, glob and Python reads (0 bytes disables)
+    prefetch_max_bytes: int = 8_000_000
+    prefetch_max_files: int = 8
 
 
 class AgentConfig(BaseModel):
@@ -29,6 +52,50 @@ class AgentConfig(BaseModel):
     model: str = "qwen2.5-coder:7b"
     tools: list[str] = ["read", "write", "bash", "glob", "grep"]
     max_iterations: int = 100
+    # Sub-agents started by the task tool that may run at once
+    max_parallel_tasks: int = 2
+
+
+class BatchConfig(BaseModel):
+    """Defaults for `goopenbot batch`."""
+
+    concurrency: int = 2
+    # Seconds per task
+    timeout: int = 900
+
+
+class RouterConfig(BaseModel):
+    """Per-turn model choice; the session model is the large default."""
+
+    enabled: bool = False
+    # Smaller model for turns that follow a tool call (mechanical steps)
+    tool_model: Optional[str] = None
+    # Model once escalate_after tool calls in a row failed (default: session model)
+    escalation_model: Optional[str] = None
+    escalate_after: int = 2
+    # Re-ask a final answer the tool model wrote with the session model
+    escalate_final_answer: bool = True
+    # Keep per-model latency and success counters while routing is enabled
+    # (goopenbot models --stats)
+    record_stats: bool = True
+
+
+class DaemonConfig(BaseModel):
+    """`goopenbot serve` and the commands that talk to it."""
+
+    # Send run/session/models commands to a running daemon
+    enabled: bool = True
+    # Unix socket path (default: <data dir>/goopenbot.sock)
+    socket: Optional[str] = None
+    # Seconds the daemon reuses the Ollama model list
+    models_ttl: int = 60
+
+
+class RepoMapConfig(BaseModel):
+    """Repository map added to the system prompt of new sessions."""
+
+    enabled: bool = False
+    token_budget: int = 1024
 
 
 class Config(BaseModel):
@@ -37,6 +104,10 @@ class Config(BaseModel):
     provider: ProviderConfig = ProviderConfig()
     tools: ToolConfig = ToolConfig()
     agent: AgentConfig = AgentConfig()
+    repo_map: RepoMapConfig = RepoMapConfig()
+    batch: BatchConfig = BatchConfig()
+    daemon: DaemonConfig = DaemonConfig()
+    router: RouterConfig = RouterConfig()
 
 
 def get_project_dir() -> Path:
@@ -0,0 +1,189 @@
+"""Long-lived daemon that serves commands from one warm process.
+
+Requests and events are JSON lines over a Unix socket. A client sends one
+request ({"op": ..., params}) per connection and reads events until a
+"done" or "error" event; see client.py.
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .agents import AgentDefinition, load_agent
+from .checkpoint import CheckpointStore
+from .client import open_client, socket_path
+from .config import load_config
+from .memo import get_tool_memo
+from .prefetch import get_prefetcher
+from .orchestrator import run_agent
+from .provider import OllamaProvider
+from .repomap import get_repo_map
+from .session import Session, SessionStore
+
+
+class Daemon:
+    """Serve run, sessions and models requests, keeping state warm between them."""
+
+    def __init__(
+        self,
+        system_prompt: Callable[[Optional[AgentDefinition]], str],
+        path: Optional[Path] = None,
+    ):
+        self.system_prompt = system_prompt
+        self.path = Path(path) if path else socket_path()
+        self.store = SessionStore()
+        self.checkpoints = CheckpointStore()
+        self.providers: dict[str, OllamaProvider] = {}
+        self._models: Optional[tuple[float, list[dict[str, Any]]]] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def provider(self, model: Optional[str] = None) -> OllamaProvider:
+        """Shared provider (and its HTTP connection pool) for a model."""
+        model = model or load_config().provider.model
+        if model not in self.providers:
+            self.providers[model] = OllamaProvider(model=model)
+        return self.providers[model]
+
+    async def start(self) -> None:
+        """Listen on the socket; fails if another daemon already does."""
+        if self.path.exists():
+            client = await open_client(self.path)
+            if client is not None:
+                client.writer.close()
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+            self.path.unlink()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._server = await asyncio.start_unix_server(
+            self._handle, path=str(self.path), limit=2**24
+        )
+        os.chmod(self.path, 0o600)
+
+    async def serve_forever(self) -> None:
+        """Serve after start() until cancelled, removing the socket afterwards."""
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            self.path.unlink(missing_ok=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        def send(event: dict[str, Any]) -> None:
+            writer.write((json.dumps(event) + "\n").encode())
+
+        try:
+            request = json.loads(await reader.readline())
+            operations = {
+                "ping": self.ping,
+                "run": self.run,
+                "sessions": self.sessions,
+                "models": self.models,
+            }
+            operation = operations.get(request.pop("op", None))
+            if operation is None:
+                raise ValueError("Unknown operation")
+            send({"type": "done", **(await operation(send, **request))})
+        except Exception as e:
+            send({"type": "error", "message": str(e)})
+        try:
+            await writer.drain()
+            writer.close()
+        except ConnectionError:
+            pass  # the client went away
+
+    async def ping(self, send: Callable) -> dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "memo": get_tool_memo().stats(),
+            "prefetch": get_prefetcher().stats(),
+        }
+
+    async def sessions(self, send: Callable, limit: int = 10) -> dict[str, Any]:
+        return {
+            "sessions": [
+                {
+                    "id": session.id,
+                    "created_at": session.created_at,
+                    "updated_at": session.updated_at,
+                    "messages": len(session.messages),
+                    "model": session.model,
+                }
+                for session in self.store.list(limit)
+            ]
+        }
+
+    async def models(self, send: Callable, refresh: bool = False) -> dict[str, Any]:
+        provider = self.provider()
+        ttl = load_config().daemon.models_ttl
+        if refresh or self._models is None or time.monotonic() - self._models[0] > ttl:
+            self._models = (time.monotonic(), await provider.list_models())
+        return {"models": self._models[1], "model": provider.model}
+
+    async def run(
+        self,
+        send: Callable,
+        message: str,
+        dir: str,
+        continue_session: bool = False,
+        session_id: Optional[str] = None,
+        model: Optional[str] = None,
+        repo_map: Optional[bool] = None,
+        agent: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Run a message like `goopenbot run`, streaming what the agent does.
+
+        Runs are scoped to dir rather than changing the working directory,
+        so runs from several clients proceed at the same time.
+        """
+        cwd = Path(dir).resolve()
+        if not cwd.is_dir():
+            raise ValueError(f"Not a directory: {dir}")
+        config = load_config()
+        definition = None
+        if agent:
+            definition = load_agent(agent)
+            if not definition:
+                raise ValueError(f"Agent not found: {agent}")
+            model = model or definition.model
+
+        if session_id:
+            session = self.store.get(session_id)
+            if not session:
+                raise ValueError(f"Session not found: {session_id}")
+        else:
+            session = self.store.get_latest() if continue_session else None
+            if continue_session and session is None:
+                send({"type": "notice", "message": "No previous session found, starting a new session"})
+            session = session or Session.create(model=model or config.provider.model)
+        session.checkpoints = self.checkpoints
+        session.agent = definition
+        send({"type": "session", "id": session.id, "model": session.model})
+
+        if not session.messages:
+            system_prompt = self.system_prompt(definition)
+            if repo_map if repo_map is not None else config.repo_map.enabled:
+                workspace_map = get_repo_map(cwd, config.repo_map.token_budget)
+                if workspace_map:
+                    system_prompt += f"\n\n{workspace_map}"
+            session.add_message("system", system_prompt)
+        session.add_message("user", message)
+
+        provider = self.provider(session.model).new_conversation()
+        try:
+            await run_agent(
+                provider,
+                session,
+                definition.tools if definition else None,
+                (definition and definition.max_iterations) or config.agent.max_iterations,
+                cwd,
+                on_event=send,
+            )
+        finally:
+            self.store.save(session)
+        return {
+            "session_id": session.id,
+            "memo": get_tool_memo().stats(),
+            "prefetch": get_prefetcher().stats(),
+        }
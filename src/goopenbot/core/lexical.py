@@ -0,0 +1,177 @@
+"""Inverted index over workspace files with BM25 ranking."""
+
+import math
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .workspace import (
+    CODE_EXTENSIONS,
+    MAX_FILE_BYTES,
+    compile_glob,
+    get_snapshot,
+    is_ignored_path,
+    load_ignore_patterns,
+)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Matching lines closer than this are reported as one range
+RANGE_GAP = 3
+
+_WORD = re.compile(r"[A-Za-z0-9_]+")
+_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase tokens, splitting camelCase and snake_case identifiers.
+
+    Compound identifiers also yield themselves, so 'getUserName' gives
+    'getusername', 'get', 'user' and 'name'.
+    """
+    tokens = []
+    for word in _WORD.findall(text):
+        parts = [part.lower() for part in _PART.findall(word)]
+        whole = word.lower().strip("_")
+        if len(parts) != 1 or parts[0] != whole:
+            if len(whole) > 1:
+                tokens.append(whole)
+        tokens.extend(part for part in parts if len(part) > 1)
+    return tokens
+
+
+class LexicalIndex:
+    """Term -> file -> matching lines for the files under a root.
+
+    Files are re-tokenised only when their mtime changes, and their old
+    postings are removed first, so refreshes cost O(changed files).
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root).resolve()
+        # term -> path -> (term frequency, line numbers)
+        self.postings: dict[str, dict[str, tuple[int, list[int]]]] = {}
+        # path -> (mtime_ns, token count, terms)
+        self.files: dict[str, tuple[int, int, list[str]]] = {}
+        self.total_tokens = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, rel: str) -> None:
+        _, length, terms = self.files.pop(rel)
+        self.total_tokens -= length
+        for term in terms:
+            files = self.postings[term]
+            del files[rel]
+            if not files:
+                del self.postings[term]
+
+    def _add(self, rel: str, mtime: int, text: str) -> None:
+        terms: dict[str, tuple[int, list[int]]] = {}
+        length = 0
+        for number, line in enumerate(text.splitlines(), 1):
+            for token in tokenize(line):
+                length += 1
+                count, lines = terms.get(token, (0, []))
+                if not lines or lines[-1] != number:
+                    lines.append(number)
+                terms[token] = (count + 1, lines)
+        for term, posting in terms.items():
+            self.postings.setdefault(term, {})[rel] = posting
+        self.files[rel] = (mtime, length, list(terms))
+        self.total_tokens += length
+
+    def refresh(self) -> int:
+        """Re-index new and modified files and drop deleted ones.
+
+        Returns the number of files (re-)indexed.
+        """
+        with self._lock:
+            patterns = load_ignore_patterns(self.root)
+            current = {
+                rel: mtime
+                for rel, is_dir, size, mtime in get_snapshot(self.root).match("**/*", restat=True)
+                if not is_dir
+                and size <= MAX_FILE_BYTES
+                and Path(rel).suffix in CODE_EXTENSIONS
+                and not is_ignored_path(rel, patterns)
+            }
+            for rel in [rel for rel in self.files if rel not in current]:
+                self._remove(rel)
+
+            indexed = 0
+            for rel, mtime in current.items():
+                cached = self.files.get(rel)
+                if cached and cached[0] == mtime:
+                    continue
+                if cached:
+                    self._remove(rel)
+                try:
+                    text = (self.root / rel).read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    continue
+                self._add(rel, mtime, text)
+                indexed += 1
+            return indexed
+
+    def search(
+        self, query: str, k: int = 10, pattern: Optional[str] = None
+    ) -> list[tuple[float, str, list[tuple[int, int]]]]:
+        """Top-k (score, path, matching line ranges) ranked with BM25."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        regex = compile_glob(pattern) if pattern else None
+        with self._lock:
+            count = len(self.files)
+            if not count or not terms:
+                return []
+            average = self.total_tokens / count or 1
+
+            scores: dict[str, float] = {}
+            for term in terms:
+                files = self.postings.get(term, {})
+                idf = math.log(1 + (count - len(files) + 0.5) / (len(files) + 0.5))
+                for rel, (tf, _) in files.items():
+                    if regex and not regex.match(rel):
+                        continue
+                    length = self.files[rel][1]
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average)
+                    scores[rel] = scores.get(rel, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+            results = []
+            for rel, score in ranked:
+                hits: dict[int, set[str]] = {}
+                for term in terms:
+                    posting = self.postings.get(term, {}).get(rel)
+                    for line in posting[1] if posting else []:
+                        hits.setdefault(line, set()).add(term)
+                results.append((score, rel, self._ranges(hits)))
+            return results
+
+    @staticmethod
+    def _ranges(hits: dict[int, set[str]]) -> list[tuple[int, int]]:
+        """Cluster matching lines into ranges, best (most distinct terms) first."""
+        ranges: list[tuple[int, int, set[str]]] = []
+        for line in sorted(hits):
+            if ranges and line - ranges[-1][1] <= RANGE_GAP:
+                start, _, terms = ranges[-1]
+                ranges[-1] = (start, line, terms | hits[line])
+            else:
+                ranges.append((line, line, set(hits[line])))
+        ranges.sort(key=lambda r: (-len(r[2]), r[0]))
+        return [(start, end) for start, end, _ in ranges]
+
+
+_indexes: dict[Path, LexicalIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_lexical_index(root: Path) -> LexicalIndex:
+    """Get the refreshed lexical index for root."""
+    root = Path(root).resolve()
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = _indexes[root] = LexicalIndex(root)
+    index.refresh()
+    return index
@@ -0,0 +1,105 @@
+"""Memo of pure tool results, valid until the workspace generation changes."""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .config import load_config
+from .prefetch import get_prefetcher
+from .workspace import get_generation
+
+
+def _result_size(result: dict[str, Any]) -> int:
+    return sum(len(value) for value in result.values() if isinstance(value, str)) + 64
+
+
+class ToolMemo:
+    """LRU map from (tool, arguments, cwd, generation) to a result, within a byte budget."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, tuple[dict[str, Any], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(name: str, args: dict[str, Any]) -> tuple:
+        """Key for a call; the generation makes writes invalidate everything."""
+        canonical = json.dumps(args, sort_keys=True, default=str)
+        return (name, canonical, os.getcwd(), get_generation())
+
+    def get(self, key: tuple) -> Optional[dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[0])
+
+    def put(self, key: tuple, result: dict[str, Any]) -> None:
+        size = _result_size(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (dict(result), size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / calls if calls else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+_memo: Optional[ToolMemo] = None
+_memo_lock = threading.Lock()
+
+
+def get_tool_memo() -> ToolMemo:
+    """The process-wide tool memo."""
+    global _memo
+    with _memo_lock:
+        if _memo is None:
+            _memo = ToolMemo(load_config().tools.memo_max_bytes)
+        return _memo
+
+
+def execute_tool(tool: Any, args: dict[str, Any]) -> dict[str, Any]:
+    """Run a tool call, answering repeats of pure calls from the memo.
+
+    Afterwards the files the result makes likely to be read next are
+    prefetched in the background while the model works on its next turn.
+    """
+    memo = get_tool_memo()
+    if memo.max_bytes <= 0 or not tool.memoizable(**args):
+        result = tool.execute(**args)
+    else:
+        key = memo.key(tool.name, args)
+        result = memo.get(key)
+        if result is None:
+            result = tool.execute(**args)
+            # Errors may be transient (e.g. a file that is about to be written)
+            if result.get("success") and key[3] == get_generation():
+                memo.put(key, result)
+    get_prefetcher().after_tool(tool.name, args, result)
+    return result
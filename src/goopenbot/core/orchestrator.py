@@ -0,0 +1,218 @@
+"""Headless agent loop and concurrent sub-agent fan-out."""
+
+import asyncio
+import json
+import re
+import shlex
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .agents import AgentDefinition, load_agent
+from .config import load_config
+from .memo import execute_tool
+from .provider import OllamaProvider
+from .session import Session
+
+MAX_SUMMARY_BYTES = 4000
+
+_TOOL_CALL_PATTERNS = [
+    r"```json\s*(\{.*?\})\s*```",  # JSON in markdown
+    r"```\s*(\{.*?\})\s*```",  # JSON in any code block
+    r'\{"name":\s*"[^"]+",\s*"arguments":\s*\{.*?\}\}',  # Direct JSON
+]
+
+
+def parse_tool_call(content: str) -> Optional[tuple[dict[str, Any], str]]:
+    """Find a {"name": ..., "arguments": ...} tool call written in message text.
+
+    Returns (tool call, remaining text) for models without native tool calls.
+    """
+    for pattern in _TOOL_CALL_PATTERNS:
+        match = re.search(pattern, content, re.DOTALL)
+        if not match:
+            continue
+        try:
+            data = json.loads(match.group(1) if match.groups() else match.group())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict) and "name" in data and "arguments" in data:
+            return data, content.replace(match.group(), "").strip()
+    return None
+
+
+def _inside(cwd: Path, path: str) -> str:
+    resolved = (cwd / path).resolve()
+    if resolved != cwd and cwd not in resolved.parents:
+        raise ValueError(f"{path} is outside the task directory {cwd}")
+    return str(resolved)
+
+
+def scope_arguments(tool: Any, args: dict[str, Any], cwd: Path) -> dict[str, Any]:
+    """Pin a tool call's paths (and bash's working directory) to cwd.
+
+    Raises ValueError for paths that escape cwd.
+    """
+    args = dict(args)
+    properties = tool.parameters_schema().get("properties", {})
+    if "path" in properties:
+        args["path"] = _inside(cwd, args.get("path") or ".")
+    if args.get("file_path"):
+        args["file_path"] = _inside(cwd, args["file_path"])
+    for key in ("paths", "files"):
+        if args.get(key):
+            args[key] = [_inside(cwd, p) for p in args[key]]
+    if args.get("edits"):
+        args["edits"] = [
+            {**edit, "file_path": _inside(cwd, edit.get("file_path", ""))} for edit in args["edits"]
+        ]
+    if args.get("tasks"):
+        args["tasks"] = [
+            {**task, "path": _inside(cwd, task.get("path") or ".")} for task in args["tasks"]
+        ]
+    if tool.name == "bash" and args.get("command"):
+        args["command"] = f"cd {shlex.quote(str(cwd))} && {args['command']}"
+    return args
+
+
+async def run_agent(
+    provider: OllamaProvider,
+    session: Session,
+    tool_names: Optional[list[str]] = None,
+    max_iterations: int = 20,
+    cwd: Optional[Path] = None,
+    usage: Optional[dict[str, int]] = None,
+    on_event: Optional[Callable[[dict[str, Any]], None]] = None,
+) -> str:
+    """Drive session until the model answers without a tool call.
+
+    Tools run in worker threads so concurrent agents overlap. Token counts
+    are added to usage when given, and on_event is called with each
+    assistant message, tool call and tool result. Returns the final answer.
+    """
+    # Imported here: the tools package imports this module for the task tool
+    from ..tools import get_tool_by_name, get_tools_schema
+
+    tools_schema = get_tools_schema(tool_names)
+    content = ""
+    for _ in range(max_iterations):
+        messages = [{"role": m["role"], "content": m["content"]} for m in session.messages]
+        response = await provider.chat(messages, tools=tools_schema, stream=False)
+        if usage is not None and getattr(response, "usage", None):
+            usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + (response.usage.prompt_tokens or 0)
+            usage["completion_tokens"] = (
+                usage.get("completion_tokens", 0) + (response.usage.completion_tokens or 0)
+            )
+        message = response.choices[0].message
+        content = message.content or ""
+        if content:
+            session.add_message("assistant", content)
+
+        calls = [
+            (call.id, call.function.name, call.function.arguments)
+            for call in message.tool_calls or []
+        ]
+        text = content
+        parsed = parse_tool_call(content) if content else None
+        if parsed:
+            # The call itself stays in the history but is not shown as text
+            text = parsed[1]
+            if not calls:
+                calls = [(f"call_{len(session.messages)}", parsed[0]["name"], parsed[0]["arguments"])]
+        if on_event and text:
+            on_event({"type": "assistant", "content": text})
+        if not calls:
+            return content
+
+        for call_id, name, args in calls:
+            if on_event:
+                on_event({"type": "tool", "name": name})
+            tool = get_tool_by_name(name)
+            try:
+                if isinstance(args, str):
+                    args = json.loads(args)
+                if tool is None or (tool_names is not None and name not in tool_names):
+                    raise ValueError(f"Tool not available: {name}")
+                if cwd is not None:
+                    args = scope_arguments(tool, args, cwd)
+                result = await asyncio.to_thread(execute_tool, tool(session=session), args)
+            except Exception as e:
+                result = {"title": name, "output": f"Error: {str(e)}", "success": False}
+            session.add_tool_result(call_id, json.dumps(result))
+            if on_event:
+                on_event({"type": "tool_result", "name": name, **result})
+
+    if on_event:
+        on_event({"type": "notice", "message": f"Stopped after {max_iterations} iterations"})
+    return content + f"\n[stopped after {max_iterations} iterations]"
+
+
+async def run_task(
+    prompt: str,
+    agent_name: Optional[str] = None,
+    cwd: Optional[Path] = None,
+    model: Optional[str] = None,
+    parent: Optional[Session] = None,
+) -> str:
+    """Run one sub-agent in its own Session and return its summary."""
+    from ..tools import get_tools_schema
+
+    config = load_config()
+    agent = load_agent(agent_name) if agent_name else None
+    if agent_name and agent is None:
+        raise ValueError(f"Agent not found: {agent_name}")
+    agent = agent or AgentDefinition(name="task")
+
+    # Sub-agents cannot fan out further
+    tool_names = [
+        schema["function"]["name"]
+        for schema in get_tools_schema(agent.tools)
+        if schema["function"]["name"] != "task"
+    ]
+    session = Session.create(model=agent.model or model or config.provider.model)
+    session.agent = agent
+    session.parent = parent
+
+    scope = f"\n\nWork only inside {cwd}." if cwd else ""
+    system_prompt = agent.system_prompt or "You are a sub-agent working on one part of a larger task."
+    session.add_message(
+        "system",
+        f"{system_prompt}{scope}\n\nWhen you are done, reply with a short summary of what "
+        "you did and found, without a tool call.",
+    )
+    session.add_message("user", prompt)
+
+    summary = await run_agent(
+        OllamaProvider(model=session.model),
+        session,
+        tool_names,
+        agent.max_iterations or config.agent.max_iterations,
+        cwd,
+    )
+    data = summary.encode("utf-8")
+    if len(data) > MAX_SUMMARY_BYTES:
+        summary = data[:MAX_SUMMARY_BYTES].decode("utf-8", errors="ignore") + "\n[... summary truncated]"
+    return summary
+
+
+async def run_tasks(
+    tasks: list[dict[str, Any]],
+    max_parallel: int,
+    model: Optional[str] = None,
+    parent: Optional[Session] = None,
+) -> list[tuple[bool, str]]:
+    """Run tasks ({prompt, agent, path}) concurrently, at most max_parallel at a time.
+
+    Returns (success, summary or error) per task, in order.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+
+    async def run_one(task: dict[str, Any]) -> tuple[bool, str]:
+        async with semaphore:
+            try:
+                cwd = Path(task["path"]).resolve() if task.get("path") else None
+                summary = await run_task(task["prompt"], task.get("agent"), cwd, model, parent)
+                return True, summary
+            except Exception as e:
+                return False, f"Error: {str(e)}"
+
+    return list(await asyncio.gather(*(run_one(task) for task in tasks)))
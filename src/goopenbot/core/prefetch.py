@@ -0,0 +1,174 @@
+"""Speculative prefetch of the files the model is likely to read next."""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from .config import load_config
+
+# Larger files are left to the read tool's streaming reader
+MAX_PREFETCH_FILE_BYTES = 256 * 1024
+# Ancestor directories searched for the top-level package of an import
+MAX_IMPORT_ROOT_DEPTH = 4
+
+_GREP_LINE = re.compile(r"^(.+?):\d+: ")
+
+
+def grep_candidates(output: str) -> list[Path]:
+    """Files named in grep output, in order of first match."""
+    seen: dict[str, None] = {}
+    for line in output.splitlines():
+        match = _GREP_LINE.match(line)
+        if match:
+            seen.setdefault(match.group(1))
+    return [Path(path) for path in seen]
+
+
+def glob_candidates(output: str, root: Path) -> list[Path]:
+    """Files listed in glob output (paths relative to root)."""
+    return [root / line for line in output.splitlines() if line and not line.startswith("... ")]
+
+
+def import_candidates(path: Path) -> list[Path]:
+    """Workspace files for the modules a Python file imports."""
+    # Imported here: this module is loaded by thin clients of `goopenbot serve`
+    from .symbols import imported_modules, parse_imports
+
+    roots = list(path.parents)[:MAX_IMPORT_ROOT_DEPTH]
+    if not roots:
+        return []
+    # Relative imports resolve to dotted names under the outermost root
+    rel = path.relative_to(roots[-1]).as_posix()
+    modules = imported_modules(parse_imports(str(path), rel))
+
+    found: dict[Path, None] = {}
+    for module in modules:
+        parts = [part for part in module.split(".") if part]
+        for base in roots:
+            target = base.joinpath(*parts) if parts else base
+            for candidate in (target.with_suffix(".py"), target / "__init__.py"):
+                if parts and candidate.is_file() and candidate != path:
+                    found.setdefault(candidate)
+                    break
+            else:
+                continue
+            break
+    return list(found)
+
+
+class Prefetcher:
+    """Bounded cache of file contents read ahead of the model in the background."""
+
+    def __init__(self, max_bytes: int, max_files: int = 8):
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        # path -> (mtime_ns, size, data, used)
+        self._entries: "OrderedDict[Path, tuple[int, int, bytes, bool]]" = OrderedDict()
+        self._bytes = 0
+        self._pending: set[Path] = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="goopenbot-prefetch")
+        self.prefetched = 0
+        self.prefetched_bytes = 0
+        self.used = 0
+        self.wasted_bytes = 0
+
+    def after_tool(self, name: str, args: dict[str, Any], result: dict[str, Any]) -> None:
+        """Warm the cache with the reads a tool result makes likely."""
+        if self.max_bytes <= 0 or not result.get("success"):
+            return
+        output = result.get("output", "")
+        if name == "grep":
+            candidates = grep_candidates(output)
+        elif name == "glob":
+            candidates = glob_candidates(output, Path(args.get("path") or ".").resolve())
+        elif name == "read" and str(args.get("file_path", "")).endswith(".py"):
+            candidates = import_candidates(Path(args["file_path"]).resolve())
+        else:
+            return
+        self.schedule(candidates[: self.max_files])
+
+    def schedule(self, paths: list[Path]) -> None:
+        """Read paths into the cache on a background thread."""
+        with self._lock:
+            paths = [p for p in paths if p not in self._pending and p not in self._entries]
+            self._pending.update(paths)
+        for path in paths:
+            self._pool.submit(self._load, path)
+
+    def _load(self, path: Path) -> None:
+        try:
+            stats = path.stat()
+            if not path.is_file() or stats.st_size > MAX_PREFETCH_FILE_BYTES:
+                return
+            data = path.read_bytes()
+            if b"\x00" in data[:1024]:
+                return
+            with self._lock:
+                self._store(path, (stats.st_mtime_ns, stats.st_size, data, False))
+                self.prefetched += 1
+                self.prefetched_bytes += len(data)
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard(path)
+
+    def _store(self, path: Path, entry: tuple[int, int, bytes, bool]) -> None:
+        self._drop(path)
+        self._entries[path] = entry
+        self._bytes += len(entry[2])
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, path: Path) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._bytes -= len(entry[2])
+            if not entry[3]:
+                self.wasted_bytes += len(entry[2])
+
+    def get(self, path: Path, stats: os.stat_result) -> Optional[bytes]:
+        """Prefetched content of path, if it is still current."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            mtime_ns, size, data, used = entry
+            if (mtime_ns, size) != (stats.st_mtime_ns, stats.st_size):
+                self._drop(path)
+                return None
+            if not used:
+                self.used += 1
+                self._entries[path] = (mtime_ns, size, data, True)
+            self._entries.move_to_end(path)
+            return data
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "prefetched": self.prefetched,
+                "used": self.used,
+                "accuracy": self.used / self.prefetched if self.prefetched else 0.0,
+                "prefetched_bytes": self.prefetched_bytes,
+                "wasted_bytes": self.wasted_bytes,
+                "bytes": self._bytes,
+            }
+
+
+_prefetcher: Optional[Prefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> Prefetcher:
+    """The process-wide prefetcher."""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            tools = load_config().tools
+            _prefetcher = Prefetcher(tools.prefetch_max_bytes, tools.prefetch_max_files)
+        return _prefetcher
@@ -1,13 +1,17 @@
 """Ollama provider integration using OpenAI-compatible API."""
 
+import asyncio
+import copy
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
-from openai import AsyncOpenAI
 from rich.console import Console
 from rich.panel import Panel
 
 from .config import load_config
+from .router import ModelStatsStore, choose_model, new_tool_results
 
 console = Console()
 
@@ -44,6 +48,49 @@ def supports_tools(model_name: str) -> bool:
     return any(capable in model_lower for capable in TOOL_CAPABLE_MODELS)
 
 
+FINAL_ANSWER = "final_answer"
+
+
+def action_schema(tools: list[dict[str, Any]]) -> dict[str, Any]:
+    """JSON schema accepting one call of any tool, or a final answer."""
+    variants = [
+        {
+            "type": "object",
+            "properties": {
+                "name": {"const": tool["function"]["name"]},
+                "arguments": tool["function"].get("parameters") or {"type": "object"},
+            },
+            "required": ["name", "arguments"],
+        }
+        for tool in tools
+    ]
+    variants.append(
+        {
+            "type": "object",
+            "properties": {
+                "name": {"const": FINAL_ANSWER},
+                "arguments": {
+                    "type": "object",
+                    "properties": {"answer": {"type": "string"}},
+                    "required": ["answer"],
+                },
+            },
+            "required": ["name", "arguments"],
+        }
+    )
+    return {"anyOf": variants}
+
+
+def run_sync(coroutine):
+    """Run a coroutine to completion, even when called from inside an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
 class OllamaProvider:
     """Ollama provider for local LLM inference."""
 
@@ -57,6 +104,17 @@ class OllamaProvider:
         self.base_url = base_url or config.provider.base_url
         self.model = model or config.provider.model
         self.api_key = api_key or config.provider.api_key or "not-needed"
+        self.router = config.router
+        self.constrained_tool_calls = config.provider.constrained_tool_calls
+        self._stats: Optional[ModelStatsStore] = None
+        # Model of the previous chat turn and how many messages it saw, to
+        # credit the tool calls it made once their results come back
+        self._last_model: Optional[str] = None
+        self._seen = 0
+        # Imported here: openai dominates start-up time and thin clients of
+        # `goopenbot serve` never talk to Ollama themselves
+        from openai import AsyncOpenAI
+
         self.client = AsyncOpenAI(
             base_url=self.base_url,
             api_key=self.api_key,
@@ -68,23 +126,148 @@ class OllamaProvider:
         tools: Optional[list[dict[str, Any]]] = None,
         stream: bool = True,
     ) -> Any:
-        """Send a chat request to Ollama."""
+        """Send a chat request to Ollama, routed to a model per turn if enabled."""
+        if self._last_model and self._recording:
+            results = new_tool_results(messages, self._seen)
+            if results:
+                self._record(self._last_model, tool_results=results, call=False)
+
+        model = self.model
+        if self.router.enabled:
+            model = choose_model(messages, self.router, self.model)
+        response = await self._complete(model, messages, tools, stream)
+
+        # The small model decided it is done: let the large one write the answer
+        if (
+            model != self.model
+            and not stream
+            and self.router.escalate_final_answer
+            and self._is_final_answer(response)
+        ):
+            model = self.model
+            response = await self._complete(model, messages, tools, stream)
+
+        self._last_model = model
+        self._seen = len(messages)
+        return response
+
+    def new_conversation(self) -> "OllamaProvider":
+        """A provider for another session that shares this one's HTTP client.
+
+        The previous-turn state is per conversation, so sessions running at
+        the same time don't credit each other's tool calls.
+        """
+        conversation = copy.copy(self)
+        conversation._last_model = None
+        conversation._seen = 0
+        return conversation
+
+    async def _complete(
+        self,
+        model: str,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]],
+        stream: bool,
+    ) -> Any:
         params: dict[str, Any] = {
-            "model": self.model,
+            "model": model,
             "messages": messages,
             "stream": stream,
         }
 
         # Only add tools if the model supports them
-        if tools and supports_tools(self.model):
+        constrained = False
+        if tools and supports_tools(model):
             params["tools"] = tools
+        elif tools and not stream and self.constrained_tool_calls:
+            # Ollama decodes against the schema, so every turn is a valid action
+            constrained = True
+            params["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "action", "schema": action_schema(tools)},
+            }
         elif tools:
             console.print(
-                f"[yellow]Warning: Model {self.model} may not support tools. "
+                f"[yellow]Warning: Model {model} may not support tools. "
                 f"Using a model like qwen2.5-coder or llama3.1 for tool support.[/yellow]"
             )
 
-        return await self.client.chat.completions.create(**params)
+        started = time.monotonic()
+        try:
+            response = await self.client.chat.completions.create(**params)
+        except Exception:
+            self._record(model, time.monotonic() - started, error=True)
+            raise
+        self._record(model, time.monotonic() - started)
+        if constrained:
+            self._apply_action(response)
+        return response
+
+    @staticmethod
+    def _apply_action(response: Any) -> None:
+        """Turn a constrained JSON action into a tool call or the answer text."""
+        from openai.types.chat.chat_completion_message_tool_call import (
+            ChatCompletionMessageToolCall,
+            Function,
+        )
+
+        message = response.choices[0].message
+        try:
+            action = json.loads(message.content or "")
+            name, arguments = action["name"], action["arguments"]
+        except (ValueError, TypeError, KeyError):
+            return  # left for the text fallback
+        if name == FINAL_ANSWER:
+            message.content = str((arguments or {}).get("answer", ""))
+            return
+        # The history keeps the call as text, as for models that write it themselves
+        message.content = json.dumps({"name": name, "arguments": arguments})
+        message.tool_calls = [
+            ChatCompletionMessageToolCall(
+                id=f"call_{response.id}",
+                type="function",
+                function=Function(name=name, arguments=json.dumps(arguments)),
+            )
+        ]
+
+    @staticmethod
+    def _is_final_answer(response: Any) -> bool:
+        # Imported here: the orchestrator imports this module
+        from .orchestrator import parse_tool_call
+
+        message = response.choices[0].message
+        return not message.tool_calls and parse_tool_call(message.content or "") is None
+
+    @property
+    def _recording(self) -> bool:
+        # Stats only serve tuning the router, so skip the writes without it
+        return self.router.enabled and self.router.record_stats
+
+    def _record(self, model: str, seconds: float = 0.0, **counts) -> None:
+        if not self._recording:
+            return
+        try:
+            if self._stats is None:
+                self._stats = ModelStatsStore()
+            self._stats.record(model, seconds, **counts)
+        except Exception:
+            pass  # stats must never break a chat turn
+
+    async def embed(
+        self,
+        texts: list[str],
+        model: Optional[str] = None,
+        batch_size: int = 32,
+    ) -> list[list[float]]:
+        """Embed texts through the embeddings endpoint, batch_size at a time."""
+        model = model or load_config().provider.embedding_model
+        vectors: list[list[float]] = []
+        for i in range(0, len(texts), batch_size):
+            response = await self.client.embeddings.create(
+                model=model, input=texts[i : i + batch_size]
+            )
+            vectors.extend(item.embedding for item in sorted(response.data, key=lambda d: d.index))
+        return vectors
 
     async def list_models(self) -> list[dict[str, Any]]:
         """List available models from Ollama."""
@@ -0,0 +1,138 @@
+"""Compact repository map: directory layout plus top-level symbols per file."""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from .config import get_data_dir
+from .symbols import get_symbol_index, module_names
+from .workspace import get_snapshot, is_ignored_path, load_ignore_patterns
+
+DEFAULT_TOKEN_BUDGET = 1024
+MAX_DIRECTORIES = 40
+MAX_DIRECTORY_DEPTH = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _workspace_files(root: Path) -> list[tuple[str, int, int]]:
+    """(path, size, mtime_ns) of every non-ignored file under root."""
+    patterns = load_ignore_patterns(root)
+    return sorted(
+        (rel, size, mtime)
+        for rel, is_dir, size, mtime in get_snapshot(root).match("**/*", restat=True)
+        if not is_dir and not is_ignored_path(rel, patterns)
+    )
+
+
+def tree_hash(root: Path) -> str:
+    """Hash of the paths, sizes and mtimes of the files under root."""
+    digest = hashlib.sha1()
+    for rel, size, mtime in _workspace_files(Path(root).resolve()):
+        digest.update(f"{rel}\0{size}\0{mtime}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _file_block(rel: str, symbols: list[list]) -> str:
+    lines = [rel]
+    for kind, qualname, _, _, signature in symbols:
+        if "." in qualname:
+            continue
+        if kind == "class":
+            prefix = qualname + "."
+            methods = [
+                name[len(prefix):]
+                for _, name, _, _, _ in symbols
+                if name.startswith(prefix) and "." not in name[len(prefix):]
+            ]
+            public = [m for m in methods if not m.startswith("_") or m == "__init__"]
+            lines.append(f"  {signature}: {', '.join(public)}" if public else f"  {signature}")
+        elif not qualname.startswith("_"):
+            lines.append(f"  {signature}")
+    return "\n".join(lines)
+
+
+def _rank_files(root: Path, files: list[str]) -> list[str]:
+    """Python files ordered by how often they are imported, then by depth."""
+    index = get_symbol_index(root)
+    by_module: dict[str, str] = {}
+    for rel in index.files:
+        for name in module_names(rel):
+            by_module.setdefault(name, rel)
+
+    importers: dict[str, set[str]] = {}
+    for rel, info in index.files.items():
+        for module, imported, _ in info["imports"]:
+            target = by_module.get(f"{module}.{imported}") or by_module.get(module)
+            if target and target != rel:
+                importers.setdefault(target, set()).add(rel)
+
+    def score(rel: str) -> tuple:
+        name = rel.rsplit("/", 1)[-1]
+        is_test = name.startswith("test_") or name.endswith("_test.py") or "/tests/" in f"/{rel}"
+        symbols = len(index.files.get(rel, {}).get("symbols", []))
+        return (is_test, -len(importers.get(rel, ())), -min(symbols, 20), rel.count("/"), rel)
+
+    return sorted((rel for rel in files if rel in index.files), key=score)
+
+
+def build_repo_map(root: Path, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Render the map of root, keeping it within roughly token_budget tokens."""
+    root = Path(root).resolve()
+    files = [rel for rel, _, _ in _workspace_files(root)]
+
+    directories: dict[str, int] = {}
+    for rel in files:
+        parts = rel.split("/")[:-1][:MAX_DIRECTORY_DEPTH]
+        directory = "/".join(parts) + "/" if parts else "./"
+        directories[directory] = directories.get(directory, 0) + 1
+    layout = [
+        f"  {directory} ({count} files)"
+        for directory, count in sorted(directories.items())[:MAX_DIRECTORIES]
+    ]
+
+    text = "Repository layout:\n" + "\n".join(layout)
+    if estimate_tokens(text) > token_budget:
+        return ""
+
+    header = "\n\nKey files and their top-level symbols:\n"
+    index = get_symbol_index(root, refresh=False)
+    blocks: list[str] = []
+    used = estimate_tokens(text + header)
+    for rel in _rank_files(root, files):
+        block = _file_block(rel, index.files[rel]["symbols"])
+        if "\n" not in block:
+            continue
+        cost = estimate_tokens(block + "\n")
+        if used + cost > token_budget:
+            continue
+        blocks.append(block)
+        used += cost
+    if blocks:
+        text += header + "\n".join(blocks)
+    return text
+
+
+def get_repo_map(root: Path, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """The repo map for root, reusing the cached one while the tree is unchanged."""
+    root = Path(root).resolve()
+    key = re.sub(r"[^A-Za-z0-9]+", "_", str(root)).strip("_")
+    cache_path = get_data_dir() / "repomap" / f"{key}.json"
+    current = tree_hash(root)
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached["hash"] == current and cached["budget"] == token_budget:
+            return cached["text"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    text = build_repo_map(root, token_budget)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps({"hash": current, "budget": token_budget, "text": text}), encoding="utf-8"
+    )
+    return text
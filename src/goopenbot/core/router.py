@@ -0,0 +1,127 @@
+"""Per-turn model routing and the per-model stats used to tune it."""
+
+import json
+import sqlite3
+from typing import Any, Optional
+
+from .config import RouterConfig, get_data_dir
+
+
+def _tool_succeeded(message: dict[str, Any]) -> bool:
+    try:
+        return json.loads(message["content"]).get("success", True) is not False
+    except (TypeError, ValueError, AttributeError):
+        return True
+
+
+def new_tool_results(messages: list[dict[str, Any]], start: int) -> list[bool]:
+    """Success of the tool results added since messages[start]."""
+    return [_tool_succeeded(m) for m in messages[start:] if m["role"] == "tool"]
+
+
+def failed_tool_streak(messages: list[dict[str, Any]]) -> int:
+    """Tool results that failed in a row at the end of the conversation."""
+    streak = 0
+    for message in reversed(messages):
+        if message["role"] == "user":
+            break
+        if message["role"] == "tool":
+            if _tool_succeeded(message):
+                break
+            streak += 1
+    return streak
+
+
+def choose_model(messages: list[dict[str, Any]], router: RouterConfig, default: str) -> str:
+    """Model for the next turn.
+
+    Turns answering the user use default. Turns that follow a tool call use
+    router.tool_model, unless the last escalate_after tool calls failed, in
+    which case router.escalation_model (or default) takes over.
+    """
+    if not messages or messages[-1]["role"] != "tool":
+        return default
+    if failed_tool_streak(messages) >= router.escalate_after:
+        return router.escalation_model or default
+    return router.tool_model or default
+
+
+class ModelStatsStore:
+    """SQLite-based per-model latency and success counters."""
+
+    def __init__(self):
+        self.db_path = get_data_dir() / "model_stats.db"
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize the database."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS model_stats (
+                model TEXT PRIMARY KEY,
+                calls INTEGER NOT NULL DEFAULT 0,
+                errors INTEGER NOT NULL DEFAULT 0,
+                seconds REAL NOT NULL DEFAULT 0,
+                tool_calls INTEGER NOT NULL DEFAULT 0,
+                tool_failures INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        conn.commit()
+        conn.close()
+
+    def record(
+        self,
+        model: str,
+        seconds: float = 0.0,
+        error: bool = False,
+        tool_results: Optional[list[bool]] = None,
+        call: bool = True,
+    ):
+        """Add a chat request (and the outcome of tool calls it made) to model's counters."""
+        tool_results = tool_results or []
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            """
+            INSERT INTO model_stats (model, calls, errors, seconds, tool_calls, tool_failures)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(model) DO UPDATE SET
+                calls = calls + excluded.calls,
+                errors = errors + excluded.errors,
+                seconds = seconds + excluded.seconds,
+                tool_calls = tool_calls + excluded.tool_calls,
+                tool_failures = tool_failures + excluded.tool_failures
+            """,
+            (
+                model,
+                int(call),
+                int(error),
+                seconds,
+                len(tool_results),
+                sum(1 for ok in tool_results if not ok),
+            ),
+        )
+        conn.commit()
+        conn.close()
+
+    def list(self) -> list[dict[str, Any]]:
+        """Counters per model, most used first."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.execute(
+            "SELECT model, calls, errors, seconds, tool_calls, tool_failures "
+            "FROM model_stats ORDER BY calls DESC"
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        return [
+            {
+                "model": model,
+                "calls": calls,
+                "errors": errors,
+                "avg_seconds": seconds / calls if calls else 0.0,
+                "tool_calls": tool_calls,
+                "tool_failures": tool_failures,
+            }
+            for model, calls, errors, seconds, tool_calls, tool_failures in rows
+        ]
@@ -10,6 +10,7 @@ from typing import Any, Optional
 from rich.console import Console
 
 from .config import get_data_dir
+from .workspace import bump_generation
 
 console = Console()
 
@@ -30,6 +31,17 @@ class Session:
         self.updated_at = updated_at
         self.messages = messages
         self.model = model
+        # (path, offset, limit, line_numbers) -> (mtime_ns, size, message index)
+        # of reads already sent to the model; runtime only, not persisted
+        self.read_cache: dict[tuple, tuple[int, int, int]] = {}
+        # Files modified by tools during this run (runtime only)
+        self.changed_files: set[str] = set()
+        # CheckpointStore that file-modifying tools snapshot into, if any
+        self.checkpoints = None
+        # AgentDefinition restricting tools and iterations, if any
+        self.agent = None
+        # Session a sub-agent works for: its checkpoints and changes go there
+        self.parent: Optional["Session"] = None
 
     @classmethod
     def create(cls, model: str = "llama3") -> "Session":
@@ -64,14 +76,31 @@ class Session:
             self.model,
         )
 
+    @property
+    def turn(self) -> int:
+        """Current turn number (count of user messages so far)."""
+        return sum(1 for m in self.messages if m["role"] == "user")
+
     def add_message(self, role: str, content: str, tool_calls: Optional[list] = None):
         """Add a message to the session."""
+        if role == "user":
+            # Files may have been edited outside our tools since the last turn
+            bump_generation()
         message: dict[str, Any] = {"role": role, "content": content}
         if tool_calls:
             message["tool_calls"] = tool_calls
         self.messages.append(message)
         self.updated_at = datetime.now().isoformat()
 
+    def record_change(self, path: str):
+        """Note that a tool modified a file: forget cached reads of it."""
+        self.changed_files.add(path)
+        # Copied first: sub-agents may record changes from several threads
+        for key in [k for k in list(self.read_cache) if k[0] == path]:
+            self.read_cache.pop(key, None)
+        if self.parent is not None:
+            self.parent.record_change(path)
+
     def add_tool_result(self, tool_call_id: str, content: str):
         """Add a tool result message."""
         self.messages.append(
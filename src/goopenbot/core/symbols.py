@@ -0,0 +1,241 @@
+"""Persistent index of Python symbols (classes, functions, methods, imports)."""
+
+import ast
+import json
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .config import get_data_dir
+from .workspace import get_snapshot, is_ignored_path, load_ignore_patterns
+
+INDEX_VERSION = 1
+# Below this many stale files parsing inline is faster than starting a pool
+PARALLEL_THRESHOLD = 64
+MAX_WORKERS = 4
+
+
+def module_names(rel: str) -> list[str]:
+    """Dotted module names a root-relative .py path can be imported as."""
+    parts = rel[:-3].split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    names = [".".join(parts)] if parts else []
+    # src layout and similar: also importable without the leading directories
+    for i in range(1, len(parts)):
+        names.append(".".join(parts[i:]))
+    return names
+
+
+def _signature(node: ast.AST) -> str:
+    if isinstance(node, ast.ClassDef):
+        bases = ", ".join(ast.unparse(base) for base in node.bases)
+        return f"class {node.name}({bases})" if bases else f"class {node.name}"
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    return f"{prefix} {node.name}({ast.unparse(node.args)}){returns}"
+
+
+def parse_file(path: str, rel: str) -> dict:
+    """Symbols and imports of one file.
+
+    Symbols are [kind, qualname, start line, end line, signature]; imports
+    are [module, imported name or "", line] with relative imports resolved.
+    """
+    try:
+        tree = ast.parse(Path(path).read_bytes(), filename=path)
+    except (SyntaxError, ValueError, OSError):
+        return {"symbols": [], "imports": []}
+
+    symbols: list[list] = []
+
+    def visit(body: list[ast.stmt], parent: str) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                kind = "class"
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = "method" if parent else "function"
+            else:
+                continue
+            qualname = f"{parent}.{node.name}" if parent else node.name
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            symbols.append([kind, qualname, start, node.end_lineno, _signature(node)])
+            if kind == "class":
+                visit(node.body, qualname)
+
+    visit(tree.body, "")
+    return {"symbols": symbols, "imports": _resolve_imports(tree, rel)}
+
+
+def _resolve_imports(tree: ast.AST, rel: str) -> list[list]:
+    imports: list[list] = []
+    package = rel[:-3].split("/")[:-1]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend([alias.name, "", node.lineno] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            if node.level:
+                base = package[: len(package) - node.level + 1]
+                module = ".".join(base + ([module] if module else []))
+            imports.extend([module, alias.name, node.lineno] for alias in node.names)
+    return imports
+
+
+def parse_imports(path: str, rel: str) -> list[list]:
+    """Just the imports of parse_file(path, rel), for callers without an index."""
+    try:
+        tree = ast.parse(Path(path).read_bytes(), filename=path)
+    except (SyntaxError, ValueError, OSError):
+        return []
+    return _resolve_imports(tree, rel)
+
+
+def imported_modules(imports: list[list]) -> list[str]:
+    """Dotted module names behind parse_file imports.
+
+    Both module and module.name are listed, since "from pkg import mod"
+    may import a submodule.
+    """
+    names: dict[str, None] = {}
+    for module, imported, _ in imports:
+        names.setdefault(module)
+        if imported:
+            names.setdefault(f"{module}.{imported}" if module else imported)
+    return list(names)
+
+
+def _parse_batch(root: str, rels: list[str]) -> list[tuple[str, dict]]:
+    return [(rel, parse_file(str(Path(root) / rel), rel)) for rel in rels]
+
+
+class SymbolIndex:
+    """Symbols of every Python file under a root, refreshed by mtime.
+
+    The index is stored as JSON in the data directory so later sessions
+    only re-parse files that changed since.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root).resolve()
+        key = re.sub(r"[^A-Za-z0-9]+", "_", str(self.root)).strip("_")
+        self.path = get_data_dir() / "symbols" / f"{key}.json"
+        # relative path -> {"mtime": ns, "symbols": [...], "imports": [...]}
+        self.files: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION:
+            self.files = data.get("files", {})
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "files": self.files}), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def refresh(self) -> int:
+        """Re-parse new and modified files and drop deleted ones.
+
+        Returns the number of files parsed.
+        """
+        with self._lock:
+            patterns = load_ignore_patterns(self.root)
+            current = {
+                rel: mtime
+                for rel, is_dir, _, mtime in get_snapshot(self.root).match("**/*.py", restat=True)
+                if not is_dir and not is_ignored_path(rel, patterns)
+            }
+            removed = [rel for rel in self.files if rel not in current]
+            stale = [
+                rel
+                for rel, mtime in current.items()
+                if self.files.get(rel, {}).get("mtime") != mtime
+            ]
+            for rel in removed:
+                del self.files[rel]
+            for rel, parsed in self._parse(stale):
+                self.files[rel] = {"mtime": current[rel], **parsed}
+            if stale or removed:
+                self._save()
+            return len(stale)
+
+    def _parse(self, rels: list[str]) -> list[tuple[str, dict]]:
+        if len(rels) < PARALLEL_THRESHOLD:
+            return _parse_batch(str(self.root), rels)
+        batches = [rels[i :: MAX_WORKERS * 4] for i in range(MAX_WORKERS * 4)]
+        try:
+            with ProcessPoolExecutor(max_workers=MAX_WORKERS) as pool:
+                results = pool.map(_parse_batch, [str(self.root)] * len(batches), batches)
+                return [item for batch in results for item in batch]
+        except (OSError, RuntimeError):
+            # No process support here (e.g. sandboxed); parse inline instead
+            return _parse_batch(str(self.root), rels)
+
+    def definitions(self, name: str) -> list[tuple[str, list]]:
+        """(file, symbol) pairs whose name or qualified name is name."""
+        found = []
+        for rel, info in sorted(self.files.items()):
+            for symbol in info["symbols"]:
+                qualname = symbol[1]
+                if qualname == name or qualname.endswith(f".{name}"):
+                    found.append((rel, symbol))
+        return found
+
+    def members(self, class_name: str) -> list[tuple[str, list, list[list]]]:
+        """(file, class symbol, member symbols) for each class called class_name."""
+        found = []
+        for rel, symbol in self.definitions(class_name):
+            if symbol[0] != "class":
+                continue
+            prefix = symbol[1] + "."
+            members = [
+                member
+                for member in self.files[rel]["symbols"]
+                if member[1].startswith(prefix) and "." not in member[1][len(prefix):]
+            ]
+            found.append((rel, symbol, members))
+        return found
+
+    def importers(self, name: str) -> list[tuple[str, list]]:
+        """(file, import) pairs that import module or name `name`."""
+        found = []
+        for rel, info in sorted(self.files.items()):
+            for imp in info["imports"]:
+                module, imported = imp[0], imp[1]
+                full = f"{module}.{imported}" if imported else module
+                if (
+                    full == name
+                    or full.endswith(f".{name}")
+                    or module == name
+                    or module.endswith(f".{name}")
+                    or imported == name
+                ):
+                    found.append((rel, imp))
+        return found
+
+    def outline(self, rel: str) -> list[list]:
+        info = self.files.get(rel)
+        return info["symbols"] if info else []
+
+
+_indexes: dict[Path, SymbolIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_symbol_index(root: Path, refresh: bool = True) -> SymbolIndex:
+    """Get the symbol index for root, refreshed unless refresh is false."""
+    root = Path(root).resolve()
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = _indexes[root] = SymbolIndex(root)
+    if refresh:
+        index.refresh()
+    return index
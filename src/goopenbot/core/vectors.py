@@ -0,0 +1,251 @@
+"""Embedding index of workspace code chunks for semantic search."""
+
+import ast
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from .config import get_data_dir
+from .workspace import (
+    CODE_EXTENSIONS,
+    MAX_FILE_BYTES,
+    get_snapshot,
+    is_ignored_path,
+    load_ignore_patterns,
+)
+
+# numpy is imported by the first VectorIndex, not by every command that
+# happens to import the tools (optional dependency)
+np = None
+
+INDEX_VERSION = 1
+MAX_CHUNK_LINES = 60
+MIN_CHUNK_LINES = 5
+
+
+def _block_chunks(lines: list[str], start: int, end: int) -> list[tuple[int, int]]:
+    """Split lines[start:end] into blank-line separated blocks of bounded size."""
+    chunks: list[tuple[int, int]] = []
+    chunk_start = start
+    for i in range(start, end):
+        size = i - chunk_start
+        at_break = not lines[i].strip() and size >= MIN_CHUNK_LINES
+        if at_break or size >= MAX_CHUNK_LINES:
+            chunks.append((chunk_start, i))
+            chunk_start = i
+    if chunk_start < end:
+        chunks.append((chunk_start, end))
+    return chunks
+
+
+def _python_chunks(source: str, lines: list[str]) -> Optional[list[tuple[int, int]]]:
+    """One chunk per top-level function/class (methods for large classes)."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+
+    spans: list[tuple[int, int]] = []
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        start = min([node.lineno] + [d.lineno for d in node.decorator_list]) - 1
+        end = node.end_lineno
+        if isinstance(node, ast.ClassDef) and end - start > MAX_CHUNK_LINES:
+            methods = [
+                child for child in node.body
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+            ]
+            cursor = start
+            for method in methods:
+                method_start = min([method.lineno] + [d.lineno for d in method.decorator_list]) - 1
+                if method_start > cursor:
+                    spans.append((cursor, method_start))
+                spans.append((method_start, method.end_lineno))
+                cursor = method.end_lineno
+            if cursor < end:
+                spans.append((cursor, end))
+        else:
+            spans.append((start, end))
+
+    # Module-level code between definitions is chunked by blocks
+    chunks: list[tuple[int, int]] = []
+    cursor = 0
+    for start, end in spans:
+        if start > cursor:
+            chunks.extend(_block_chunks(lines, cursor, start))
+        chunks.append((start, end))
+        cursor = max(cursor, end)
+    if cursor < len(lines):
+        chunks.extend(_block_chunks(lines, cursor, len(lines)))
+    return chunks
+
+
+def chunk_file(rel: str, text: str) -> list[tuple[int, int, str]]:
+    """(first line, last line, text) chunks of a file, lines 1-based."""
+    lines = text.splitlines()
+    spans = _python_chunks(text, lines) if rel.endswith(".py") else None
+    if spans is None:
+        spans = _block_chunks(lines, 0, len(lines))
+    chunks = []
+    for start, end in spans:
+        body = "\n".join(lines[start:end]).strip()
+        if body:
+            chunks.append((start + 1, end, body))
+    return chunks
+
+
+class VectorIndex:
+    """Chunk embeddings of the files under a root, stored as a float32 memmap.
+
+    Vectors are normalised so cosine similarity is a dot product. Chunks
+    are keyed by the hash of the text that was embedded, so updates only
+    embed chunks that are new or changed.
+    """
+
+    def __init__(self, root: Path, model: str):
+        global np
+        if np is None:
+            try:
+                import numpy as np
+            except ImportError:
+                raise RuntimeError("numpy is not installed (pip install goopenbot[semantic])") from None
+        self.root = Path(root).resolve()
+        self.model = model
+        key = re.sub(r"[^A-Za-z0-9]+", "_", f"{self.root}_{model}").strip("_")
+        self.dir = get_data_dir() / "vectors" / key
+        self.meta_path = self.dir / "meta.json"
+        self.vectors_path = self.dir / "vectors.f32"
+        # chunk hash -> [path, first line, last line]
+        self.chunks: dict[str, list] = {}
+        self.order: list[str] = []
+        # path -> [mtime_ns, [[chunk hash, first line, last line], ...]]
+        self.files: dict[str, list] = {}
+        self.dim = 0
+        self.vectors = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if meta.get("version") != INDEX_VERSION or not meta.get("order"):
+            return
+        self.chunks, self.order, self.files = meta["chunks"], meta["order"], meta["files"]
+        self.dim = meta["dim"]
+        self.vectors = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.order), self.dim)
+        )
+
+    def _workspace_files(self) -> dict[str, int]:
+        patterns = load_ignore_patterns(self.root)
+        return {
+            rel: mtime
+            for rel, is_dir, size, mtime in get_snapshot(self.root).match("**/*", restat=True)
+            if not is_dir
+            and size <= MAX_FILE_BYTES
+            and os.path.splitext(rel)[1] in CODE_EXTENSIONS
+            and not is_ignored_path(rel, patterns)
+        }
+
+    def update(self, embed: Callable[[list[str]], list[list[float]]]) -> int:
+        """Bring the index up to date, embedding only new chunks.
+
+        Returns the number of chunks embedded.
+        """
+        with self._lock:
+            current = self._workspace_files()
+            files: dict[str, list] = {}
+            chunks: dict[str, list] = {}
+            pending: dict[str, str] = {}
+            for rel, mtime in current.items():
+                cached = self.files.get(rel)
+                if cached and cached[0] == mtime:
+                    files[rel] = cached
+                    for digest, start, end in cached[1]:
+                        chunks[digest] = [rel, start, end]
+                    continue
+                try:
+                    text = (self.root / rel).read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    continue
+                entries = []
+                for start, end, body in chunk_file(rel, text):
+                    # Line numbers are left out so moved code keeps its vector
+                    document = f"{rel}\n{body}"
+                    digest = hashlib.sha1(document.encode("utf-8")).hexdigest()
+                    entries.append([digest, start, end])
+                    chunks[digest] = [rel, start, end]
+                    if digest not in self.chunks:
+                        pending[digest] = document
+                files[rel] = [mtime, entries]
+
+            if files == self.files:
+                return 0
+
+            new_vectors = {}
+            if pending:
+                embedded = embed(list(pending.values()))
+                new_vectors = dict(zip(pending, np.asarray(embedded, dtype=np.float32)))
+            self._write(files, chunks, new_vectors)
+            return len(pending)
+
+    def _write(self, files: dict, chunks: dict, new_vectors: dict) -> None:
+        order = list(chunks)
+        dim = self.dim or (len(next(iter(new_vectors.values()))) if new_vectors else 0)
+        old_rows = {digest: i for i, digest in enumerate(self.order)}
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.vectors_path.with_suffix(".tmp")
+        if order:
+            matrix = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(len(order), dim))
+            for row, digest in enumerate(order):
+                if digest in new_vectors:
+                    vector = new_vectors[digest]
+                    norm = float(np.linalg.norm(vector))
+                    matrix[row] = vector / norm if norm else vector
+                else:
+                    matrix[row] = self.vectors[old_rows[digest]]
+            matrix.flush()
+            del matrix
+            os.replace(tmp_path, self.vectors_path)
+
+        self.files, self.chunks, self.order, self.dim = files, chunks, order, dim
+        self.meta_path.write_text(
+            json.dumps(
+                {
+                    "version": INDEX_VERSION,
+                    "model": self.model,
+                    "dim": dim,
+                    "order": order,
+                    "chunks": chunks,
+                    "files": files,
+                }
+            ),
+            encoding="utf-8",
+        )
+        self.vectors = (
+            np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(order), dim))
+            if order
+            else None
+        )
+
+    def search(self, query: list[float], k: int = 10) -> list[tuple[float, str, int, int]]:
+        """Top-k (score, path, first line, last line) by cosine similarity."""
+        if self.vectors is None or not self.order:
+            return []
+        vector = np.asarray(query, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm:
+            vector = vector / norm
+        scores = self.vectors @ vector
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), *self.chunks[self.order[i]]) for i in top]
@@ -0,0 +1,587 @@
+"""Workspace filesystem snapshots and helpers shared by the file tools."""
+
+import fnmatch
+import os
+import re
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # optional dependency, mtime checks are used instead
+    INotify = None
+    inotify_flags = None
+
+# Maximum number of workspace roots kept in memory at once
+MAX_SNAPSHOTS = 8
+
+# Directory names skipped by tree listings and indexes
+DEFAULT_IGNORES = [
+    ".git",
+    ".hg",
+    ".svn",
+    "__pycache__",
+    "node_modules",
+    ".venv",
+    "venv",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".goopenbot_cache",
+    ".ruff_cache",
+    ".tox",
+    ".nox",
+    "*.egg-info",
+]
+
+# Files the search and semantic search indexes cover
+MAX_FILE_BYTES = 200_000
+CODE_EXTENSIONS = {
+    ".py", ".pyi", ".js", ".jsx", ".ts", ".tsx", ".go", ".rs", ".java", ".kt", ".c", ".h",
+    ".cc", ".cpp", ".hpp", ".cs", ".rb", ".php", ".swift", ".scala", ".sh", ".sql",
+    ".md", ".rst", ".txt", ".toml", ".yaml", ".yml", ".json", ".cfg", ".ini",
+}
+
+
+# Per-workspace cache directory, kept out of version control like .pytest_cache
+CACHE_DIR = ".goopenbot_cache"
+
+
+def workspace_cache_dir(root: Path) -> Path:
+    """Cache directory inside a workspace, created with a catch-all .gitignore."""
+    cache_dir = Path(root) / CACHE_DIR
+    if not cache_dir.is_dir():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / ".gitignore").write_text("# Created by goopenbot\n*\n", encoding="utf-8")
+    return cache_dir
+
+
+def load_ignore_patterns(root: Path) -> list[str]:
+    """Default ignores plus the simple patterns from root/.gitignore.
+
+    Negations ('!pattern') are not supported and are skipped.
+    """
+    patterns = list(DEFAULT_IGNORES)
+    gitignore = Path(root) / ".gitignore"
+    try:
+        lines = gitignore.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        return patterns
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("!"):
+            continue
+        patterns.append(line)
+    return patterns
+
+
+def is_ignored(rel: str, is_dir: bool, patterns: list[str]) -> bool:
+    """Check a root-relative path against gitignore-style patterns."""
+    name = rel.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        if pattern.endswith("/"):
+            if not is_dir:
+                continue
+            pattern = pattern.rstrip("/")
+        if "/" in pattern:
+            if fnmatch.fnmatchcase(rel, pattern.lstrip("/")):
+                return True
+        elif fnmatch.fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def is_ignored_path(rel: str, patterns: list[str]) -> bool:
+    """Like is_ignored for a file, but also true when any parent directory is ignored."""
+    parts = rel.split("/")
+    for i in range(1, len(parts)):
+        if is_ignored("/".join(parts[:i]), True, patterns):
+            return True
+    return is_ignored(rel, False, patterns)
+
+
+def _segment_regex(segment: str) -> str:
+    """Translate one glob path segment to a regex that never crosses '/'."""
+    out = []
+    i = 0
+    while i < len(segment):
+        c = segment[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = segment.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = segment[i + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def compile_glob(pattern: str) -> re.Pattern:
+    """Compile a pathlib-style glob pattern ('**' spans directories)."""
+    segments = [s for s in pattern.replace("\\", "/").split("/") if s not in ("", ".")]
+    trailing_recursive = bool(segments) and segments[-1] == "**"
+    if trailing_recursive:
+        segments.pop()
+
+    regex = ""
+    for i, segment in enumerate(segments):
+        if segment == "**":
+            regex += "(?:[^/]+/)*"
+        else:
+            regex += _segment_regex(segment)
+            if i < len(segments) - 1:
+                regex += "/"
+    if trailing_recursive:
+        # 'dir/**' is dir itself and every directory below it
+        regex += "(?:/[^/]+)*" if segments else "[^/]+(?:/[^/]+)*"
+    return re.compile(f"(?s:{regex})\\Z")
+
+
+def glob_matches_dirs_only(pattern: str) -> bool:
+    """Whether a glob only selects directories, as pathlib does."""
+    pattern = pattern.replace("\\", "/")
+    return pattern.endswith("/") or pattern == "**" or pattern.endswith("/**")
+
+
+def default_file_mode() -> int:
+    """Permissions open() gives a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def file_mode(path: Path) -> int:
+    """Permissions to write path with: its own if it exists, else the default."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        return default_file_mode()
+
+
+def write_temp_file(path: Path, content: str) -> Path:
+    """Write content to a temporary file next to path, fsynced.
+
+    The temp file keeps the permissions of path when it already exists, and
+    otherwise gets those open() would give a new file, so os.replace() onto
+    path is the only step left to commit it.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, file_mode(path))
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return Path(tmp_name)
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Replace path with content so readers never see a partial file."""
+    os.replace(write_temp_file(path, content), path)
+
+
+class WorkspaceSnapshot:
+    """In-memory listing of every path under a root, with stat info.
+
+    Paths are stored relative to the root. Ignored directories (defaults
+    plus root/.gitignore) are listed but not walked into. The snapshot is
+    kept fresh by explicit notifications from our own tools, by inotify
+    events when inotify_simple is installed, and otherwise by comparing
+    directory mtimes before each use and re-listing the directories that
+    changed.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        # relative path -> (is_dir, size, mtime_ns)
+        self.entries: dict[str, tuple[bool, int, int]] = {}
+        # relative directory ("" for the root) -> mtime_ns
+        self.dir_mtimes: dict[str, int] = {}
+        self.patterns: list[str] = []
+        self._lock = threading.RLock()
+        self._inotify = None
+        self._watches: dict[int, str] = {}
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Walk the whole tree again."""
+        with self._lock:
+            self.entries = {}
+            self.dir_mtimes = {}
+            self.patterns = load_ignore_patterns(self.root)
+            self._watches = {}
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            if INotify is not None:
+                try:
+                    self._inotify = INotify()
+                except OSError:
+                    self._inotify = None
+            self._walk("")
+
+    def _walk(self, rel_dir: str) -> None:
+        """Add everything under rel_dir (non-recursive stack walk)."""
+        stack = [rel_dir]
+        while stack:
+            current = stack.pop()
+            full = self.root / current if current else self.root
+            try:
+                self.dir_mtimes[current] = os.stat(full).st_mtime_ns
+                self._watch(current, full)
+                with os.scandir(full) as it:
+                    for entry in it:
+                        rel = f"{current}/{entry.name}" if current else entry.name
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        is_dir = stat.S_ISDIR(st.st_mode)
+                        self.entries[rel] = (is_dir, st.st_size, st.st_mtime_ns)
+                        if is_dir and not is_ignored(rel, True, self.patterns):
+                            stack.append(rel)
+            except (PermissionError, FileNotFoundError, NotADirectoryError):
+                continue
+
+    def _pruned(self, rel: str) -> bool:
+        """Whether rel lies inside a directory the walk skips."""
+        parts = rel.split("/")
+        return any(is_ignored("/".join(parts[:i]), True, self.patterns) for i in range(1, len(parts)))
+
+    def lists(self, rel_dir: str) -> bool:
+        """Whether the contents of rel_dir are in the snapshot (it is not pruned)."""
+        return not rel_dir or not self._pruned(rel_dir + "/-")
+
+    def _watch(self, rel_dir: str, full: Path) -> None:
+        if self._inotify is None:
+            return
+        mask = (
+            inotify_flags.CREATE
+            | inotify_flags.DELETE
+            | inotify_flags.MODIFY
+            | inotify_flags.ATTRIB
+            | inotify_flags.MOVED_FROM
+            | inotify_flags.MOVED_TO
+        )
+        try:
+            wd = self._inotify.add_watch(str(full), mask)
+            self._watches[wd] = rel_dir
+        except OSError:
+            # Watch limit reached: fall back to mtime checks
+            self._inotify.close()
+            self._inotify = None
+            self._watches = {}
+
+    def _remove(self, rel: str) -> None:
+        was = self.entries.pop(rel, None)
+        if was and was[0]:
+            self._remove_children(rel)
+
+    def _remove_children(self, rel: str) -> None:
+        prefix = rel + "/"
+        for key in [k for k in self.entries if k.startswith(prefix)]:
+            del self.entries[key]
+        for key in [k for k in self.dir_mtimes if k == rel or k.startswith(prefix)]:
+            del self.dir_mtimes[key]
+
+    def refresh_path(self, rel: str) -> None:
+        """Bring a single relative path (and its parent listing) up to date."""
+        with self._lock:
+            rel = rel.strip("/")
+            if not rel or self._pruned(rel):
+                return
+            if rel == ".gitignore" and load_ignore_patterns(self.root) != self.patterns:
+                # The set of pruned directories changed
+                self.rebuild()
+                return
+            parent = os.path.dirname(rel)
+            if parent and parent not in self.dir_mtimes:
+                # New parent directory: picking it up covers this path too
+                self.refresh_path(parent)
+                return
+
+            try:
+                st = os.lstat(self.root / rel)
+            except OSError:
+                self._remove(rel)
+            else:
+                is_dir = stat.S_ISDIR(st.st_mode)
+                known = self.entries.get(rel)
+                self.entries[rel] = (is_dir, st.st_size, st.st_mtime_ns)
+                if known is not None and known[0] and not is_dir:
+                    self._remove_children(rel)
+                if (
+                    is_dir
+                    and (known is None or not known[0])
+                    and not is_ignored(rel, True, self.patterns)
+                ):
+                    self._walk(rel)
+
+            parent_full = self.root / parent if parent else self.root
+            try:
+                self.dir_mtimes[parent] = os.stat(parent_full).st_mtime_ns
+            except OSError:
+                pass
+
+    def ensure_fresh(self) -> None:
+        """Apply pending external changes before the snapshot is used."""
+        with self._lock:
+            if self._inotify is not None:
+                events = self._inotify.read(timeout=0)
+                for event in events:
+                    if event.mask & inotify_flags.Q_OVERFLOW:
+                        self.rebuild()
+                        return
+                    rel_dir = self._watches.get(event.wd)
+                    if rel_dir is None or not event.name:
+                        continue
+                    self.refresh_path(f"{rel_dir}/{event.name}" if rel_dir else event.name)
+                return
+
+            changed = []
+            for rel_dir, mtime in self.dir_mtimes.items():
+                full = self.root / rel_dir if rel_dir else self.root
+                try:
+                    if os.stat(full).st_mtime_ns != mtime:
+                        changed.append(rel_dir)
+                except OSError:
+                    changed.append(rel_dir)
+            # Parents first, so directories removed with them are skipped
+            for rel_dir in sorted(changed, key=lambda d: d.count("/") + bool(d)):
+                if rel_dir in self.dir_mtimes:
+                    self._relist(rel_dir)
+
+    def _relist(self, rel_dir: str) -> None:
+        """Bring the direct children of one directory up to date."""
+        full = self.root / rel_dir if rel_dir else self.root
+        try:
+            with os.scandir(full) as it:
+                names = {entry.name for entry in it}
+        except OSError:
+            if not rel_dir:
+                self.rebuild()
+            else:
+                self._remove(rel_dir)
+            return
+
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        known = [
+            key
+            for key in self.entries
+            if key.startswith(prefix) and "/" not in key[len(prefix) :]
+        ]
+        for key in known:
+            if key[len(prefix) :] not in names:
+                self._remove(key)
+        for name in names:
+            self.refresh_path(prefix + name)
+        try:
+            self.dir_mtimes[rel_dir] = os.stat(full).st_mtime_ns
+        except OSError:
+            pass
+
+    def match(self, pattern: str, restat: bool = False) -> list[tuple[str, bool, int, int]]:
+        """Return (path, is_dir, size, mtime_ns) for entries matching a glob.
+
+        With restat, matched files are stat'ed again so in-place edits that
+        did not touch a directory mtime are still reflected (not needed when
+        inotify is watching).
+        """
+        regex = compile_glob(pattern)
+        dirs_only = glob_matches_dirs_only(pattern)
+        with self._lock:
+            matches = [
+                (rel, *info)
+                for rel, info in self.entries.items()
+                if regex.match(rel) and (info[0] or not dirs_only)
+            ]
+            if not restat or self._inotify is not None:
+                return matches
+            fresh = []
+            for rel, is_dir, size, mtime in matches:
+                try:
+                    st = os.lstat(self.root / rel)
+                except OSError:
+                    continue
+                self.entries[rel] = (is_dir, st.st_size, st.st_mtime_ns)
+                fresh.append((rel, is_dir, st.st_size, st.st_mtime_ns))
+            return fresh
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+_snapshots: "OrderedDict[Path, WorkspaceSnapshot]" = OrderedDict()
+_snapshots_lock = threading.Lock()
+
+
+def get_snapshot(root: Path) -> WorkspaceSnapshot:
+    """Get an up-to-date snapshot for a directory, building it if needed."""
+    root = Path(root).resolve()
+    with _snapshots_lock:
+        snapshot = _snapshots.get(root)
+        if snapshot is None:
+            snapshot = WorkspaceSnapshot(root)
+            _snapshots[root] = snapshot
+            if len(_snapshots) > MAX_SNAPSHOTS:
+                _, evicted = _snapshots.popitem(last=False)
+                evicted.close()
+            return snapshot
+        _snapshots.move_to_end(root)
+    snapshot.ensure_fresh()
+    return snapshot
+
+
+_generation = 0
+
+
+def get_generation() -> int:
+    """Counter that increases whenever a tool may have changed the workspace."""
+    return _generation
+
+
+def bump_generation() -> None:
+    """Mark the workspace as changed (e.g. after running a shell command)."""
+    global _generation
+    _generation += 1
+
+
+def notify_file_changed(path: Path) -> None:
+    """Tell the snapshots that a file was created, modified or deleted."""
+    bump_generation()
+    path = Path(path).resolve()
+    with _snapshots_lock:
+        snapshots = list(_snapshots.values())
+    for snapshot in snapshots:
+        try:
+            rel = path.relative_to(snapshot.root)
+        except ValueError:
+            continue
+        snapshot.refresh_path(rel.as_posix())
+
+
+def clear_snapshots(root: Optional[Path] = None) -> None:
+    """Drop cached snapshots (all of them, or just the one for root)."""
+    with _snapshots_lock:
+        if root is None:
+            for snapshot in _snapshots.values():
+                snapshot.close()
+            _snapshots.clear()
+        else:
+            snapshot = _snapshots.pop(Path(root).resolve(), None)
+            if snapshot:
+                snapshot.close()
+
+
+def has_magic(segment: str) -> bool:
+    """Whether a glob path segment contains wildcards."""
+    return any(c in segment for c in "*?[")
+
+
+def _escape_glob(text: str) -> str:
+    return re.sub(r"([*?[])", r"[\1]", text)
+
+
+def _glob_entry(rel: str, full: Path) -> Optional[tuple[str, bool, int, int]]:
+    try:
+        st = os.lstat(full)
+    except OSError:
+        return None
+    return rel, stat.S_ISDIR(st.st_mode), st.st_size, st.st_mtime_ns
+
+
+def _list_glob(base: Path, segments: list[str], dirs_only: bool) -> list[tuple[str, bool, int, int]]:
+    """Match a pattern without '**' by listing only the directories it names."""
+    found = [("", base)]
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        regex = re.compile(f"(?s:{_segment_regex(segment)})\\Z") if has_magic(segment) else None
+        matched = []
+        for rel, full in found:
+            if regex is None:
+                names = [segment]
+            else:
+                try:
+                    with os.scandir(full) as it:
+                        names = [entry.name for entry in it if regex.match(entry.name)]
+                except OSError:
+                    continue
+            for name in names:
+                child = full / name
+                if last or child.is_dir():
+                    matched.append((f"{rel}/{name}" if rel else name, child))
+        found = matched
+
+    results = []
+    for rel, full in found:
+        entry = _glob_entry(rel, full)
+        if entry is not None and (entry[1] or not dirs_only):
+            results.append(entry)
+    return results
+
+
+def _snapshot_for(base: Path) -> tuple[WorkspaceSnapshot, str]:
+    """A snapshot covering base (an existing one of a parent if possible) and base's path in it."""
+    with _snapshots_lock:
+        roots = [root for root in _snapshots if root != base and base.is_relative_to(root)]
+    for root in sorted(roots, key=lambda r: len(r.parts), reverse=True):
+        snapshot = get_snapshot(root)
+        prefix = base.relative_to(root).as_posix()
+        if snapshot.lists(prefix):
+            return snapshot, prefix
+    return get_snapshot(base), ""
+
+
+def glob_paths(base: Path, pattern: str, restat: bool = False) -> list[tuple[str, bool, int, int]]:
+    """Return (path relative to base, is_dir, size, mtime_ns) for paths matching a glob.
+
+    Patterns without '**' list only the directories they name. Recursive
+    patterns are served from a workspace snapshot, which skips ignored
+    directories; when the pattern's literal leading directories point into
+    one, that directory is walked on demand instead. See WorkspaceSnapshot.match
+    for restat.
+    """
+    base = Path(base).resolve()
+    segments = [s for s in pattern.replace("\\", "/").split("/") if s not in ("", ".")]
+    if not segments:
+        return []
+    if "**" not in segments:
+        return _list_glob(base, segments, glob_matches_dirs_only(pattern))
+
+    literal = []
+    for segment in segments:
+        if has_magic(segment):
+            break
+        literal.append(segment)
+    snapshot, prefix = _snapshot_for(base)
+    if not snapshot.lists("/".join(part for part in (prefix, *literal) if part)):
+        return [
+            entry
+            for path in base.glob(pattern)
+            if (entry := _glob_entry(path.relative_to(base).as_posix(), path)) is not None
+        ]
+    if not prefix:
+        return snapshot.match(pattern, restat)
+    start = len(prefix) + 1
+    return [
+        (rel[start:], *info)
+        for rel, *info in snapshot.match(f"{_escape_glob(prefix)}/{pattern}", restat)
+    ]
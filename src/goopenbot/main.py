@@ -12,6 +12,8 @@ from goopenbot.commands.run import run_command
 from goopenbot.commands.models import models_command
 from goopenbot.commands.session import session_command
 from goopenbot.commands.agent import agent_command
+from goopenbot.commands.batch import batch_command
+from goopenbot.commands.serve import serve_command
 from goopenbot.core.provider import check_ollama_connection, print_welcome
 from goopenbot.core.config import load_config
 
@@ -31,26 +33,33 @@ def run(
     session_id: Optional[str] = typer.Option(None, "--session", "-s", help="Continue a specific session"),
     model: Optional[str] = typer.Option(None, "--model", "-m", help="Model to use"),
     dir: Optional[str] = typer.Option(None, "--dir", "-d", help="Working directory"),
+    repo_map: Optional[bool] = typer.Option(
+        None, "--repo-map/--no-repo-map", help="Add a map of the repository to the system prompt"
+    ),
+    agent: Optional[str] = typer.Option(None, "--agent", "-a", help="Run as the agent defined in agents/<name>.md"),
 ):
     """Run goopenbot with a message (main command)."""
-    asyncio.run(run_command(message, continue_session, session_id, model, dir))
+    asyncio.run(run_command(message, continue_session, session_id, model, dir, repo_map, agent))
 
 
 @app.command()
 def models(
     refresh: bool = typer.Option(False, "--refresh", help="Refresh model list"),
+    stats: bool = typer.Option(False, "--stats", help="Show per-model latency and tool success"),
 ):
     """List available models from Ollama."""
-    asyncio.run(models_command(refresh))
+    asyncio.run(models_command(refresh, stats))
 
 
 @app.command()
 def session(
     list_sessions: bool = typer.Option(False, "--list", "-l", help="List all sessions"),
     delete: Optional[str] = typer.Option(None, "--delete", help="Delete a session by ID"),
+    rollback: Optional[str] = typer.Option(None, "--rollback", help="Restore files changed by a session by ID"),
+    to: Optional[int] = typer.Option(0, "--to", help="Turn to roll back to (0 = before the session)"),
 ):
     """Manage sessions."""
-    asyncio.run(session_command(list_sessions, delete))
+    asyncio.run(session_command(list_sessions, delete, rollback, to))
 
 
 @app.command()
@@ -63,6 +72,27 @@ def agent(
     asyncio.run(agent_command(list_agents, create, name))
 
 
+@app.command()
+def batch(
+    tasks_file: str = typer.Argument(..., help="JSONL file with one task per line"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Results file (default: <tasks>.results.jsonl)"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", "-j", help="Tasks to run at once"),
+    timeout: Optional[int] = typer.Option(None, "--timeout", help="Seconds allowed per task"),
+    resume: bool = typer.Option(False, "--resume", help="Skip tasks that already succeeded"),
+):
+    """Run many tasks from a JSONL file in one process."""
+    asyncio.run(batch_command(tasks_file, output, concurrency, timeout, resume))
+
+
+@app.command()
+def serve():
+    """Keep models, sessions and indexes warm for run, session and models."""
+    try:
+        asyncio.run(serve_command())
+    except KeyboardInterrupt:
+        console.print("\n[dim]Daemon stopped[/dim]")
+
+
 @app.callback(invoke_without_command=True)
 def main(ctx: typer.Context):
     """goopenbot - AI-powered development tool."""
@@ -72,6 +102,8 @@ def main(ctx: typer.Context):
         console.print("  goopenbot run <message>    Run with a message")
         console.print("  goopenbot models          List available models")
         console.print("  goopenbot session --list  List sessions")
+        console.print("  goopenbot batch <file>    Run tasks from a JSONL file")
+        console.print("  goopenbot serve           Keep goopenbot warm for faster commands")
         console.print("  goopenbot --help          Show this help")
 
 
@@ -1,19 +1,39 @@
 """Tools for goopenbot."""
 
 from .read import ReadTool
+from .read_many import ReadManyTool
 from .write import WriteTool
 from .bash import BashTool
+from .jobs import JobStatusTool, JobOutputTool, JobKillTool
 from .glob import GlobTool
 from .grep import GrepTool
 from .edit import EditTool
+from .multi_edit import MultiEditTool
+from .git import GitTool
+from .testrunner import TestRunnerTool
+from .symbols import SymbolsTool
+from .semantic_search import SemanticSearchTool
+from .search import SearchTool
+from .task import TaskTool
 
 __all__ = [
     "ReadTool",
+    "ReadManyTool",
     "WriteTool",
     "BashTool",
+    "JobStatusTool",
+    "JobOutputTool",
+    "JobKillTool",
     "GlobTool",
     "GrepTool",
     "EditTool",
+    "MultiEditTool",
+    "GitTool",
+    "TestRunnerTool",
+    "SymbolsTool",
+    "SemanticSearchTool",
+    "SearchTool",
+    "TaskTool",
 ]
 
 
@@ -21,11 +41,22 @@ def get_all_tools():
     """Get all available tools."""
     return [
         ReadTool,
+        ReadManyTool,
         WriteTool,
         BashTool,
+        JobStatusTool,
+        JobOutputTool,
+        JobKillTool,
         GlobTool,
         GrepTool,
         EditTool,
+        MultiEditTool,
+        GitTool,
+        TestRunnerTool,
+        SymbolsTool,
+        SemanticSearchTool,
+        SearchTool,
+        TaskTool,
     ]
 
 
@@ -35,6 +66,10 @@ def get_tool_by_name(name: str):
     return tools.get(name)
 
 
-def get_tools_schema():
-    """Get OpenAI function calling schema for all tools."""
-    return [tool.get_schema() for tool in get_all_tools()]
+def get_tools_schema(names=None):
+    """Get OpenAI function calling schema for all tools, or only the named ones."""
+    return [
+        tool.get_schema()
+        for tool in get_all_tools()
+        if names is None or tool.name in names
+    ]
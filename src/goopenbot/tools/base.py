@@ -9,12 +9,23 @@ class Tool(ABC):
 
     name: str = ""
     description: str = ""
+    # Results depend only on the arguments and the workspace, so repeated
+    # calls can be answered from the memo (see core/memo.py)
+    pure: bool = False
+
+    def __init__(self, session: Optional[Any] = None):
+        # The Session the tool runs for, if any (used for per-session state)
+        self.session = session
 
     @abstractmethod
     def execute(self, **kwargs) -> dict[str, Any]:
         """Execute the tool with given arguments."""
         pass
 
+    def memoizable(self, **kwargs) -> bool:
+        """Whether the result of a call with these arguments may be reused."""
+        return self.pure
+
     @classmethod
     def get_schema(cls) -> dict[str, Any]:
         """Get the OpenAI function calling schema for this tool."""
@@ -1,14 +1,61 @@
 """Bash tool - execute shell commands."""
 
-import asyncio
 import os
 import shlex
+import signal
 import subprocess
+import threading
 from typing import Any
 
+from ..core.config import BashConfig, load_config
+from ..core.workspace import bump_generation
 from .base import Tool
 
 
+def limited_command(command: str, limits: BashConfig) -> str:
+    """Prefix command with ulimit and nice calls for the configured limits.
+
+    The limits are applied by the shell rather than in a preexec_fn, which
+    is not safe to run in a process that has threads.
+    """
+    if os.name != "posix":
+        return command
+    ulimits = []
+    if limits.cpu_seconds:
+        ulimits.append(f"ulimit -t {limits.cpu_seconds}")
+    if limits.memory_mb:
+        ulimits.append(f"ulimit -v {limits.memory_mb * 1024}")
+    if limits.max_open_files:
+        ulimits.append(f"ulimit -n {limits.max_open_files}")
+    if limits.nice:
+        command = f"exec nice -n {limits.nice} /bin/sh -c {shlex.quote(command)}"
+    if not ulimits:
+        return command
+    # On a line of its own so the command is parsed exactly as given
+    return " && ".join(ulimits) + " || exit 126\n" + command
+
+
+def popen_limited(command: str, limits: BashConfig, **kwargs) -> subprocess.Popen:
+    """Start command in its own process group with the configured limits."""
+    return subprocess.Popen(
+        limited_command(command, limits),
+        shell=True,
+        start_new_session=os.name == "posix",
+        **kwargs,
+    )
+
+
+def kill_process_tree(process: subprocess.Popen) -> None:
+    """Kill the shell and everything it started."""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
 class BashTool(Tool):
     """Execute shell commands."""
 
@@ -28,42 +75,110 @@ class BashTool(Tool):
                     "type": "string",
                     "description": "Description of what this command does",
                 },
+                "background": {
+                    "type": "boolean",
+                    "description": "Run in the background and return a job id at once; "
+                    "use job_status, job_output and job_kill to follow it",
+                },
             },
             "required": ["command"],
         }
 
-    def execute(self, command: str, description: str = "", **kwargs) -> dict[str, Any]:
+    def execute(
+        self,
+        command: str,
+        description: str = "",
+        background: bool = False,
+        **kwargs,
+    ) -> dict[str, Any]:
         """Execute a shell command."""
+        title = description or f"bash: {command[:50]}..."
+        limits = load_config().tools.bash
         try:
-            process = subprocess.run(
+            if background:
+                from .jobs import start_job
+
+                job = start_job(command, limits)
+                return {
+                    "title": f"{title} (job {job.id})",
+                    "output": f"Started background job {job.id}",
+                    "success": True,
+                }
+
+            process = popen_limited(
                 command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=60,
+                limits,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
             )
 
-            output = process.stdout
-            if process.stderr:
-                output += f"\n[stderr] {process.stderr}"
+            # Drain both pipes, killing the process tree once the quota is used up
+            captured = {"stdout": bytearray(), "stderr": bytearray()}
+            state = {"total": 0, "over_quota": False}
+            lock = threading.Lock()
+
+            def drain(stream, key):
+                for chunk in iter(lambda: stream.read1(65536), b""):
+                    with lock:
+                        room = limits.max_output_bytes - state["total"]
+                        captured[key] += chunk[: max(room, 0)]
+                        state["total"] += len(chunk)
+                        if state["total"] > limits.max_output_bytes and not state["over_quota"]:
+                            state["over_quota"] = True
+                            kill_process_tree(process)
+
+            readers = [
+                threading.Thread(target=drain, args=(process.stdout, "stdout"), daemon=True),
+                threading.Thread(target=drain, args=(process.stderr, "stderr"), daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+
+            timed_out = False
+            try:
+                process.wait(timeout=limits.timeout)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                kill_process_tree(process)
+                process.wait()
+            for reader in readers:
+                reader.join(timeout=5)
+            # The command may have changed any file
+            bump_generation()
+
+            stdout = captured["stdout"].decode("utf-8", errors="replace")
+            stderr = captured["stderr"].decode("utf-8", errors="replace")
+
+            if timed_out:
+                return {
+                    "title": title,
+                    "output": f"Error: Command timed out after {limits.timeout} seconds\n{stdout}",
+                    "success": False,
+                }
+
+            output = stdout
+            if stderr:
+                output += f"\n[stderr] {stderr}"
+
+            if state["over_quota"]:
+                output += (
+                    f"\n[killed: output exceeded {limits.max_output_bytes} bytes; "
+                    "redirect to a file and read parts of it instead]"
+                )
+                return {"title": title, "output": output, "success": False}
 
             if process.returncode != 0:
                 output = f"[exit code: {process.returncode}]\n{output}"
 
             return {
-                "title": description or f"bash: {command[:50]}...",
+                "title": title,
                 "output": output,
                 "success": process.returncode == 0,
             }
-        except subprocess.TimeoutExpired:
-            return {
-                "title": description or f"bash: {command[:50]}...",
-                "output": "Error: Command timed out after 60 seconds",
-                "success": False,
-            }
         except Exception as e:
             return {
-                "title": description or f"bash: {command[:50]}...",
+                "title": title,
                 "output": f"Error: {str(e)}",
                 "success": False,
             }
@@ -0,0 +1,41 @@
+"""Compact diffs for reporting file changes back to the model."""
+
+import difflib
+
+DIFF_CONTEXT = 2
+MAX_DIFF_BYTES = 4000
+
+
+def compact_diff(old: str, new: str, name: str, max_bytes: int = MAX_DIFF_BYTES) -> str:
+    """Unified diff of old -> new, headed by a line-count summary.
+
+    The diff body is cut at max_bytes (on a line boundary) so a large
+    change cannot flood the conversation.
+    """
+    diff = list(
+        difflib.unified_diff(
+            old.splitlines(),
+            new.splitlines(),
+            fromfile=f"a/{name}",
+            tofile=f"b/{name}",
+            n=DIFF_CONTEXT,
+            lineterm="",
+        )
+    )
+    if not diff:
+        return "No changes"
+
+    # Skip the ---/+++ file headers, not body lines such as "-- note" or "++i;"
+    added = sum(1 for line in diff[2:] if line.startswith("+"))
+    removed = sum(1 for line in diff[2:] if line.startswith("-"))
+
+    summary = f"+{added} -{removed} lines"
+    body: list[str] = []
+    used = 0
+    for line in diff[2:]:
+        used += len(line) + 1
+        if used > max_bytes:
+            body.append(f"[... diff truncated at {max_bytes} bytes]")
+            break
+        body.append(line)
+    return f"{summary}\n" + "\n".join(body)
@@ -4,7 +4,11 @@ import re
 from pathlib import Path
 from typing import Any
 
+from ..core.checkpoint import checkpoint_file
+from ..core.workspace import atomic_write_text, notify_file_changed
 from .base import Tool
+from .diff import compact_diff
+from .match import EditMatchError, apply_edit
 
 
 class EditTool(Tool):
@@ -24,7 +28,7 @@ class EditTool(Tool):
                 },
                 "old_string": {
                     "type": "string",
-                    "description": "The exact text to find and replace",
+                    "description": "The text to find and replace; must identify exactly one place in the file",
                 },
                 "new_string": {
                     "type": "string",
@@ -48,19 +52,27 @@ class EditTool(Tool):
         try:
             content = path.read_text(encoding="utf-8")
 
-            if old_string not in content:
+            try:
+                new_content, tier = apply_edit(content, old_string, new_string)
+            except EditMatchError as e:
                 return {
                     "title": f"Edit {file_path}",
-                    "output": f"Error: String not found in file.\n\nExpected:\n{old_string}",
+                    "output": f"Error: {e}\n\nExpected:\n{old_string}",
                     "success": False,
                 }
-
-            new_content = content.replace(old_string, new_string, 1)
-            path.write_text(new_content, encoding="utf-8")
+            checkpoint_file(self.session, path)
+            atomic_write_text(path, new_content)
+            notify_file_changed(path)
+            if self.session:
+                self.session.record_change(str(path))
 
             return {
                 "title": f"Edit {file_path}",
-                "output": f"Successfully replaced:\n\n---\n{old_string}\n---\n\nwith:\n\n---\n{new_string}\n---",
+                "output": (
+                    f"Successfully edited {file_path}"
+                    + (f" (matched with {tier})" if tier != "exact" else "")
+                    + f": {compact_diff(content, new_content, path.name)}"
+                ),
                 "success": True,
             }
         except UnicodeDecodeError:
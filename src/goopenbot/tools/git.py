@@ -0,0 +1,314 @@
+"""Git tool - structured, compact git queries."""
+
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from ..core.workspace import get_generation
+from .base import Tool
+
+DEFAULT_MAX_BYTES = 8000
+DEFAULT_LOG_LIMIT = 20
+MAX_STATUS_ENTRIES = 200
+MAX_CACHE_ENTRIES = 64
+
+_cache: "OrderedDict[tuple, tuple[tuple, dict[str, Any]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def find_git_dir(start: Path) -> Optional[tuple[Path, Path]]:
+    """Locate (work tree root, git dir) at or above start."""
+    for directory in [start, *start.parents]:
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return directory, dot_git
+        if dot_git.is_file():
+            # Worktrees and submodules: ".git" holds "gitdir: <path>"
+            text = dot_git.read_text(encoding="utf-8").strip()
+            if text.startswith("gitdir:"):
+                git_dir = Path(text[len("gitdir:"):].strip())
+                return directory, (directory / git_dir).resolve()
+    return None
+
+
+def _repo_state(git_dir: Path) -> Optional[tuple]:
+    """HEAD target and index mtime, read from disk without spawning git.
+
+    Returns None when the state cannot be determined cheaply, in which
+    case results are not cached.
+    """
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        ref_state: Any = head
+        if head.startswith("ref:"):
+            ref = head[4:].strip()
+            common = git_dir
+            commondir = git_dir / "commondir"
+            if commondir.exists():
+                common = (git_dir / commondir.read_text(encoding="utf-8").strip()).resolve()
+            ref_file = common / ref
+            if ref_file.exists():
+                ref_state = (head, ref_file.read_text(encoding="utf-8").strip())
+            else:
+                packed = common / "packed-refs"
+                ref_state = (head, packed.stat().st_mtime_ns if packed.exists() else None)
+        index = git_dir / "index"
+        index_mtime = index.stat().st_mtime_ns if index.exists() else None
+        return ref_state, index_mtime
+    except OSError:
+        return None
+
+
+def _run_git(cwd: Path, args: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        capture_output=True,
+        timeout=60,
+        env={**os.environ, "GIT_PAGER": "cat", "LC_ALL": "C"},
+    )
+
+
+def _truncate(text: str, max_bytes: int) -> str:
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    cut = data[:max_bytes].decode("utf-8", errors="ignore")
+    cut = cut[: cut.rfind("\n") + 1] or cut
+    return cut + f"[... truncated at {max_bytes} bytes of {len(data)}]"
+
+
+def _format_status(raw: bytes) -> str:
+    """Compact view of `git status --porcelain=v1 -z -b`."""
+    fields = raw.decode("utf-8", errors="replace").split("\0")
+    lines = []
+    entries = 0
+    i = 0
+    while i < len(fields):
+        field = fields[i]
+        i += 1
+        if not field:
+            continue
+        if field.startswith("## "):
+            lines.append(f"branch: {field[3:]}")
+            continue
+        code, path = field[:2], field[3:]
+        if code[0] in "RC":
+            # Renames/copies are followed by the original path
+            path = f"{fields[i]} -> {path}"
+            i += 1
+        entries += 1
+        if entries <= MAX_STATUS_ENTRIES:
+            lines.append(f"{code} {path}")
+    if entries > MAX_STATUS_ENTRIES:
+        lines.append(f"... and {entries - MAX_STATUS_ENTRIES} more entries")
+    if entries == 0:
+        lines.append("clean")
+    return "\n".join(lines)
+
+
+def _format_blame(raw: bytes) -> str:
+    """Compact view of `git blame --line-porcelain`: line sha author | code."""
+    lines = []
+    info: dict[str, str] = {}
+    for line in raw.decode("utf-8", errors="replace").split("\n"):
+        if line.startswith("\t"):
+            lines.append(
+                f"{info.get('line', '?'):>5} {info.get('sha', '')[:8]} "
+                f"{info.get('author', '')[:16]:<16} | {line[1:]}"
+            )
+            info = {}
+        elif not info and line:
+            parts = line.split()
+            info = {"sha": parts[0], "line": parts[2] if len(parts) > 2 else "?"}
+        elif line.startswith("author "):
+            info["author"] = line[len("author "):]
+    return "\n".join(lines)
+
+
+class GitTool(Tool):
+    """Query git status, diffs, history and blame in compact formats."""
+
+    name = "git"
+    description = (
+        "Query the git repository: status, diff (optionally staged, per path, or as a stat), "
+        "log and blame. Cheaper and more compact than running git through bash."
+    )
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["status", "diff", "log", "blame"],
+                    "description": "What to query",
+                },
+                "paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Limit diff/log to these paths; blame takes exactly one",
+                },
+                "ref": {
+                    "type": "string",
+                    "description": "diff: compare against this commit/range; log/blame: start from this revision",
+                },
+                "staged": {
+                    "type": "boolean",
+                    "description": "diff: show staged changes instead of unstaged ones",
+                },
+                "stat": {
+                    "type": "boolean",
+                    "description": "diff: only show per-file changed line counts",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": f"log: number of commits (default: {DEFAULT_LOG_LIMIT})",
+                },
+                "start_line": {
+                    "type": "integer",
+                    "description": "blame: first line",
+                },
+                "end_line": {
+                    "type": "integer",
+                    "description": "blame: last line",
+                },
+                "max_bytes": {
+                    "type": "integer",
+                    "description": f"Maximum output size (default: {DEFAULT_MAX_BYTES})",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Directory to run in (defaults to current directory)",
+                },
+            },
+            "required": ["action"],
+        }
+
+    def execute(
+        self,
+        action: str,
+        paths: Optional[list[str]] = None,
+        ref: Optional[str] = None,
+        staged: bool = False,
+        stat: bool = False,
+        limit: int = DEFAULT_LOG_LIMIT,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        path: str = ".",
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Run a git query."""
+        title = f"git {action}"
+        paths = list(paths or [])
+        try:
+            cwd = Path(path).resolve()
+            found = find_git_dir(cwd)
+            if not found:
+                return {
+                    "title": title,
+                    "output": "Error: Not inside a git repository",
+                    "success": False,
+                }
+            _, git_dir = found
+
+            args = self._build_args(action, paths, ref, staged, stat, limit, start_line, end_line)
+            if isinstance(args, str):
+                return {"title": title, "output": f"Error: {args}", "success": False}
+
+            # Results are reused until HEAD or the index changes, or the
+            # workspace generation moves (tool writes, bash runs, user turns)
+            state = _repo_state(git_dir)
+            key = (str(cwd), tuple(args), max_bytes)
+            if state is not None:
+                state = (state, get_generation())
+                with _cache_lock:
+                    cached = _cache.get(key)
+                    if cached and cached[0] == state:
+                        _cache.move_to_end(key)
+                        return cached[1]
+
+            process = _run_git(cwd, args)
+            if process.returncode != 0:
+                return {
+                    "title": title,
+                    "output": f"Error: {process.stderr.decode('utf-8', errors='replace').strip()}",
+                    "success": False,
+                }
+
+            if action == "status":
+                output = _format_status(process.stdout)
+            elif action == "blame":
+                output = _format_blame(process.stdout)
+            else:
+                output = process.stdout.decode("utf-8", errors="replace").rstrip("\n")
+                if not output:
+                    output = "No changes" if action == "diff" else "No commits"
+
+            result = {
+                "title": title + (f" {' '.join(paths)}" if paths else ""),
+                "output": _truncate(output, max_bytes),
+                "success": True,
+            }
+            if state is not None:
+                with _cache_lock:
+                    _cache[key] = (state, result)
+                    if len(_cache) > MAX_CACHE_ENTRIES:
+                        _cache.popitem(last=False)
+            return result
+        except FileNotFoundError:
+            return {
+                "title": title,
+                "output": "Error: git is not installed",
+                "success": False,
+            }
+        except Exception as e:
+            return {
+                "title": title,
+                "output": f"Error: {str(e)}",
+                "success": False,
+            }
+
+    @staticmethod
+    def _build_args(action, paths, ref, staged, stat, limit, start_line, end_line):
+        """git arguments for an action, or an error message."""
+        if ref and ref.startswith("-"):
+            # Would be parsed as an option (e.g. --output=<file>)
+            return f"Invalid ref: {ref}"
+        if action == "status":
+            return ["status", "--porcelain=v1", "-z", "-b", "--", *paths]
+        if action == "diff":
+            args = ["diff", "--no-color", "--no-ext-diff", "--unified=2"]
+            if staged:
+                args.append("--cached")
+            if stat:
+                args.append("--stat=100")
+            if ref:
+                args.append(ref)
+            return [*args, "--", *paths]
+        if action == "log":
+            args = [
+                "log",
+                f"-n{max(1, limit or DEFAULT_LOG_LIMIT)}",
+                "--no-color",
+                "--date=short",
+                "--format=%h %ad %an: %s",
+            ]
+            if ref:
+                args.append(ref)
+            return [*args, "--", *paths]
+        if action == "blame":
+            if len(paths) != 1:
+                return "blame needs exactly one path"
+            args = ["blame", "--line-porcelain"]
+            if start_line or end_line:
+                args.append(f"-L{start_line or 1},{end_line or ''}")
+            if ref:
+                args.append(ref)
+            return [*args, "--", paths[0]]
+        return f"Unknown action: {action} (use status, diff, log or blame)"
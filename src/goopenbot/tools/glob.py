@@ -1,17 +1,21 @@
 """Glob tool - find files by pattern."""
 
-import os
+import heapq
 from pathlib import Path
 from typing import Any
 
+from ..core.workspace import glob_paths
 from .base import Tool
 
+DEFAULT_LIMIT = 200
+
 
 class GlobTool(Tool):
     """Find files matching a glob pattern."""
 
     name = "glob"
     description = "Find files matching a glob pattern. Useful for finding all files of a certain type or pattern."
+    pure = True
 
     @classmethod
     def parameters_schema(cls) -> dict[str, Any]:
@@ -26,15 +30,38 @@ class GlobTool(Tool):
                     "type": "string",
                     "description": "The directory to search in (defaults to current directory)",
                 },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Maximum number of results to return (default: {DEFAULT_LIMIT})",
+                },
+                "sort_by": {
+                    "type": "string",
+                    "enum": ["path", "mtime"],
+                    "description": "Sort by path (default) or by modification time, newest first",
+                },
             },
             "required": ["pattern"],
         }
 
-    def execute(self, pattern: str, path: str = ".", **kwargs) -> dict[str, Any]:
+    def execute(
+        self,
+        pattern: str,
+        path: str = ".",
+        limit: int = DEFAULT_LIMIT,
+        sort_by: str = "path",
+        **kwargs,
+    ) -> dict[str, Any]:
         """Find files matching a glob pattern."""
         try:
             search_path = Path(path).resolve()
-            files = list(search_path.glob(pattern))
+            if not search_path.is_dir():
+                return {
+                    "title": f"glob: {pattern}",
+                    "output": f"Error: Directory not found: {path}",
+                    "success": False,
+                }
+
+            files = glob_paths(search_path, pattern, restat=sort_by == "mtime")
 
             if not files:
                 return {
@@ -43,9 +70,15 @@ class GlobTool(Tool):
                     "success": True,
                 }
 
-            # Sort and format output
-            relative_files = sorted([str(f.relative_to(search_path)) for f in files])
-            output = "\n".join(relative_files)
+            # Only sort as much as we return
+            limit = max(1, limit or DEFAULT_LIMIT)
+            if sort_by == "mtime":
+                selected = heapq.nlargest(limit, files, key=lambda f: f[3])
+            else:
+                selected = heapq.nsmallest(limit, files, key=lambda f: f[0])
+            output = "\n".join(f[0] for f in selected)
+            if len(files) > limit:
+                output += f"\n... and {len(files) - limit} more files"
 
             return {
                 "title": f"glob: {pattern} ({len(files)} files)",
@@ -12,6 +12,7 @@ class GrepTool(Tool):
 
     name = "grep"
     description = "Search for text patterns in files. Useful for finding function definitions, imports, or any code pattern."
+    pure = True
 
     @classmethod
     def parameters_schema(cls) -> dict[str, Any]:
@@ -0,0 +1,279 @@
+"""Background job tools - long-running bash commands."""
+
+import atexit
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+from ..core.config import BashConfig, get_data_dir
+from ..core.workspace import bump_generation
+from .base import Tool
+from .bash import kill_process_tree, popen_limited
+
+DEFAULT_CHUNK_BYTES = 20_000
+
+
+class Job:
+    """A bash command running in the background with output spooled to disk."""
+
+    def __init__(self, command: str, limits: BashConfig):
+        self.id = uuid.uuid4().hex[:8]
+        self.command = command
+        self.limits = limits
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.stop_reason: Optional[str] = None
+
+        spool_dir = get_data_dir() / "jobs"
+        spool_dir.mkdir(parents=True, exist_ok=True)
+        self.log_path: Path = spool_dir / f"{self.id}.log"
+        with open(self.log_path, "wb") as log:
+            self.process = popen_limited(
+                command,
+                limits,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+        bump_generation()
+        threading.Thread(target=self._watch, daemon=True).start()
+
+    def _watch(self) -> None:
+        """Enforce the background timeout and spool size limit."""
+        while True:
+            try:
+                self.process.wait(timeout=1)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if time.time() - self.started_at > self.limits.background_timeout:
+                self.kill(f"timed out after {self.limits.background_timeout} seconds")
+            elif self.output_size() > self.limits.max_spool_bytes:
+                self.kill(f"output exceeded {self.limits.max_spool_bytes} bytes")
+        self.finished_at = time.time()
+        bump_generation()
+
+    def kill(self, reason: str = "killed") -> None:
+        if self.process.poll() is None:
+            self.stop_reason = reason
+            kill_process_tree(self.process)
+
+    def reap(self) -> None:
+        """Stop the job, forget it and delete its spool file."""
+        self.kill()
+        # Also stops anything the shell left running in its process group
+        kill_process_tree(self.process)
+        self.process.wait()
+        _jobs.pop(self.id, None)
+        self.log_path.unlink(missing_ok=True)
+
+    def output_size(self) -> int:
+        try:
+            return self.log_path.stat().st_size
+        except OSError:
+            return 0
+
+    @property
+    def running(self) -> bool:
+        return self.process.poll() is None
+
+    def status(self) -> str:
+        if self.running:
+            return "running"
+        if self.stop_reason:
+            return f"stopped ({self.stop_reason})"
+        return f"exited with code {self.process.returncode}"
+
+    def describe(self) -> str:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return (
+            f"{self.id}: {self.status()}, {elapsed:.0f}s, "
+            f"{self.output_size()} bytes output - {self.command[:80]}"
+        )
+
+
+_jobs: dict[str, Job] = {}
+
+
+def start_job(command: str, limits: BashConfig) -> Job:
+    """Start a background job and register it."""
+    job = Job(command, limits)
+    _jobs[job.id] = job
+    return job
+
+
+def get_job(job_id: str) -> Optional[Job]:
+    return _jobs.get(job_id)
+
+
+@atexit.register
+def reap_all_jobs() -> None:
+    """Kill every job's process group and delete the spool files.
+
+    Jobs run in their own session, so they would otherwise outlive the CLI
+    and its watchdog limits.
+    """
+    for job in list(_jobs.values()):
+        job.reap()
+
+
+def _unknown_job(title: str, job_id: str) -> dict[str, Any]:
+    return {
+        "title": title,
+        "output": f"Error: Unknown job: {job_id}",
+        "success": False,
+    }
+
+
+class JobStatusTool(Tool):
+    """Report the status of background jobs."""
+
+    name = "job_status"
+    description = "Show the status of a background bash job, or of all jobs if no id is given."
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "The job id returned by bash with background=true",
+                },
+            },
+            "required": [],
+        }
+
+    def execute(self, job_id: Optional[str] = None, **kwargs) -> dict[str, Any]:
+        """Describe one or all jobs."""
+        if job_id:
+            job = get_job(job_id)
+            if not job:
+                return _unknown_job(f"job_status: {job_id}", job_id)
+            return {
+                "title": f"job_status: {job_id}",
+                "output": job.describe(),
+                "success": True,
+            }
+
+        return {
+            "title": f"job_status ({len(_jobs)} jobs)",
+            "output": "\n".join(job.describe() for job in _jobs.values()) or "No jobs",
+            "success": True,
+        }
+
+
+class JobOutputTool(Tool):
+    """Read a background job's output incrementally."""
+
+    name = "job_output"
+    description = (
+        "Read output of a background bash job from a byte offset. "
+        "Pass the returned next offset to read only new output. "
+        "Once a finished job's output has been read to the end, the job is removed."
+    )
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "The job id returned by bash with background=true",
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Byte offset to start reading from (default: 0)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Maximum bytes to return (default: {DEFAULT_CHUNK_BYTES})",
+                },
+            },
+            "required": ["job_id"],
+        }
+
+    def execute(
+        self,
+        job_id: str,
+        offset: int = 0,
+        limit: int = DEFAULT_CHUNK_BYTES,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Read a chunk of job output."""
+        title = f"job_output: {job_id}"
+        job = get_job(job_id)
+        if not job:
+            return _unknown_job(title, job_id)
+
+        try:
+            # Check the status first so no output is missed once it says finished
+            running = job.running
+            status = job.status()
+            with open(job.log_path, "rb") as log:
+                log.seek(max(0, offset))
+                data = log.read(max(1, limit or DEFAULT_CHUNK_BYTES))
+            next_offset = max(0, offset) + len(data)
+            remaining = job.output_size() - next_offset
+            if not running and remaining <= 0:
+                job.reap()
+
+            output = data.decode("utf-8", errors="replace")
+            footer = f"[{status}; next offset: {next_offset}"
+            if remaining > 0:
+                footer += f", {remaining} more bytes available"
+            output += ("\n" if output and not output.endswith("\n") else "") + footer + "]"
+
+            return {
+                "title": f"{title} ({len(data)} bytes)",
+                "output": output,
+                "success": True,
+            }
+        except Exception as e:
+            return {
+                "title": title,
+                "output": f"Error: {str(e)}",
+                "success": False,
+            }
+
+
+class JobKillTool(Tool):
+    """Stop a background job."""
+
+    name = "job_kill"
+    description = (
+        "Kill a background bash job and everything it started, "
+        "and discard its output."
+    )
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "The job id returned by bash with background=true",
+                },
+            },
+            "required": ["job_id"],
+        }
+
+    def execute(self, job_id: str, **kwargs) -> dict[str, Any]:
+        """Kill a job."""
+        title = f"job_kill: {job_id}"
+        job = get_job(job_id)
+        if not job:
+            return _unknown_job(title, job_id)
+
+        was_running = job.running
+        job.reap()
+        return {
+            "title": title,
+            "output": f"Killed job {job_id}" if was_running else f"Job {job_id} already {job.status()}",
+            "success": True,
+        }
@@ -0,0 +1,204 @@
+"""Tolerant text matching for the edit tools.
+
+Models often get indentation or trailing whitespace slightly wrong in
+old_string. Rather than failing outright, matching is tried in tiers:
+
+1. exact substring
+2. whole lines with whitespace normalised (trailing spaces, runs of
+   inner spaces/tabs)
+3. whole lines compared after removing common indentation; new_string
+   is re-indented to the indentation found in the file
+4. fuzzy line windows above FUZZY_THRESHOLD similarity, only for
+   old_strings long enough that a near miss is unlikely to be a
+   different line (e.g. one changed argument), and within a time budget
+
+Every tier requires exactly one match; ambiguity is an error rather than
+a guess.
+"""
+
+import difflib
+import re
+import textwrap
+import time
+
+FUZZY_THRESHOLD = 0.9
+# Fuzzy matches are only applied for old_strings of at least this many
+# lines or characters; shorter ones are too easily a different line
+FUZZY_MIN_LINES = 3
+FUZZY_MIN_CHARS = 120
+# Weaker candidates are not shown as the closest match
+HINT_THRESHOLD = 0.5
+# Scoring windows stops after this many seconds, or up front when
+# file characters x old_string characters is too large
+FUZZY_TIME_LIMIT = 1.0
+MAX_FUZZY_WORK = 5_000_000_000
+
+_INNER_SPACE = re.compile(r"[ \t]+")
+
+
+class EditMatchError(ValueError):
+    """old_string could not be located exactly once."""
+
+
+def _normalise(line: str) -> str:
+    stripped = line.lstrip(" \t")
+    indent = line[: len(line) - len(stripped)]
+    return indent + _INNER_SPACE.sub(" ", stripped.rstrip())
+
+
+def _dedent(lines: list[str]) -> list[str]:
+    return textwrap.dedent("\n".join(_normalise(line) for line in lines)).split("\n")
+
+
+def _indent_of(lines: list[str]) -> str:
+    for line in lines:
+        if line.strip():
+            return line[: len(line) - len(line.lstrip(" \t"))]
+    return ""
+
+
+def _old_lines(old_string: str) -> list[str]:
+    lines = old_string.split("\n")
+    if len(lines) > 1 and lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _unique(positions: list[int], tier: str) -> int:
+    if len(positions) > 1:
+        raise EditMatchError(
+            f"old_string matches {len(positions)} places ({tier}); "
+            "include more surrounding lines to make it unique"
+        )
+    return positions[0]
+
+
+def _replace_lines(
+    content_lines: list[str], start: int, count: int, new_string: str, old_string: str
+) -> str:
+    replacement = new_string
+    if old_string.endswith("\n") and replacement.endswith("\n"):
+        replacement = replacement[:-1]
+    return "\n".join(content_lines[:start] + [replacement] + content_lines[start + count :])
+
+
+def _reindent(new_string: str, old_indent: str, file_indent: str) -> str:
+    lines = []
+    for line in new_string.split("\n"):
+        if line.strip():
+            if line.startswith(old_indent):
+                line = file_indent + line[len(old_indent) :]
+            else:
+                line = file_indent + line.lstrip(" \t")
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _window_ratios(
+    stripped: list[str], old_stripped: list[str], threshold: float
+) -> tuple[list[tuple[float, int]], bool]:
+    """Similarity of old_stripped to each same-sized window of the file.
+
+    Multi-line windows must share at least half their lines with
+    old_stripped, and windows whose cheap upper bounds fall below threshold
+    are skipped. Returns the ratios and whether every window was scored in
+    time.
+    """
+    n = len(old_stripped)
+    required = (n + 1) // 2 if n > 1 else 0
+    matcher = difflib.SequenceMatcher(autojunk=False)
+    matcher.set_seq2("\n".join(old_stripped))
+    deadline = time.monotonic() + FUZZY_TIME_LIMIT
+    ratios = []
+    for i in range(len(stripped) - n + 1):
+        if time.monotonic() > deadline:
+            return ratios, False
+        window = stripped[i : i + n]
+        if required and sum(a == b for a, b in zip(window, old_stripped)) < required:
+            continue
+        matcher.set_seq1("\n".join(window))
+        if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= threshold:
+            ratios.append((ratio, i))
+    return ratios, True
+
+
+def apply_edit(content: str, old_string: str, new_string: str) -> tuple[str, str]:
+    """Replace the single occurrence of old_string in content.
+
+    Returns (new content, name of the tier that matched). Raises
+    EditMatchError describing the closest candidate when nothing matches.
+    """
+    if not old_string:
+        raise EditMatchError("old_string must not be empty")
+
+    # Tier 1: exact
+    count = content.count(old_string)
+    if count == 1:
+        return content.replace(old_string, new_string, 1), "exact"
+    if count > 1:
+        _unique(list(range(count)), "exact")
+
+    content_lines = content.split("\n")
+    old_lines = _old_lines(old_string)
+    n = len(old_lines)
+    windows = range(len(content_lines) - n + 1)
+
+    # Tier 2: normalised whitespace
+    normalised = [_normalise(line) for line in content_lines]
+    target = [_normalise(line) for line in old_lines]
+    positions = [i for i in windows if normalised[i : i + n] == target]
+    if positions:
+        start = _unique(positions, "ignoring whitespace")
+        return (
+            _replace_lines(content_lines, start, n, new_string, old_string),
+            "normalised whitespace",
+        )
+
+    # Tier 3: indentation-relative (stripped lines equal is a cheap prefilter)
+    stripped = [line.lstrip(" \t") for line in normalised]
+    old_stripped = [line.lstrip(" \t") for line in target]
+    target = _dedent(old_lines)
+    positions = [
+        i
+        for i in windows
+        if stripped[i : i + n] == old_stripped and _dedent(content_lines[i : i + n]) == target
+    ]
+    if positions:
+        start = _unique(positions, "ignoring indentation")
+        file_indent = _indent_of(content_lines[start : start + n])
+        reindented = _reindent(new_string, _indent_of(old_lines), file_indent)
+        return (
+            _replace_lines(content_lines, start, n, reindented, old_string),
+            "relative indentation",
+        )
+
+    # Tier 4: bounded fuzzy match
+    if len(content) * len(old_string) > MAX_FUZZY_WORK:
+        raise EditMatchError("String not found in file (file too large for fuzzy matching)")
+
+    fuzzy = n >= FUZZY_MIN_LINES or len(old_string.strip()) >= FUZZY_MIN_CHARS
+    ratios, complete = _window_ratios(stripped, old_stripped, HINT_THRESHOLD)
+    ratios.sort(reverse=True)
+    close = [i for ratio, i in ratios if ratio >= FUZZY_THRESHOLD]
+    if fuzzy and close and complete:
+        start = _unique(close, f"fuzzy, {FUZZY_THRESHOLD:.0%} similar")
+        file_indent = _indent_of(content_lines[start : start + n])
+        reindented = _reindent(new_string, _indent_of(old_lines), file_indent)
+        return (
+            _replace_lines(content_lines, start, n, reindented, old_string),
+            f"fuzzy ({ratios[0][0]:.0%} similar)",
+        )
+
+    message = "String not found in file."
+    if not complete:
+        message += " (fuzzy matching stopped early)"
+    if ratios:
+        ratio, start = ratios[0]
+        candidate = "\n".join(content_lines[start : start + n])
+        message += (
+            f"\n\nClosest match (lines {start + 1}-{start + n}, {ratio:.0%} similar):\n{candidate}"
+        )
+    raise EditMatchError(message)
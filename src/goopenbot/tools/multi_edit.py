@@ -0,0 +1,154 @@
+"""Multi edit tool - apply many replacements atomically."""
+
+import os
+from pathlib import Path
+from typing import Any
+
+from ..core.checkpoint import checkpoint_file
+from ..core.workspace import notify_file_changed, write_temp_file
+from .base import Tool
+from .diff import compact_diff
+from .match import EditMatchError, apply_edit
+
+
+class MultiEditTool(Tool):
+    """Apply an ordered list of replacements to one or more files."""
+
+    name = "multi_edit"
+    description = (
+        "Apply several text replacements to one or more files in one call. "
+        "All edits are checked first; either every edit is applied or none is."
+    )
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "edits": {
+                    "type": "array",
+                    "description": "Edits to apply in order; later edits see the result of earlier ones",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "file_path": {
+                                "type": "string",
+                                "description": "The path to the file to edit",
+                            },
+                            "old_string": {
+                                "type": "string",
+                                "description": "The exact text to find and replace",
+                            },
+                            "new_string": {
+                                "type": "string",
+                                "description": "The replacement text",
+                            },
+                            "replace_all": {
+                                "type": "boolean",
+                                "description": "Replace every occurrence instead of the first (default: false)",
+                            },
+                        },
+                        "required": ["file_path", "old_string", "new_string"],
+                    },
+                },
+            },
+            "required": ["edits"],
+        }
+
+    def execute(self, edits: list[dict[str, Any]], **kwargs) -> dict[str, Any]:
+        """Validate every edit in memory, then commit all files together."""
+        title = f"Multi edit ({len(edits or [])} edits)"
+        if not edits:
+            return {
+                "title": title,
+                "output": "Error: No edits given",
+                "success": False,
+            }
+
+        try:
+            # Pass 1: apply everything in memory, failing before any write
+            originals: dict[Path, str] = {}
+            contents: dict[Path, str] = {}
+            for i, edit in enumerate(edits, 1):
+                file_path = edit.get("file_path", "")
+                old_string = edit.get("old_string", "")
+                new_string = edit.get("new_string", "")
+                path = Path(file_path).resolve()
+
+                if path not in contents:
+                    if not path.is_file():
+                        return self._error(title, i, f"File not found: {file_path}")
+                    try:
+                        originals[path] = path.read_text(encoding="utf-8")
+                    except UnicodeDecodeError:
+                        return self._error(title, i, f"Cannot edit binary file: {file_path}")
+                    contents[path] = originals[path]
+
+                if edit.get("replace_all"):
+                    if not old_string or old_string not in contents[path]:
+                        return self._error(
+                            title, i, f"String not found in {file_path}.\n\nExpected:\n{old_string}"
+                        )
+                    contents[path] = contents[path].replace(old_string, new_string)
+                    continue
+                try:
+                    contents[path], _ = apply_edit(contents[path], old_string, new_string)
+                except EditMatchError as e:
+                    return self._error(title, i, f"{file_path}: {e}\n\nExpected:\n{old_string}")
+
+            changed = [p for p in contents if contents[p] != originals[p]]
+
+            for path in changed:
+                checkpoint_file(self.session, path)
+
+            # Pass 2: stage temp files, then rename them all into place
+            staged: dict[Path, Path] = {}
+            try:
+                for path in changed:
+                    staged[path] = write_temp_file(path, contents[path])
+            except Exception:
+                for tmp in staged.values():
+                    tmp.unlink(missing_ok=True)
+                raise
+
+            committed: list[Path] = []
+            try:
+                for path in changed:
+                    os.replace(staged[path], path)
+                    committed.append(path)
+            except Exception:
+                # Put back files that were already replaced
+                for path in committed:
+                    os.replace(write_temp_file(path, originals[path]), path)
+                for path in changed:
+                    if path not in committed:
+                        staged[path].unlink(missing_ok=True)
+                raise
+
+            for path in changed:
+                notify_file_changed(path)
+                if self.session:
+                    self.session.record_change(str(path))
+
+            return {
+                "title": f"Multi edit ({len(edits)} edits, {len(changed)} files)",
+                "output": f"Applied {len(edits)} edits to {len(changed)} files:\n\n"
+                + "\n\n".join(
+                    f"{p}: {compact_diff(originals[p], contents[p], p.name)}" for p in changed
+                ),
+                "success": True,
+            }
+        except Exception as e:
+            return {
+                "title": title,
+                "output": f"Error: {str(e)}\n\nNo files were changed.",
+                "success": False,
+            }
+
+    @staticmethod
+    def _error(title: str, index: int, message: str) -> dict[str, Any]:
+        return {
+            "title": title,
+            "output": f"Error in edit {index}: {message}\n\nNo files were changed.",
+            "success": False,
+        }
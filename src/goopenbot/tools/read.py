@@ -1,17 +1,217 @@
 """Read tool - read files."""
 
+import io
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
+from ..core.prefetch import get_prefetcher
+from ..core.workspace import is_ignored, load_ignore_patterns
 from .base import Tool
 
+# Defaults for how much a single read returns
+DEFAULT_LINE_LIMIT = 2000
+MAX_OUTPUT_BYTES = 256 * 1024
+MAX_LINE_BYTES = 2000
+
+# Files larger than this get a sparse line-offset index
+INDEX_THRESHOLD = 1024 * 1024
+INDEX_STRIDE = 1000
+MAX_INDEXES = 32
+
+# Directory tree listings
+DEFAULT_DIR_ENTRIES = 50
+MAX_TREE_ENTRIES = 1000
+
+
+class LineIndex:
+    """Sparse line number -> byte offset map for one version of a file.
+
+    Every INDEX_STRIDE-th line start is recorded as reads stream past it,
+    so later reads can seek close to any line already visited.
+    """
+
+    def __init__(self, size: int, mtime_ns: int):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.offsets = [0]
+        self.total_lines: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def seek_point(self, line: int) -> tuple[int, int]:
+        """Closest known (line number, byte offset) at or before line."""
+        i = min(line // INDEX_STRIDE, len(self.offsets) - 1)
+        return i * INDEX_STRIDE, self.offsets[i]
+
+    def record(self, line: int, offset: int) -> None:
+        if line % INDEX_STRIDE == 0 and line // INDEX_STRIDE == len(self.offsets):
+            with self._lock:
+                if line // INDEX_STRIDE == len(self.offsets):
+                    self.offsets.append(offset)
+
+
+_line_indexes: "OrderedDict[Path, LineIndex]" = OrderedDict()
+_line_indexes_lock = threading.Lock()
+
+
+def _get_line_index(path: Path, stats: os.stat_result) -> LineIndex:
+    with _line_indexes_lock:
+        index = _line_indexes.get(path)
+        if index is None or index.size != stats.st_size or index.mtime_ns != stats.st_mtime_ns:
+            index = LineIndex(stats.st_size, stats.st_mtime_ns)
+            _line_indexes[path] = index
+            if len(_line_indexes) > MAX_INDEXES:
+                _line_indexes.popitem(last=False)
+        else:
+            _line_indexes.move_to_end(path)
+        return index
+
+
+def _skip_rest_of_line(f) -> int:
+    """Consume the remainder of an overlong line, returning bytes skipped."""
+    skipped = 0
+    while True:
+        chunk = f.readline(64 * 1024)
+        skipped += len(chunk)
+        if not chunk or chunk.endswith(b"\n"):
+            return skipped
+
+
+def _trim_partial_char(raw: bytes) -> bytes:
+    """Drop a UTF-8 sequence left incomplete by cutting raw short."""
+    for back in range(1, min(4, len(raw)) + 1):
+        byte = raw[-back]
+        if byte & 0xC0 != 0x80:  # not a continuation byte
+            if byte >= 0xC0:
+                length = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+                if back < length:
+                    return raw[:-back]
+            break
+    return raw
+
+
+def read_lines(
+    path: Path,
+    offset: int = 0,
+    limit: int = DEFAULT_LINE_LIMIT,
+    max_bytes: int = MAX_OUTPUT_BYTES,
+    stats: Optional[os.stat_result] = None,
+) -> dict[str, Any]:
+    """Stream lines [offset, offset + limit) of a file without loading all of it.
+
+    Returns the decoded lines, whether more content follows, whether any
+    line was cut at MAX_LINE_BYTES, and the total line count when known.
+    Raises UnicodeDecodeError for binary content.
+    """
+    stats = stats or path.stat()
+    index = _get_line_index(path, stats) if stats.st_size > INDEX_THRESHOLD else None
+    line_no, pos = index.seek_point(offset) if index else (0, 0)
+
+    lines: list[str] = []
+    used = 0
+    more = False
+    cut_lines = False
+    # Served from memory when the prefetcher already read the file
+    data = get_prefetcher().get(path, stats)
+    with io.BytesIO(data) if data is not None else open(path, "rb") as f:
+        if b"\x00" in f.read(1024):
+            raise UnicodeDecodeError("utf-8", b"", 0, 1, "binary file")
+        f.seek(pos)
+        while True:
+            if index:
+                index.record(line_no, pos)
+            raw = f.readline(MAX_LINE_BYTES)
+            if not raw:
+                if index:
+                    index.total_lines = line_no
+                break
+            pos += len(raw)
+            overlong = not raw.endswith(b"\n")
+            if overlong:
+                skipped = _skip_rest_of_line(f)
+                pos += skipped
+                overlong = skipped > 0
+                if overlong:
+                    raw = _trim_partial_char(raw)
+
+            if line_no >= offset:
+                if len(lines) >= limit or used + len(raw) > max_bytes:
+                    more = True
+                    break
+                text = raw.decode("utf-8").replace("\r\n", "\n")
+                if overlong:
+                    cut_lines = True
+                    text = text.rstrip("\n") + " [... line truncated]\n"
+                lines.append(text)
+                used += len(raw)
+            line_no += 1
+
+    total = index.total_lines if index else (None if more else line_no)
+    return {"lines": lines, "more": more, "cut_lines": cut_lines, "total_lines": total}
+
+
+def format_size(size: int) -> str:
+    """Short human-readable file size."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def list_tree(root: Path, depth: int, max_entries: int = DEFAULT_DIR_ENTRIES) -> str:
+    """Indented listing of root down to depth levels, with file sizes.
+
+    Ignore rules (defaults plus root/.gitignore) are applied, each
+    directory shows at most max_entries entries, and the whole listing
+    stops after MAX_TREE_ENTRIES lines.
+    """
+    patterns = load_ignore_patterns(root)
+    out: list[str] = []
+
+    def walk(directory: Path, rel: str, level: int) -> None:
+        indent = "  " * level
+        try:
+            with os.scandir(directory) as it:
+                entries = []
+                for entry in it:
+                    entry_rel = f"{rel}/{entry.name}" if rel else entry.name
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if not is_ignored(entry_rel, is_dir, patterns):
+                        entries.append((not is_dir, entry.name, entry_rel, entry))
+        except PermissionError:
+            out.append(f"{indent}[permission denied]")
+            return
+
+        # Directories first, then files, each alphabetically
+        entries.sort(key=lambda e: (e[0], e[1]))
+        for shown, (is_file, name, entry_rel, entry) in enumerate(entries):
+            if shown >= max_entries or len(out) >= MAX_TREE_ENTRIES:
+                out.append(f"{indent}... {len(entries) - shown} more entries")
+                return
+            if not is_file:
+                out.append(f"{indent}{name}/")
+                if level + 1 < depth:
+                    walk(Path(entry.path), entry_rel, level + 1)
+            else:
+                try:
+                    size = format_size(entry.stat(follow_symlinks=False).st_size)
+                except OSError:
+                    size = "?"
+                out.append(f"{indent}{name} ({size})")
+
+    walk(root, "", 0)
+    return "\n".join(out)
+
 
 class ReadTool(Tool):
     """Read a file or directory."""
 
     name = "read"
     description = "Read the contents of a file or directory. Use this to read files to understand code."
+    pure = True
 
     @classmethod
     def parameters_schema(cls) -> dict[str, Any]:
@@ -28,13 +228,44 @@ class ReadTool(Tool):
                 },
                 "limit": {
                     "type": "integer",
-                    "description": "Number of lines to read",
+                    "description": f"Number of lines to read (default: {DEFAULT_LINE_LIMIT})",
+                },
+                "line_numbers": {
+                    "type": "boolean",
+                    "description": "Prefix each line with its line number (default: false)",
+                },
+                "depth": {
+                    "type": "integer",
+                    "description": "For directories: levels to list as a tree with file sizes (default: 1, flat)",
+                },
+                "max_entries": {
+                    "type": "integer",
+                    "description": f"For directory trees: maximum entries shown per directory (default: {DEFAULT_DIR_ENTRIES})",
+                },
+                "force": {
+                    "type": "boolean",
+                    "description": "Return the content even if it was already read unchanged in this session",
                 },
             },
             "required": ["file_path"],
         }
 
-    def execute(self, file_path: str, offset: int = 0, limit: int = None, **kwargs) -> dict[str, Any]:
+    def memoizable(self, force: bool = False, **kwargs) -> bool:
+        # In a session, re-reads are answered by read_cache with a short stub,
+        # and force asks for the file as it is on disk now
+        return self.session is None and not force
+
+    def execute(
+        self,
+        file_path: str,
+        offset: int = 0,
+        limit: int = None,
+        line_numbers: bool = False,
+        force: bool = False,
+        depth: int = 1,
+        max_entries: int = DEFAULT_DIR_ENTRIES,
+        **kwargs,
+    ) -> dict[str, Any]:
         """Read a file."""
         path = Path(file_path).resolve()
 
@@ -45,6 +276,14 @@ class ReadTool(Tool):
                 "success": False,
             }
 
+        if path.is_dir() and depth and depth > 1:
+            content = list_tree(path, depth, max(1, max_entries or DEFAULT_DIR_ENTRIES))
+            return {
+                "title": f"Read {file_path} (tree, depth {depth})",
+                "output": content,
+                "success": True,
+            }
+
         if path.is_dir():
             try:
                 items = list(path.iterdir())
@@ -62,19 +301,53 @@ class ReadTool(Tool):
                 }
 
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            offset = max(0, offset or 0)
+            limit = DEFAULT_LINE_LIMIT if limit is None else max(0, limit)
+            stats = path.stat()
 
-            if offset > 0:
-                lines = lines[offset:]
+            # Skip resending content the model has already seen unchanged
+            cache_key = (str(path), offset, limit, bool(line_numbers))
+            if self.session is not None and not force:
+                seen = self.session.read_cache.get(cache_key)
+                if seen and seen[:2] == (stats.st_mtime_ns, stats.st_size):
+                    return {
+                        "title": f"Read {file_path} (unchanged)",
+                        "output": (
+                            f"[File unchanged since message {seen[2]}; content omitted. "
+                            f"Use force=true to read it again.]"
+                        ),
+                        "success": True,
+                    }
 
-            if limit is not None:
-                lines = lines[:limit]
+            result = read_lines(path, offset, limit, stats=stats)
+            lines = result["lines"]
 
-            content = "".join(lines)
+            if line_numbers:
+                content = "".join(
+                    f"{offset + i + 1:6d}\t{line}" for i, line in enumerate(lines)
+                )
+            else:
+                content = "".join(lines)
+
+            if result["more"]:
+                end = offset + len(lines)
+                total = result["total_lines"]
+                of_total = f" of {total}" if total is not None else ""
+                if content and not content.endswith("\n"):
+                    content += "\n"
+                content += (
+                    f"\n[... truncated: showing lines {offset + 1}-{end}{of_total}; "
+                    f"use offset={end} to read more]"
+                )
+
+            if self.session is not None:
+                # The result is appended as the next session message
+                self.session.read_cache[cache_key] = (
+                    stats.st_mtime_ns,
+                    stats.st_size,
+                    len(self.session.messages),
+                )
 
-            # Get file stats
-            stats = path.stat()
             file_info = f"({len(lines)} lines, {stats.st_size} bytes)"
 
             return {
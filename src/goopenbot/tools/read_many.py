@@ -0,0 +1,152 @@
+"""Read many tool - read several files in one call."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from ..core.workspace import glob_paths
+from .base import Tool
+from .read import read_lines
+
+DEFAULT_LINES_PER_FILE = 500
+DEFAULT_TOTAL_BYTES = 200 * 1024
+MAX_FILES = 50
+MAX_WORKERS = 8
+
+
+class ReadManyTool(Tool):
+    """Read several files concurrently and return them as one result."""
+
+    name = "read_many"
+    description = (
+        "Read several files at once, given a list of paths and/or a glob pattern. "
+        "Prefer this over many separate read calls."
+    )
+    pure = True
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Paths of the files to read",
+                },
+                "pattern": {
+                    "type": "string",
+                    "description": "Glob pattern selecting more files to read (e.g., 'src/**/*.py')",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "The directory the glob pattern is relative to (defaults to current directory)",
+                },
+                "max_lines_per_file": {
+                    "type": "integer",
+                    "description": f"Maximum lines returned per file (default: {DEFAULT_LINES_PER_FILE})",
+                },
+                "max_total_bytes": {
+                    "type": "integer",
+                    "description": f"Total byte budget for all files (default: {DEFAULT_TOTAL_BYTES})",
+                },
+            },
+            "required": [],
+        }
+
+    def execute(
+        self,
+        paths: Optional[list[str]] = None,
+        pattern: Optional[str] = None,
+        path: str = ".",
+        max_lines_per_file: int = DEFAULT_LINES_PER_FILE,
+        max_total_bytes: int = DEFAULT_TOTAL_BYTES,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Read several files."""
+        title = f"read_many: {pattern or ', '.join(paths or [])[:50]}"
+        try:
+            names = list(paths or [])
+            if pattern:
+                base = Path(path).resolve()
+                matches = glob_paths(base, pattern)
+                names.extend(
+                    str(base / rel) for rel, is_dir, _, _ in sorted(matches) if not is_dir
+                )
+
+            # De-duplicate while keeping the requested order
+            names = list(dict.fromkeys(names))
+            if not names:
+                return {
+                    "title": title,
+                    "output": "Error: No files given (use paths and/or pattern)",
+                    "success": False,
+                }
+
+            skipped = len(names) - MAX_FILES
+            names = names[:MAX_FILES]
+
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(names))) as pool:
+                results = list(
+                    pool.map(lambda n: self._read_one(n, max_lines_per_file, max_total_bytes), names)
+                )
+
+            sections = []
+            remaining = max_total_bytes
+            for name, (body, size) in zip(names, results):
+                if remaining <= 0:
+                    sections.append(f"==> {name} <==\n[omitted: byte budget exhausted]")
+                    continue
+                if size > remaining:
+                    body = _trim_to_bytes(body, remaining)
+                    body += "\n[... truncated: byte budget exhausted]"
+                    size = remaining
+                remaining -= size
+                sections.append(f"==> {name} <==\n{body}")
+
+            if skipped > 0:
+                sections.append(f"... and {skipped} more files (max {MAX_FILES} per call)")
+
+            return {
+                "title": f"read_many: {len(names)} files ({max_total_bytes - remaining} bytes)",
+                "output": "\n\n".join(sections),
+                "success": True,
+            }
+        except Exception as e:
+            return {
+                "title": title,
+                "output": f"Error: {str(e)}",
+                "success": False,
+            }
+
+    @staticmethod
+    def _read_one(name: str, max_lines: int, max_bytes: int) -> tuple[str, int]:
+        """Read one file, returning (formatted body, content bytes)."""
+        file_path = Path(name).resolve()
+        if not file_path.exists():
+            return f"Error: File not found: {name}", 0
+        if file_path.is_dir():
+            return "Error: Is a directory", 0
+        try:
+            result = read_lines(file_path, 0, max_lines, max_bytes)
+        except UnicodeDecodeError:
+            return "Error: Cannot read binary file", 0
+        except OSError as e:
+            return f"Error: {str(e)}", 0
+
+        body = "".join(result["lines"])
+        size = len(body.encode("utf-8"))
+        if result["more"]:
+            total = result["total_lines"]
+            of_total = f" of {total}" if total is not None else ""
+            if body and not body.endswith("\n"):
+                body += "\n"
+            body += f"[... truncated: showing lines 1-{len(result['lines'])}{of_total}]"
+        return body, size
+
+
+def _trim_to_bytes(text: str, max_bytes: int) -> str:
+    """Cut text to at most max_bytes of UTF-8, at a line boundary if possible."""
+    cut = text.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore")
+    newline = cut.rfind("\n")
+    return cut[: newline + 1] if newline > 0 else cut
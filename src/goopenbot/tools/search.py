@@ -0,0 +1,101 @@
+"""Search tool - relevance-ranked lexical search over the workspace."""
+
+from pathlib import Path
+from typing import Any, Optional
+
+from ..core.lexical import get_lexical_index
+from .base import Tool
+
+DEFAULT_K = 10
+MAX_RANGES = 3
+SNIPPET_LINES = 3
+
+
+def _snippet(path: Path, start: int, end: int) -> str:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = [
+                f"    {i:>5}\t{line.rstrip()[:200]}"
+                for i, line in enumerate(f, 1)
+                if start <= i <= end
+            ]
+    except OSError:
+        return ""
+    return "\n".join(lines[:SNIPPET_LINES])
+
+
+class SearchTool(Tool):
+    """Rank workspace files by relevance to a query (BM25)."""
+
+    name = "search"
+    description = (
+        "Find the files most relevant to a set of words or identifiers, ranked by BM25. "
+        "Identifiers are split (getUserName matches 'user name'). Returns the top files "
+        "with matching line ranges and a snippet. Prefer this over grep for broad queries."
+    )
+    pure = True
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Words or identifiers to look for",
+                },
+                "k": {
+                    "type": "integer",
+                    "description": f"Number of files to return (default: {DEFAULT_K})",
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Only rank files matching this glob (e.g. 'src/**/*.py')",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Project root (defaults to current directory)",
+                },
+            },
+            "required": ["query"],
+        }
+
+    def execute(
+        self,
+        query: str,
+        k: int = DEFAULT_K,
+        glob: Optional[str] = None,
+        path: str = ".",
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Rank files for a query."""
+        title = f"search: {query[:50]}"
+        try:
+            root = Path(path).resolve()
+            results = get_lexical_index(root).search(query, max(1, k or DEFAULT_K), glob)
+            if not results:
+                return {"title": title, "output": "No matches found", "success": True}
+
+            blocks = []
+            for score, rel, ranges in results:
+                spans = ", ".join(
+                    f"{start}-{end}" if end > start else str(start)
+                    for start, end in ranges[:MAX_RANGES]
+                )
+                more = f" (+{len(ranges) - MAX_RANGES} more)" if len(ranges) > MAX_RANGES else ""
+                start, end = ranges[0]
+                blocks.append(
+                    f"{rel} (score {score:.2f}) lines {spans}{more}\n"
+                    f"{_snippet(root / rel, start, end)}"
+                )
+            return {
+                "title": f"{title} ({len(results)} files)",
+                "output": "\n".join(blocks),
+                "success": True,
+            }
+        except Exception as e:
+            return {
+                "title": title,
+                "output": f"Error: {str(e)}",
+                "success": False,
+            }
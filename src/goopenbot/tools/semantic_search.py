@@ -0,0 +1,101 @@
+"""Semantic search tool - find code by meaning using embeddings."""
+
+from pathlib import Path
+from typing import Any, Optional
+
+from ..core.config import load_config
+from ..core.provider import OllamaProvider, run_sync
+from ..core.vectors import VectorIndex
+from .base import Tool
+
+DEFAULT_K = 10
+SNIPPET_LINES = 3
+
+_indexes: dict[tuple[Path, str], VectorIndex] = {}
+
+
+def _embed(texts: list[str], model: str) -> list[list[float]]:
+    async def embed():
+        return await OllamaProvider().embed(texts, model=model)
+
+    return run_sync(embed())
+
+
+def _snippet(path: Path, start: int, end: int) -> str:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = [line.rstrip("\n") for i, line in enumerate(f, 1) if start <= i <= end]
+    except OSError:
+        return ""
+    lines = [line for line in lines if line.strip()][:SNIPPET_LINES]
+    return "\n".join(f"    {line[:200]}" for line in lines)
+
+
+class SemanticSearchTool(Tool):
+    """Find code related to a natural-language query using embeddings."""
+
+    name = "semantic_search"
+    description = (
+        "Search the workspace by meaning rather than exact words (e.g. 'where do we refresh "
+        "auth tokens?'). Returns the most similar functions/blocks with file and line ranges."
+    )
+    pure = True
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "What you are looking for, in plain words",
+                },
+                "k": {
+                    "type": "integer",
+                    "description": f"Number of results (default: {DEFAULT_K})",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Project root (defaults to current directory)",
+                },
+            },
+            "required": ["query"],
+        }
+
+    def execute(
+        self,
+        query: str,
+        k: int = DEFAULT_K,
+        path: str = ".",
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Embed the query and search the index."""
+        title = f"semantic_search: {query[:50]}"
+        try:
+            root = Path(path).resolve()
+            model = load_config().provider.embedding_model
+            index: Optional[VectorIndex] = _indexes.get((root, model))
+            if index is None:
+                index = _indexes[(root, model)] = VectorIndex(root, model)
+
+            embedded = index.update(lambda texts: _embed(texts, model))
+            results = index.search(_embed([query], model)[0], max(1, k or DEFAULT_K))
+            if not results:
+                return {"title": title, "output": "No indexed files", "success": True}
+
+            blocks = [
+                f"{rel}:{start}-{end} (score {score:.2f})\n{_snippet(root / rel, start, end)}"
+                for score, rel, start, end in results
+            ]
+            note = f" ({embedded} chunks embedded)" if embedded else ""
+            return {
+                "title": f"{title} ({len(results)} results){note}",
+                "output": "\n".join(blocks),
+                "success": True,
+            }
+        except Exception as e:
+            return {
+                "title": title,
+                "output": f"Error: {str(e)}",
+                "success": False,
+            }
@@ -0,0 +1,114 @@
+"""Symbols tool - look up Python definitions, class members and importers."""
+
+from pathlib import Path
+from typing import Any
+
+from ..core.symbols import get_symbol_index
+from .base import Tool
+
+DEFAULT_LIMIT = 50
+
+
+def _format_symbol(rel: str, symbol: list) -> str:
+    kind, qualname, start, end, signature = symbol
+    return f"{rel}:{start}-{end} {qualname}: {signature}"
+
+
+class SymbolsTool(Tool):
+    """Answer symbol queries from the workspace's Python symbol index."""
+
+    name = "symbols"
+    description = (
+        "Look up Python symbols in the workspace: where a class/function/method is defined "
+        "(define), the members of a class (members), which files import a module or name "
+        "(importers), or the outline of a file (outline). Answers include file and line spans."
+    )
+    pure = True
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["define", "members", "importers", "outline"],
+                    "description": "What to look up",
+                },
+                "name": {
+                    "type": "string",
+                    "description": "Symbol, class or module name (e.g. 'Session', 'Session.save', "
+                    "'goopenbot.core.session'); for outline, a file path",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Project root (defaults to current directory)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Maximum number of results (default: {DEFAULT_LIMIT})",
+                },
+            },
+            "required": ["action", "name"],
+        }
+
+    def execute(
+        self,
+        action: str,
+        name: str,
+        path: str = ".",
+        limit: int = DEFAULT_LIMIT,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Query the symbol index."""
+        title = f"symbols {action}: {name}"
+        try:
+            root = Path(path).resolve()
+            index = get_symbol_index(root)
+            limit = max(1, limit or DEFAULT_LIMIT)
+
+            lines: list[str] = []
+            if action == "define":
+                lines = [_format_symbol(rel, symbol) for rel, symbol in index.definitions(name)]
+            elif action == "members":
+                for rel, symbol, members in index.members(name):
+                    lines.append(_format_symbol(rel, symbol))
+                    lines.extend(
+                        f"  {start}-{end} {signature}" for _, _, start, end, signature in members
+                    )
+            elif action == "importers":
+                for rel, (module, imported, line) in index.importers(name):
+                    statement = f"from {module} import {imported}" if imported else f"import {module}"
+                    lines.append(f"{rel}:{line} {statement}")
+            elif action == "outline":
+                file_path = Path(name)
+                file_path = file_path if file_path.is_absolute() else root / file_path
+                rel = file_path.resolve().relative_to(root).as_posix()
+                lines = [
+                    f"{start}-{end} {'  ' * qualname.count('.')}{signature}"
+                    for _, qualname, start, end, signature in index.outline(rel)
+                ]
+            else:
+                return {
+                    "title": title,
+                    "output": f"Error: Unknown action: {action} (use define, members, importers or outline)",
+                    "success": False,
+                }
+
+            if not lines:
+                return {"title": title, "output": "No matches found", "success": True}
+
+            output = "\n".join(lines[:limit])
+            if len(lines) > limit:
+                output += f"\n... and {len(lines) - limit} more"
+            return {
+                "title": f"{title} ({len(lines)} results)",
+                "output": output,
+                "success": True,
+            }
+        except Exception as e:
+            return {
+                "title": title,
+                "output": f"Error: {str(e)}",
+                "success": False,
+            }
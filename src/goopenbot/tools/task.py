@@ -0,0 +1,101 @@
+"""Task tool - delegate sub-tasks to concurrent sub-agents."""
+
+from typing import Any, Optional
+
+from ..core.config import load_config
+from ..core.orchestrator import run_tasks
+from ..core.provider import run_sync
+from .base import Tool
+
+
+class TaskTool(Tool):
+    """Run sub-agents concurrently and return their summaries."""
+
+    name = "task"
+    description = (
+        "Delegate independent sub-tasks to sub-agents that run concurrently, each in its own "
+        "session and optionally limited to one directory. Only each sub-agent's final summary "
+        "is returned. Use for large tasks that split into independent parts."
+    )
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "tasks": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "prompt": {
+                                "type": "string",
+                                "description": "Complete instructions for the sub-agent",
+                            },
+                            "agent": {
+                                "type": "string",
+                                "description": "Agent definition to use (agents/<name>.md)",
+                            },
+                            "path": {
+                                "type": "string",
+                                "description": "Directory the sub-agent is limited to",
+                            },
+                        },
+                        "required": ["prompt"],
+                    },
+                    "description": "The sub-tasks to run",
+                },
+                "max_parallel": {
+                    "type": "integer",
+                    "description": "Sub-agents to run at once (default: agent.max_parallel_tasks)",
+                },
+            },
+            "required": ["tasks"],
+        }
+
+    def execute(
+        self,
+        tasks: list[dict[str, Any]],
+        max_parallel: Optional[int] = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Run the sub-agents and collect their summaries."""
+        title = f"task ({len(tasks)} sub-agents)"
+        try:
+            if not tasks or any(not task.get("prompt") for task in tasks):
+                return {
+                    "title": title,
+                    "output": "Error: Every task needs a prompt",
+                    "success": False,
+                }
+
+            config = load_config()
+            model = self.session.model if self.session is not None else None
+            results = run_sync(
+                run_tasks(
+                    tasks,
+                    max_parallel or config.agent.max_parallel_tasks,
+                    model=model,
+                    parent=self.session,
+                )
+            )
+
+            blocks = []
+            for i, (task, (ok, summary)) in enumerate(zip(tasks, results), 1):
+                scope = ", ".join(
+                    part for part in (task.get("agent"), task.get("path")) if part
+                )
+                header = f"## Task {i}{f' ({scope})' if scope else ''}: {task['prompt'][:80]}"
+                blocks.append(f"{header}\n{summary.strip() or '(no summary)'}")
+            failed = sum(1 for ok, _ in results if not ok)
+            return {
+                "title": title + (f", {failed} failed" if failed else ""),
+                "output": "\n\n".join(blocks),
+                "success": failed == 0,
+            }
+        except Exception as e:
+            return {
+                "title": title,
+                "output": f"Error: {str(e)}",
+                "success": False,
+            }
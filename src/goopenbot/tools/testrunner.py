@@ -0,0 +1,374 @@
+"""Test tool - run only the tests affected by this session's changes."""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from ..core.symbols import imported_modules, module_names, parse_imports
+from ..core.workspace import (
+    CACHE_DIR,
+    bump_generation,
+    get_snapshot,
+    is_ignored_path,
+    load_ignore_patterns,
+    workspace_cache_dir,
+)
+from .base import Tool
+
+DEFAULT_TIMEOUT = 600
+MAX_OUTPUT_BYTES = 8000
+MAX_TRACEBACK_LINES = 15
+
+# Virtualenv directories searched for the project's interpreter
+VENV_DIRS = (".venv", "venv")
+
+# path -> (mtime_ns, imported module names)
+_import_cache: dict[str, tuple[int, list[str]]] = {}
+# interpreter -> whether coverage is importable there
+_coverage_available: dict[str, bool] = {}
+
+
+def project_python(root: Path) -> str:
+    """Interpreter of the project's virtualenv, or of the active one, or our own."""
+    venvs = [root / name for name in VENV_DIRS]
+    if os.environ.get("VIRTUAL_ENV"):
+        venvs.append(Path(os.environ["VIRTUAL_ENV"]))
+    for venv in venvs:
+        for candidate in (venv / "bin" / "python", venv / "Scripts" / "python.exe"):
+            if candidate.is_file():
+                return str(candidate)
+    return sys.executable
+
+
+def is_test_file(rel: str) -> bool:
+    name = rel.rsplit("/", 1)[-1]
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def _imports(path: Path, rel: str) -> list[str]:
+    """Absolute module names imported by a file (cached by mtime)."""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return []
+    cached = _import_cache.get(str(path))
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    names = imported_modules(parse_imports(str(path), rel))
+    _import_cache[str(path)] = (mtime, names)
+    return names
+
+
+def affected_tests(root: Path, changed: list[Path]) -> tuple[list[str], list[str]]:
+    """Test files that import a changed file, directly or transitively.
+
+    Returns (test files, changed files the import graph could not map).
+    """
+    patterns = load_ignore_patterns(root)
+    files = [
+        rel
+        for rel, is_dir, _, _ in get_snapshot(root).match("**/*.py")
+        if not is_dir and not is_ignored_path(rel, patterns)
+    ]
+
+    by_module: dict[str, str] = {}
+    for rel in files:
+        for name in module_names(rel):
+            by_module.setdefault(name, rel)
+
+    importers: dict[str, set[str]] = {}
+    for rel in files:
+        for name in _imports(root / rel, rel):
+            target = by_module.get(name)
+            if target and target != rel:
+                importers.setdefault(target, set()).add(rel)
+
+    tests: set[str] = set()
+    unmapped: list[str] = []
+    for path in changed:
+        try:
+            start = path.resolve().relative_to(root).as_posix()
+        except ValueError:
+            continue
+        seen = {start}
+        queue = [start]
+        while queue:
+            current = queue.pop()
+            for importer in importers.get(current, ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    queue.append(importer)
+        found = {rel for rel in seen if is_test_file(rel)}
+        if found:
+            tests |= found
+        else:
+            unmapped.append(start)
+    return sorted(tests), unmapped
+
+
+def _coverage_map_path(root: Path) -> Path:
+    return root / CACHE_DIR / "coverage.json"
+
+
+def load_coverage_map(root: Path) -> dict[str, list[str]]:
+    """Source file -> test files that executed it, from the last full run."""
+    try:
+        return json.loads(_coverage_map_path(root).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def coverage_available(python: str) -> bool:
+    """Whether coverage can be imported by an interpreter (cached)."""
+    if python not in _coverage_available:
+        try:
+            process = subprocess.run(
+                [python, "-c", "import coverage"], capture_output=True, timeout=30
+            )
+            _coverage_available[python] = process.returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            _coverage_available[python] = False
+    return _coverage_available[python]
+
+
+def _save_coverage_map(root: Path, python: str, rcfile: Path, data_file: Path) -> None:
+    """Turn per-test coverage contexts into a file -> test files map."""
+    report = data_file.with_suffix(".json")
+    subprocess.run(
+        [python, "-m", "coverage", "json", "--show-contexts", f"--rcfile={rcfile}",
+         f"--data-file={data_file}", "-o", str(report)],
+        cwd=root,
+        capture_output=True,
+        timeout=120,
+    )
+    try:
+        data = json.loads(report.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+
+    # Contexts are dotted test names such as "test_x.TestA.test_b"
+    patterns = load_ignore_patterns(root)
+    test_modules: dict[str, str] = {}
+    for rel, is_dir, _, _ in get_snapshot(root).match("**/*.py"):
+        if not is_dir and is_test_file(rel) and not is_ignored_path(rel, patterns):
+            for name in module_names(rel):
+                test_modules.setdefault(name, rel)
+
+    def test_file(context: str) -> Optional[str]:
+        parts = context.split("|", 1)[0].split(".")
+        for end in range(len(parts), 0, -1):
+            found = test_modules.get(".".join(parts[:end]))
+            if found:
+                return found
+        return None
+
+    mapping: dict[str, list[str]] = {}
+    for filename, info in data.get("files", {}).items():
+        tests = set()
+        for contexts in info.get("contexts", {}).values():
+            for context in contexts:
+                found = test_file(context) if context else None
+                if found:
+                    tests.add(found)
+        if tests:
+            rel = Path(filename)
+            rel = rel.resolve().relative_to(root) if rel.is_absolute() else rel
+            mapping[rel.as_posix()] = sorted(tests)
+
+    workspace_cache_dir(root)
+    _coverage_map_path(root).write_text(json.dumps(mapping), encoding="utf-8")
+
+
+def summarize_pytest(output: str, max_bytes: int = MAX_OUTPUT_BYTES) -> str:
+    """Failures (last lines of each traceback), the short summary and the result line."""
+    lines = output.splitlines()
+    sections: list[str] = []
+
+    failures: list[tuple[str, list[str]]] = []
+    in_failures = False
+    for line in lines:
+        if re.match(r"^=+ (FAILURES|ERRORS) =+$", line):
+            in_failures = True
+            continue
+        if in_failures and re.match(r"^=+ .* =+$", line):
+            in_failures = False
+        if not in_failures:
+            continue
+        header = re.match(r"^_{3,} (.+?) _{3,}$", line)
+        if header:
+            failures.append((header.group(1), []))
+        elif failures:
+            failures[-1][1].append(line)
+
+    for name, body in failures:
+        body = [line for line in body if line.strip()]
+        if len(body) > MAX_TRACEBACK_LINES:
+            body = ["    ..."] + body[-MAX_TRACEBACK_LINES:]
+        sections.append(f"FAILED {name}\n" + "\n".join(body))
+
+    summary = [line for line in lines if line.startswith(("FAILED ", "ERROR "))]
+    if summary:
+        sections.append("\n".join(summary))
+    result = next(
+        (
+            line
+            for line in reversed(lines)
+            if re.search(r"\d+ (passed|failed|errors?|skipped|deselected)|no tests ran", line)
+        ),
+        lines[-1] if lines else "No output",
+    )
+    sections.append(result.strip("= "))
+
+    text = "\n\n".join(sections)
+    if len(text.encode("utf-8")) > max_bytes:
+        text = text.encode("utf-8")[-max_bytes:].decode("utf-8", errors="ignore")
+        text = "[... earlier output truncated]\n" + text[text.find("\n") + 1 :]
+    return text
+
+
+class TestRunnerTool(Tool):
+    """Run the tests affected by files changed in this session."""
+
+    name = "test"
+    description = (
+        "Run the Python tests affected by the files changed in this session (found via imports), "
+        "and return a compact pass/fail summary. Use full=true to run the whole suite."
+    )
+
+    @classmethod
+    def parameters_schema(cls) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "full": {
+                    "type": "boolean",
+                    "description": "Run the whole test suite (default: false)",
+                },
+                "files": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Treat these files as changed instead of the session's changes",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Project root (defaults to current directory)",
+                },
+                "timeout": {
+                    "type": "integer",
+                    "description": f"Seconds before the run is stopped (default: {DEFAULT_TIMEOUT})",
+                },
+            },
+            "required": [],
+        }
+
+    def execute(
+        self,
+        full: bool = False,
+        files: Optional[list[str]] = None,
+        path: str = ".",
+        timeout: int = DEFAULT_TIMEOUT,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Select and run tests."""
+        title = "test (full)" if full else "test"
+        try:
+            root = Path(path).resolve()
+            if full:
+                return self._run(root, [], timeout, title, record_coverage=True)
+
+            if files:
+                changed = [Path(f) for f in files]
+            elif self.session is not None:
+                changed = [Path(f) for f in sorted(self.session.changed_files)]
+            else:
+                changed = []
+            if not changed:
+                return {
+                    "title": title,
+                    "output": "No files changed in this session; pass files or full=true",
+                    "success": True,
+                }
+
+            tests, unmapped = affected_tests(root, changed)
+            if unmapped:
+                coverage_map = load_coverage_map(root)
+                still_unmapped = []
+                for rel in unmapped:
+                    if rel in coverage_map:
+                        tests = sorted(set(tests) | set(coverage_map[rel]))
+                    else:
+                        still_unmapped.append(rel)
+                unmapped = still_unmapped
+
+            note = ""
+            if unmapped:
+                note = "No tests found for: " + ", ".join(unmapped) + "\n"
+            if not tests:
+                return {
+                    "title": title,
+                    "output": note + "No affected tests; use full=true to run everything",
+                    "success": True,
+                }
+
+            result = self._run(root, tests, timeout, f"{title} ({len(tests)} files)")
+            result["output"] = f"Ran: {' '.join(tests)}\n{note}\n{result['output']}"
+            return result
+        except Exception as e:
+            return {
+                "title": title,
+                "output": f"Error: {str(e)}",
+                "success": False,
+            }
+
+    @staticmethod
+    def _run(
+        root: Path, tests: list[str], timeout: int, title: str, record_coverage: bool = False
+    ) -> dict[str, Any]:
+        python = project_python(root)
+        args = ["-q", "--tb=short", "-rfE", "-p", "no:cacheprovider", *tests]
+        with tempfile.TemporaryDirectory(prefix="goopenbot-cov-") as tmp_dir:
+            data_file = None
+            if record_coverage and coverage_available(python):
+                # Full runs also record which tests execute which files
+                rcfile = Path(tmp_dir) / "coveragerc"
+                rcfile.write_text("[run]\ndynamic_context = test_function\nrelative_files = true\n")
+                data_file = Path(tmp_dir) / "coverage.data"
+                command = [python, "-m", "coverage", "run", f"--rcfile={rcfile}",
+                           f"--data-file={data_file}", "-m", "pytest", *args]
+            else:
+                command = [python, "-m", "pytest", *args]
+
+            try:
+                process = subprocess.run(
+                    command,
+                    cwd=root,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout,
+                    env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+                )
+            except subprocess.TimeoutExpired:
+                return {
+                    "title": title,
+                    "output": f"Error: Tests timed out after {timeout} seconds",
+                    "success": False,
+                }
+            finally:
+                # Tests may have written files
+                bump_generation()
+
+            if data_file is not None and data_file.exists():
+                _save_coverage_map(root, python, rcfile, data_file)
+
+        # pytest exit codes: 0 passed, 1 failures, 5 no tests collected
+        return {
+            "title": title,
+            "output": summarize_pytest(process.stdout + process.stderr),
+            "success": process.returncode in (0, 5),
+        }
@@ -4,7 +4,10 @@ import os
 from pathlib import Path
 from typing import Any
 
+from ..core.checkpoint import checkpoint_file
+from ..core.workspace import atomic_write_text, notify_file_changed
 from .base import Tool
+from .diff import compact_diff
 
 
 class WriteTool(Tool):
@@ -35,14 +38,27 @@ class WriteTool(Tool):
         path = Path(file_path).resolve()
 
         try:
+            previous = None
+            if path.is_file():
+                try:
+                    previous = path.read_text(encoding="utf-8")
+                except UnicodeDecodeError:
+                    pass
+
             path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(content)
+            checkpoint_file(self.session, path)
+            atomic_write_text(path, content)
+            notify_file_changed(path)
+            if self.session:
+                self.session.record_change(str(path))
 
             lines = content.count("\n") + 1 if content else 0
+            output = f"Successfully wrote {lines} lines to {file_path}"
+            if previous is not None:
+                output += f"\n\nChanges: {compact_diff(previous, content, path.name)}"
             return {
                 "title": f"Write {file_path}",
-                "output": f"Successfully wrote {lines} lines to {file_path}",
+                "output": output,
                 "success": True,
             }
         except PermissionError:
@@ -9,31 +9,107 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from goopenbot.tools.base import Tool
 from goopenbot.tools.read import ReadTool
+from goopenbot.tools.read_many import ReadManyTool
 from goopenbot.tools.write import WriteTool
 from goopenbot.tools.glob import GlobTool
 from goopenbot.tools.grep import GrepTool
 from goopenbot.tools.edit import EditTool
+from goopenbot.tools.multi_edit import MultiEditTool
 from goopenbot.tools.bash import BashTool
 from goopenbot.tools import get_tool_by_name, get_tools_schema
 
 
+def start_chat_server(reply, delay=0.0):
+    """Serve OpenAI-style chat completions from reply(request body) -> content.
+
+    Returns (server, state) where state tracks the peak number of
+    concurrent requests.
+    """
+    import json
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    state = {"active": 0, "peak": 0, "requests": 0}
+    lock = threading.Lock()
+
+    class ChatHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                state["active"] += 1
+                state["requests"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(delay)
+            payload = json.dumps({
+                "id": "chat", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply(body)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+            }).encode()
+            with lock:
+                state["active"] -= 1
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def isolate_data_dir(monkeypatch, data_dir):
+    """Point every module that stores data under get_data_dir() at data_dir."""
+    import importlib
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for name in (
+        "goopenbot.core.checkpoint",
+        "goopenbot.core.client",
+        "goopenbot.core.repomap",
+        "goopenbot.core.router",
+        "goopenbot.core.session",
+        "goopenbot.core.symbols",
+        "goopenbot.core.vectors",
+        "goopenbot.tools.jobs",
+    ):
+        monkeypatch.setattr(importlib.import_module(name), "get_data_dir", lambda: data_dir)
+
+
 class TestTools:
     """Test tool implementations."""
 
     def test_get_tool_by_name(self):
         """Test getting tool by name."""
         assert get_tool_by_name("read") is not None
+        assert get_tool_by_name("read_many") is not None
         assert get_tool_by_name("write") is not None
         assert get_tool_by_name("glob") is not None
         assert get_tool_by_name("grep") is not None
         assert get_tool_by_name("edit") is not None
         assert get_tool_by_name("bash") is not None
+        assert get_tool_by_name("multi_edit") is not None
+        assert get_tool_by_name("job_output") is not None
+        assert get_tool_by_name("git") is not None
+        assert get_tool_by_name("test") is not None
+        assert get_tool_by_name("symbols") is not None
+        assert get_tool_by_name("semantic_search") is not None
+        assert get_tool_by_name("search") is not None
+        assert get_tool_by_name("task") is not None
         assert get_tool_by_name("nonexistent") is None
 
     def test_get_tools_schema(self):
         """Test getting tools schema."""
         schema = get_tools_schema()
-        assert len(schema) == 6
+        assert len(schema) == 17
         tool_names = [s["function"]["name"] for s in schema]
         assert "read" in tool_names
         assert "write" in tool_names
@@ -50,6 +126,79 @@ class TestTools:
         assert result["success"] is True
         assert "Hello, World!" in result["output"]
 
+    def test_read_tool_offset_limit(self, tmp_path, monkeypatch):
+        """Test read tool line ranges, numbering and truncation marker."""
+        import goopenbot.tools.read as read_module
+
+        monkeypatch.setattr(read_module, "INDEX_THRESHOLD", 0)
+        monkeypatch.setattr(read_module, "INDEX_STRIDE", 10)
+        test_file = tmp_path / "lines.txt"
+        test_file.write_text("".join(f"line {i}\n" for i in range(100)))
+
+        tool = ReadTool()
+        tool.execute(file_path=str(test_file))
+        result = tool.execute(file_path=str(test_file), offset=42, limit=2, line_numbers=True)
+
+        assert result["success"] is True
+        assert result["output"].startswith("    43\tline 42\n    44\tline 43\n")
+        assert "offset=44" in result["output"]
+
+        result = tool.execute(file_path=str(test_file), offset=98)
+        assert result["output"] == "line 98\nline 99\n"
+
+    def test_read_tool_cuts_long_lines_on_character_boundary(self, tmp_path):
+        """Test a long line cut inside a multibyte character still decodes."""
+        test_file = tmp_path / "wide.txt"
+        test_file.write_text("a" * 1999 + "é" * 10 + "\nnext\n", encoding="utf-8")
+
+        result = ReadTool().execute(file_path=str(test_file))
+
+        assert result["success"] is True
+        assert result["output"].startswith("a" * 1999 + " [... line truncated]\nnext\n")
+
+    def test_read_tool_session_cache(self, tmp_path):
+        """Test unchanged re-reads in a session return a stub."""
+        from goopenbot.core.session import Session
+
+        session = Session.create()
+        test_file = tmp_path / "cached.txt"
+        test_file.write_text("original content")
+
+        first = ReadTool(session=session).execute(file_path=str(test_file))
+        session.add_tool_result("call_1", first["output"])
+        second = ReadTool(session=session).execute(file_path=str(test_file))
+        forced = ReadTool(session=session).execute(file_path=str(test_file), force=True)
+
+        assert "original content" in first["output"]
+        assert "unchanged since message 0" in second["output"]
+        assert "original content" in forced["output"]
+
+        EditTool(session=session).execute(
+            file_path=str(test_file), old_string="original", new_string="edited"
+        )
+        third = ReadTool(session=session).execute(file_path=str(test_file))
+        assert "edited content" in third["output"]
+
+    def test_read_tool_directory_tree(self, tmp_path):
+        """Test recursive directory listing with ignore rules and caps."""
+        (tmp_path / ".gitignore").write_text("build/\n*.log\n")
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "src" / "pkg" / "mod.py").write_text("x = 1\n")
+        (tmp_path / "build").mkdir()
+        (tmp_path / "debug.log").write_text("log")
+        for i in range(5):
+            (tmp_path / "src" / f"f{i}.py").write_text("")
+
+        tool = ReadTool()
+        result = tool.execute(file_path=str(tmp_path), depth=3, max_entries=3)
+
+        assert result["success"] is True
+        output = result["output"]
+        assert "src/\n  pkg/\n    mod.py (6 B)" in output
+        assert "... 3 more entries" in output
+        assert "build" not in output
+        assert "debug.log" not in output
+
     def test_read_tool_file_not_found(self):
         """Test read tool with non-existent file."""
         tool = ReadTool()
@@ -58,6 +207,26 @@ class TestTools:
         assert result["success"] is False
         assert "not found" in result["output"].lower()
 
+    def test_read_many_tool(self, tmp_path):
+        """Test reading several files with a byte budget."""
+        (tmp_path / "a.py").write_text("alpha\n")
+        (tmp_path / "b.py").write_text("beta\n" * 100)
+        (tmp_path / "c.txt").write_text("gamma\n")
+
+        tool = ReadManyTool()
+        result = tool.execute(
+            paths=[str(tmp_path / "c.txt")],
+            pattern="*.py",
+            path=str(tmp_path),
+            max_total_bytes=100,
+        )
+
+        assert result["success"] is True
+        output = result["output"]
+        assert output.index("c.txt") < output.index("a.py") < output.index("b.py")
+        assert "gamma" in output and "alpha" in output
+        assert "byte budget exhausted" in output
+
     def test_write_tool(self, tmp_path):
         """Test write tool."""
         test_file = tmp_path / "output.txt"
@@ -84,6 +253,26 @@ class TestTools:
         assert result["success"] is True
         assert test_file.exists()
 
+    def test_write_tool_file_modes(self, tmp_path):
+        """Test new files follow the umask and existing files keep their mode."""
+        import os
+        import stat
+
+        tool = WriteTool()
+        old_umask = os.umask(0o022)
+        try:
+            new_file = tmp_path / "new.txt"
+            assert tool.execute(file_path=str(new_file), content="new")["success"] is True
+            assert stat.S_IMODE(new_file.stat().st_mode) == 0o644
+
+            script = tmp_path / "run.sh"
+            script.write_text("#!/bin/sh\n")
+            script.chmod(0o755)
+            assert tool.execute(file_path=str(script), content="#!/bin/sh\ntrue\n")["success"] is True
+            assert stat.S_IMODE(script.stat().st_mode) == 0o755
+        finally:
+            os.umask(old_umask)
+
     def test_glob_tool(self, tmp_path):
         """Test glob tool."""
         # Create test files
@@ -99,6 +288,66 @@ class TestTools:
         assert "test2.txt" in result["output"]
         assert "other.md" not in result["output"]
 
+    def test_glob_tool_limit_and_mtime_sort(self, tmp_path):
+        """Test glob tool limit and newest-first sorting."""
+        import os
+
+        for i in range(5):
+            f = tmp_path / "pkg" / f"mod{i}.py"
+            f.parent.mkdir(exist_ok=True)
+            f.write_text("x")
+            os.utime(f, (1000 + i, 1000 + i))
+
+        tool = GlobTool()
+        result = tool.execute(pattern="**/*.py", path=str(tmp_path), limit=2, sort_by="mtime")
+
+        assert result["success"] is True
+        lines = result["output"].split("\n")
+        assert lines[0] == "pkg/mod4.py"
+        assert lines[1] == "pkg/mod3.py"
+        assert "3 more files" in lines[2]
+
+    def test_glob_tool_sees_written_files(self, tmp_path):
+        """Test glob snapshot is updated by the write tool."""
+        (tmp_path / "a.txt").write_text("a")
+        tool = GlobTool()
+        assert "b.txt" not in tool.execute(pattern="**/*.txt", path=str(tmp_path))["output"]
+
+        WriteTool().execute(file_path=str(tmp_path / "new" / "b.txt"), content="b")
+        result = tool.execute(pattern="**/*.txt", path=str(tmp_path))
+
+        assert "a.txt" in result["output"]
+        assert "new/b.txt" in result["output"]
+
+    def test_glob_tool_into_ignored_directories(self, tmp_path):
+        """Test patterns naming an ignored directory still match inside it."""
+        import goopenbot.core.workspace as workspace_module
+
+        (tmp_path / ".gitignore").write_text("build/\n")
+        (tmp_path / "node_modules" / "dep" / "lib").mkdir(parents=True)
+        (tmp_path / "node_modules" / "dep" / "lib" / "index.js").write_text("")
+        (tmp_path / "build").mkdir()
+        (tmp_path / "build" / "out.js").write_text("")
+        (tmp_path / "app.js").write_text("")
+
+        tool = GlobTool()
+        assert tool.execute(pattern="**/*.js", path=str(tmp_path))["output"] == "app.js"
+        result = tool.execute(pattern="node_modules/**/*.js", path=str(tmp_path))
+        assert result["output"] == "node_modules/dep/lib/index.js"
+        assert tool.execute(pattern="build/*", path=str(tmp_path))["output"] == "build/out.js"
+        output = ReadManyTool().execute(pattern="node_modules/**/*.js", path=str(tmp_path))["output"]
+        assert "==> " + str(tmp_path / "node_modules" / "dep" / "lib" / "index.js") in output
+
+        # Non-recursive patterns list directories; sub-paths reuse the parent's snapshot
+        workspace_module.clear_snapshots()
+        tool.execute(pattern="*.js", path=str(tmp_path))
+        assert tmp_path.resolve() not in workspace_module._snapshots
+        tool.execute(pattern="**/*.js", path=str(tmp_path))
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.js").write_text("")
+        assert tool.execute(pattern="**/*.js", path=str(tmp_path / "src"))["output"] == "main.js"
+        assert list(workspace_module._snapshots) == [tmp_path.resolve()]
+
     def test_grep_tool(self, tmp_path):
         """Test grep tool."""
         # Create test file
@@ -111,6 +360,376 @@ class TestTools:
         assert result["success"] is True
         assert "def hello" in result["output"]
 
+    def test_bash_tool(self):
+        """Test bash tool output and exit codes."""
+        tool = BashTool()
+        assert tool.execute(command="echo hello")["output"].strip() == "hello"
+
+        result = tool.execute(command="echo oops >&2; exit 3")
+        assert result["success"] is False
+        assert "[exit code: 3]" in result["output"]
+        assert "oops" in result["output"]
+
+    def test_bash_tool_limits(self, monkeypatch):
+        """Test bash tool output quota and process-tree kill on timeout."""
+        import time
+        import goopenbot.tools.bash as bash_module
+        from goopenbot.core.config import BashConfig, Config, ToolConfig
+
+        limits = BashConfig(timeout=1, max_output_bytes=1000)
+        monkeypatch.setattr(
+            bash_module, "load_config", lambda: Config(tools=ToolConfig(bash=limits))
+        )
+        tool = BashTool()
+
+        result = tool.execute(command="yes")
+        assert result["success"] is False
+        assert "output exceeded 1000 bytes" in result["output"]
+
+        start = time.time()
+        result = tool.execute(command="sleep 30 | cat")
+        assert result["success"] is False
+        assert "timed out" in result["output"]
+        assert time.time() - start < 10
+
+        limits = BashConfig(cpu_seconds=30, max_open_files=64, nice=5)
+        result = tool.execute(command="ulimit -t; ulimit -n; nice")
+        assert result["success"] is True
+        assert result["output"].split() == ["30", "64", "5"]
+
+    def test_bash_background_job(self, tmp_path, monkeypatch):
+        """Test background jobs with incremental output and kill."""
+        import time
+        import goopenbot.tools.jobs as jobs_module
+        from goopenbot.tools.jobs import JobKillTool, JobOutputTool, JobStatusTool
+
+        monkeypatch.setattr(jobs_module, "get_data_dir", lambda: tmp_path)
+
+        result = BashTool().execute(command="echo first; sleep 30; echo never", background=True)
+        assert result["success"] is True
+        job_id = result["output"].split()[-1]
+
+        deadline = time.time() + 5
+        while "first" not in JobOutputTool().execute(job_id=job_id)["output"]:
+            assert time.time() < deadline
+            time.sleep(0.05)
+
+        output = JobOutputTool().execute(job_id=job_id)["output"]
+        assert "running; next offset: 6" in output
+        assert "running" in JobStatusTool().execute(job_id=job_id)["output"]
+
+        log_path = jobs_module.get_job(job_id).log_path
+        assert "Killed job" in JobKillTool().execute(job_id=job_id)["output"]
+        assert "Unknown job" in JobStatusTool().execute(job_id=job_id)["output"]
+        assert not log_path.exists()
+
+    def test_background_job_reaped_after_output_read(self, tmp_path, monkeypatch):
+        """Test finished jobs are removed with their spool once fully read."""
+        import time
+        import goopenbot.tools.jobs as jobs_module
+        from goopenbot.tools.jobs import JobOutputTool, JobStatusTool
+
+        monkeypatch.setattr(jobs_module, "get_data_dir", lambda: tmp_path)
+
+        job_id = BashTool().execute(command="echo done", background=True)["output"].split()[-1]
+        job = jobs_module.get_job(job_id)
+        job.process.wait(timeout=5)
+
+        output = JobOutputTool().execute(job_id=job_id, limit=2)["output"]
+        assert "next offset: 2, 3 more bytes available" in output
+        assert job.log_path.exists()
+
+        output = JobOutputTool().execute(job_id=job_id, offset=2)["output"]
+        assert "exited with code 0; next offset: 5" in output
+        assert not job.log_path.exists()
+        assert "Unknown job" in JobStatusTool().execute(job_id=job_id)["output"]
+
+    def test_background_jobs_killed_at_exit(self, tmp_path, monkeypatch):
+        """Test the exit handler kills running jobs and removes their spools."""
+        import goopenbot.tools.jobs as jobs_module
+
+        monkeypatch.setattr(jobs_module, "get_data_dir", lambda: tmp_path)
+
+        job_id = BashTool().execute(command="sleep 30", background=True)["output"].split()[-1]
+        job = jobs_module.get_job(job_id)
+        jobs_module.reap_all_jobs()
+
+        assert job.process.poll() is not None
+        assert not job.log_path.exists()
+        assert jobs_module.get_job(job_id) is None
+
+    def test_git_tool(self, tmp_path):
+        """Test git status, diff, log and blame."""
+        import subprocess
+        from goopenbot.core.workspace import bump_generation
+        from goopenbot.tools.git import GitTool
+
+        def git(*args):
+            subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+        git("init", "-q", "-b", "main")
+        git("config", "user.email", "dev@example.com")
+        git("config", "user.name", "Dev")
+        (tmp_path / "a.py").write_text("one\ntwo\n")
+        git("add", "a.py")
+        git("commit", "-q", "-m", "Add a")
+
+        tool = GitTool()
+        assert "clean" in tool.execute(action="status", path=str(tmp_path))["output"]
+
+        # Files created outside the tools show up once the generation moves,
+        # as it does on every user turn
+        (tmp_path / "b.py").write_text("new")
+        bump_generation()
+        assert "?? b.py" in tool.execute(action="status", path=str(tmp_path))["output"]
+
+        WriteTool().execute(file_path=str(tmp_path / "a.py"), content="one\nthree\n")
+        status = tool.execute(action="status", path=str(tmp_path))["output"]
+        assert "branch: main" in status
+        assert " M a.py" in status
+        assert "?? b.py" in status
+
+        diff = tool.execute(action="diff", path=str(tmp_path))["output"]
+        assert "-two\n+three" in diff
+        assert "Add a" in tool.execute(action="log", path=str(tmp_path))["output"]
+        blame = tool.execute(action="blame", paths=["a.py"], path=str(tmp_path))["output"]
+        assert "| one" in blame
+
+    def test_git_tool_rejects_option_refs(self, tmp_path):
+        """Test refs that look like options are not passed to git."""
+        import subprocess
+        from goopenbot.tools.git import GitTool
+
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True, capture_output=True)
+        target = tmp_path / "written"
+        for action in ("diff", "log"):
+            result = GitTool().execute(action=action, ref=f"--output={target}", path=str(tmp_path))
+            assert result["success"] is False
+            assert "Invalid ref" in result["output"]
+        assert not target.exists()
+
+    def test_test_runner_selects_affected_tests(self, tmp_path):
+        """Test the test tool runs only tests importing changed files."""
+        from goopenbot.core.session import Session
+        from goopenbot.tools.testrunner import TestRunnerTool
+
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "__init__.py").write_text("")
+        (tmp_path / "pkg" / "core.py").write_text("def value():\n    return 1\n")
+        (tmp_path / "pkg" / "api.py").write_text("from .core import value\n")
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_api.py").write_text(
+            "from pkg.api import value\n\ndef test_value():\n    assert value() == 1\n"
+        )
+        (tmp_path / "tests" / "test_other.py").write_text("def test_other():\n    assert True\n")
+        # Files under ignored directories are not part of the import graph
+        (tmp_path / "venv" / "lib").mkdir(parents=True)
+        (tmp_path / "venv" / "lib" / "test_vendored.py").write_text("from pkg.api import value\n")
+
+        session = Session.create()
+        WriteTool(session=session).execute(
+            file_path=str(tmp_path / "pkg" / "core.py"), content="def value():\n    return 2\n"
+        )
+        result = TestRunnerTool(session=session).execute(path=str(tmp_path))
+
+        assert result["success"] is False
+        assert "Ran: tests/test_api.py\n" in result["output"]
+        assert "test_vendored" not in result["output"]
+        assert "test_other" not in result["output"]
+        assert "assert 2 == 1" in result["output"]
+        assert "1 failed" in result["output"]
+
+    def test_test_runner_full_run_uses_project_venv(self, tmp_path, monkeypatch):
+        """Test full runs use the project's interpreter and cache coverage in the workspace."""
+        import json
+        import os
+        import sys
+        import tempfile
+        from goopenbot.tools.testrunner import TestRunnerTool, load_coverage_map
+
+        work = tmp_path / "work"
+        (work / "tests").mkdir(parents=True)
+        (work / "calc.py").write_text("def double(x):\n    return 2 * x\n")
+        (work / "tests" / "test_calc.py").write_text(
+            "import sys\nsys.path.insert(0, '.')\nfrom calc import double\n\n"
+            "def test_double():\n    assert double(2) == 4\n"
+        )
+        python = work / ".venv" / "bin" / "python"
+        python.parent.mkdir(parents=True)
+        python.write_text(f'#!/bin/sh\necho "$@" >> "{tmp_path}/venv_calls"\nexec {sys.executable} "$@"\n')
+        python.chmod(0o755)
+        temp_dir = tmp_path / "tmp"
+        temp_dir.mkdir()
+        monkeypatch.setattr(tempfile, "tempdir", str(temp_dir))
+        monkeypatch.delenv("VIRTUAL_ENV", raising=False)
+
+        result = TestRunnerTool().execute(full=True, path=str(work))
+
+        assert result["success"] is True
+        assert "1 passed" in result["output"]
+        assert "pytest" in (tmp_path / "venv_calls").read_text()
+        assert os.listdir(temp_dir) == []
+        assert load_coverage_map(work)["calc.py"] == ["tests/test_calc.py"]
+        assert json.loads((work / ".goopenbot_cache" / "coverage.json").read_text())
+        assert (work / ".goopenbot_cache" / ".gitignore").read_text().endswith("*\n")
+
+    def test_symbols_tool(self, tmp_path, monkeypatch):
+        """Test symbol lookups and incremental refresh of the index."""
+        import goopenbot.core.symbols as symbols_module
+        from goopenbot.tools.symbols import SymbolsTool
+
+        monkeypatch.setattr(symbols_module, "get_data_dir", lambda: tmp_path / "data")
+        work = tmp_path / "work"
+        (work / "pkg").mkdir(parents=True)
+        (work / "pkg" / "models.py").write_text(
+            "class Store:\n    def get(self, key: str) -> int:\n        return 1\n\n"
+            "    def put(self, key, value):\n        pass\n"
+        )
+        (work / "pkg" / "api.py").write_text("from .models import Store\n\ndef handler():\n    pass\n")
+        (work / "node_modules" / "dep").mkdir(parents=True)
+        (work / "node_modules" / "dep" / "build.py").write_text("class Store:\n    pass\n")
+
+        tool = SymbolsTool()
+        define = tool.execute(action="define", name="Store.get", path=str(work))["output"]
+        assert define == "pkg/models.py:2-3 Store.get: def get(self, key: str) -> int"
+        define = tool.execute(action="define", name="Store", path=str(work))["output"]
+        assert "node_modules" not in define
+        members = tool.execute(action="members", name="Store", path=str(work))["output"]
+        assert "5-6 def put(self, key, value)" in members
+        importers = tool.execute(action="importers", name="pkg.models", path=str(work))["output"]
+        assert importers == "pkg/api.py:1 from pkg.models import Store"
+
+        index = symbols_module.SymbolIndex(work)
+        assert index.refresh() == 0  # loaded from disk, nothing changed
+        WriteTool().execute(file_path=str(work / "pkg" / "api.py"), content="def other():\n    pass\n")
+        assert index.refresh() == 1
+        assert index.importers("Store") == []
+
+    def test_repo_map(self, tmp_path, monkeypatch):
+        """Test the repo map ranks imported files first and respects the budget."""
+        import goopenbot.core.repomap as repomap_module
+        import goopenbot.core.symbols as symbols_module
+
+        monkeypatch.setattr(symbols_module, "get_data_dir", lambda: tmp_path / "data")
+        monkeypatch.setattr(repomap_module, "get_data_dir", lambda: tmp_path / "data")
+        work = tmp_path / "work"
+        (work / "pkg").mkdir(parents=True)
+        (work / ".venv").mkdir()
+        (work / ".venv" / "lib.py").write_text("def hidden():\n    pass\n")
+        (work / "pkg" / "core.py").write_text("class Engine:\n    def start(self):\n        pass\n")
+        (work / "pkg" / "cli.py").write_text("from pkg.core import Engine\n\ndef main():\n    pass\n")
+
+        text = repomap_module.get_repo_map(work, token_budget=200)
+        assert "pkg/ (2 files)" in text
+        assert text.index("pkg/core.py\n  class Engine: start") < text.index("pkg/cli.py\n  def main()")
+        assert "hidden" not in text and ".venv" not in text
+
+        small = repomap_module.build_repo_map(work, token_budget=20)
+        assert repomap_module.estimate_tokens(small) <= 20
+        assert "pkg/cli.py" not in small
+
+        (work / "pkg" / "cli.py").write_text("def main(argv):\n    pass\n")
+        assert "def main(argv)" in repomap_module.get_repo_map(work, token_budget=200)
+
+    def test_search_tool(self, tmp_path):
+        """Test BM25 ranking, identifier splitting and incremental updates."""
+        from goopenbot.core.lexical import get_lexical_index, tokenize
+        from goopenbot.tools.search import SearchTool
+
+        assert tokenize("refreshAuthToken auth_token") == [
+            "refreshauthtoken", "refresh", "auth", "token", "auth_token", "auth", "token"
+        ]
+
+        (tmp_path / "auth.py").write_text(
+            "import os\n\n\ndef refreshAuthToken(client):\n    token = client.token\n"
+            "    return refresh(token)\n"
+        )
+        (tmp_path / "notes.md").write_text("We refresh the page.\n" + "filler text\n" * 50)
+        (tmp_path / "other.py").write_text("def unrelated():\n    pass\n")
+
+        tool = SearchTool()
+        result = tool.execute(query="refresh auth token", path=str(tmp_path))
+        assert result["success"] is True
+        output = result["output"]
+        assert output.startswith("auth.py (score")
+        assert "lines 4-6" in output and "def refreshAuthToken(client):" in output
+        assert output.index("auth.py") < output.index("notes.md")
+        assert "other.py" not in output
+
+        (tmp_path / "other.py").write_text("AUTH_TOKEN = None\n")
+        assert get_lexical_index(tmp_path).refresh() == 0
+        output = tool.execute(query="auth token", path=str(tmp_path), glob="other.py")["output"]
+        assert output.startswith("other.py (score")
+        assert "auth.py" not in output
+
+    def test_semantic_search_tool(self, tmp_path, monkeypatch):
+        """Test semantic search against a local stand-in embeddings server."""
+        pytest.importorskip("numpy")
+        import json
+        import re
+        import threading
+        import zlib
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        import goopenbot.core.provider as provider_module
+        import goopenbot.core.vectors as vectors_module
+        from goopenbot.core.config import Config, ProviderConfig
+        from goopenbot.tools.semantic_search import SemanticSearchTool
+
+        requests = []
+
+        class EmbeddingsHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                requests.append(body["input"])
+                data = []
+                for i, text in enumerate(body["input"]):
+                    vector = [0.0] * 64
+                    for word in re.findall(r"[a-z]+", text.lower()):
+                        vector[zlib.crc32(word.encode()) % 64] += 1.0
+                    data.append({"object": "embedding", "index": i, "embedding": vector})
+                payload = json.dumps(
+                    {"object": "list", "data": data, "model": body["model"], "usage": {}}
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), EmbeddingsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        config = Config(
+            provider=ProviderConfig(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+        )
+        monkeypatch.setattr(provider_module, "load_config", lambda: config)
+        monkeypatch.setattr(vectors_module, "get_data_dir", lambda: tmp_path / "data")
+
+        work = tmp_path / "work"
+        work.mkdir()
+        (work / "auth.py").write_text(
+            "def renew(session):\n    # refresh the expired token\n    return session\n\n\n"
+            "def render_page(html):\n    return html\n"
+        )
+        try:
+            tool = SemanticSearchTool()
+            result = tool.execute(query="refresh expired token", k=1, path=str(work))
+            assert result["success"] is True
+            assert result["output"].startswith("auth.py:1-3 (score")
+            assert "def renew(session):" in result["output"]
+            embedded = sum(len(batch) for batch in requests)
+
+            # After an edit only the new chunk (and the query) are embedded
+            with open(work / "auth.py", "a") as f:
+                f.write("\n\ndef logout():\n    pass\n")
+            tool.execute(query="log out", path=str(work))
+            assert sum(len(batch) for batch in requests) == embedded + 2
+        finally:
+            server.shutdown()
+
     def test_edit_tool(self, tmp_path):
         """Test edit tool."""
         test_file = tmp_path / "test.txt"
@@ -126,6 +745,97 @@ class TestTools:
         assert result["success"] is True
         assert test_file.read_text() == "Hello Python"
 
+    def test_edit_tool_tolerates_indentation(self, tmp_path):
+        """Test edit tool matches despite wrong indentation and whitespace."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text("class A:\n    def f(self):\n        return 1\n")
+
+        result = EditTool().execute(
+            file_path=str(test_file),
+            old_string="def f(self):  \n    return 1\n",
+            new_string="def f(self):\n    return 2\n",
+        )
+
+        assert result["success"] is True
+        assert "relative indentation" in result["output"]
+        assert test_file.read_text() == "class A:\n    def f(self):\n        return 2\n"
+
+    def test_edit_tool_ambiguous_and_closest(self, tmp_path):
+        """Test edit tool rejects ambiguous matches and shows the closest candidate."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text("x = 1\nx = 1\ny = 2\n")
+
+        tool = EditTool()
+        result = tool.execute(file_path=str(test_file), old_string="x = 1", new_string="x = 3")
+        assert result["success"] is False
+        assert "matches 2 places" in result["output"]
+
+        result = tool.execute(file_path=str(test_file), old_string="y = 5", new_string="y = 3")
+        assert result["success"] is False
+        assert "Closest match (lines 3-3" in result["output"]
+        assert test_file.read_text() == "x = 1\nx = 1\ny = 2\n"
+
+    def test_edit_tool_fuzzy_rejects_near_miss(self, tmp_path):
+        """Test a short old_string one token away from a line is not fuzzily applied."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text("def f(a, c):\n    return compute(a, c)\n")
+
+        result = EditTool().execute(
+            file_path=str(test_file),
+            old_string="return compute(a, b)",
+            new_string="return compute(b, a)",
+        )
+
+        assert result["success"] is False
+        assert "Closest match (lines 2-2" in result["output"]
+        assert test_file.read_text() == "def f(a, c):\n    return compute(a, c)\n"
+
+    def test_edit_tool_fuzzy_is_bounded(self, tmp_path):
+        """Test fuzzy matching of a long block in a large file stays fast."""
+        import time
+
+        lines = [f"    value_{i} = compute(arg_{i % 7}, other_{i}) + {i}" for i in range(5000)]
+        test_file = tmp_path / "big.py"
+        test_file.write_text("\n".join(lines) + "\n")
+        old = lines[2500:2550]
+        old[1] = old[1].replace("compute", "compte")
+
+        started = time.monotonic()
+        result = EditTool().execute(
+            file_path=str(test_file), old_string="\n".join(old), new_string="    replaced = 1"
+        )
+
+        assert time.monotonic() - started < 5
+        assert result["success"] is True
+        assert "fuzzy" in result["output"]
+        assert "value_2500 " not in test_file.read_text()
+
+    def test_edit_tool_reports_diff(self, tmp_path):
+        """Test edit and write results are compact diffs."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text("".join(f"line{i}\n" for i in range(50)))
+
+        result = EditTool().execute(
+            file_path=str(test_file), old_string="line25\n", new_string="changed\n"
+        )
+
+        assert "+1 -1 lines" in result["output"]
+        assert "-line25\n+changed" in result["output"]
+        assert "line10" not in result["output"]
+
+        result = WriteTool().execute(file_path=str(test_file), content="fresh\n")
+        assert "+1 -50 lines" in result["output"]
+
+        # Lines that look like diff headers still count
+        sql = tmp_path / "query.sql"
+        sql.write_text("-- note\nselect 1;\n")
+        result = EditTool().execute(file_path=str(sql), old_string="-- note\n", new_string="")
+        assert "+0 -1 lines" in result["output"]
+        result = EditTool().execute(
+            file_path=str(sql), old_string="select 1;\n", new_string="select 1;\n++i;\n"
+        )
+        assert "+1 -0 lines" in result["output"]
+
     def test_edit_tool_string_not_found(self, tmp_path):
         """Test edit tool with non-existent string."""
         test_file = tmp_path / "test.txt"
@@ -140,6 +850,42 @@ class TestTools:
 
         assert result["success"] is False
 
+    def test_multi_edit_tool(self, tmp_path):
+        """Test multi edit applies all edits across files."""
+        a = tmp_path / "a.py"
+        b = tmp_path / "b.py"
+        a.write_text("x = 1\ny = 2\n")
+        b.write_text("z = x\n")
+
+        tool = MultiEditTool()
+        result = tool.execute(edits=[
+            {"file_path": str(a), "old_string": "x = 1", "new_string": "x = 10"},
+            {"file_path": str(a), "old_string": "x = 10\ny", "new_string": "x = 10\nw"},
+            {"file_path": str(b), "old_string": "x", "new_string": "w"},
+        ])
+
+        assert result["success"] is True
+        assert a.read_text() == "x = 10\nw = 2\n"
+        assert b.read_text() == "z = w\n"
+
+    def test_multi_edit_tool_all_or_nothing(self, tmp_path):
+        """Test multi edit writes nothing when any edit fails."""
+        a = tmp_path / "a.py"
+        b = tmp_path / "b.py"
+        a.write_text("x = 1\n")
+        b.write_text("z = 2\n")
+
+        tool = MultiEditTool()
+        result = tool.execute(edits=[
+            {"file_path": str(a), "old_string": "x = 1", "new_string": "x = 10"},
+            {"file_path": str(b), "old_string": "missing", "new_string": "y"},
+        ])
+
+        assert result["success"] is False
+        assert "edit 2" in result["output"]
+        assert a.read_text() == "x = 1\n"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.py", "b.py"]
+
 
 class TestConfig:
     """Test configuration."""
@@ -168,6 +914,28 @@ class TestConfig:
         assert data_dir.exists()
         assert data_dir.name == "goopenbot"
 
+    def test_load_agent(self, tmp_path, monkeypatch):
+        """Test agent definitions are parsed from markdown frontmatter."""
+        import goopenbot.core.agents as agents_module
+
+        monkeypatch.setattr(agents_module, "get_config_dir", lambda: tmp_path)
+        (tmp_path / "agents").mkdir()
+        (tmp_path / "agents" / "reviewer.md").write_text(
+            "---\nname: reviewer\nmodel: qwen2.5-coder:14b\ntools:\n  - read\n  - grep\n"
+            "max_iterations: 5\n---\n\n# Reviewer\n\nReview code without changing it.\n"
+        )
+
+        agent = agents_module.load_agent("reviewer")
+        assert agent.model == "qwen2.5-coder:14b"
+        assert agent.tools == ["read", "grep"]
+        assert agent.max_iterations == 5
+        assert agent.system_prompt == "# Reviewer\n\nReview code without changing it."
+        assert agents_module.load_agent("reviewer") is agent
+        assert agents_module.load_agent("missing") is None
+
+        names = [s["function"]["name"] for s in get_tools_schema(agent.tools)]
+        assert names == ["read", "grep"]
+
 
 class TestSession:
     """Test session management."""
@@ -192,29 +960,469 @@ class TestSession:
         assert session.messages[0]["role"] == "user"
         assert session.messages[0]["content"] == "Hello"
 
-    def test_session_store(self, tmp_path):
+    def test_session_store(self, tmp_path, monkeypatch):
         """Test session storage."""
         from goopenbot.core.session import Session, SessionStore
 
         # Override data dir for test
-        import goopenbot.core.config
-        original_data_dir = goopenbot.core.config.get_data_dir
-        goopenbot.core.config.get_data_dir = lambda: tmp_path
+        isolate_data_dir(monkeypatch, tmp_path)
+
+        store = SessionStore()
+        session = Session.create(model="test")
+        session.add_message("user", "Test")
+
+        store.save(session)
+        loaded = store.get(session.id)
+
+        assert loaded is not None
+        assert loaded.id == session.id
+        assert loaded.model == "test"
+        assert len(loaded.messages) == 1
+        assert (tmp_path / "sessions.db").exists()
+
+    def test_checkpoint_rollback(self, tmp_path):
+        """Test file snapshots per turn and rollback."""
+        from goopenbot.core.checkpoint import CheckpointStore
+        from goopenbot.core.session import Session
+
+        work = tmp_path / "work"
+        work.mkdir()
+        target = work / "a.txt"
+        target.write_text("v0")
+
+        session = Session.create()
+        session.checkpoints = CheckpointStore(data_dir=tmp_path)
+
+        session.add_message("user", "turn 1")
+        WriteTool(session=session).execute(file_path=str(target), content="v1")
+        WriteTool(session=session).execute(file_path=str(work / "new.txt"), content="n")
+        session.add_message("user", "turn 2")
+        EditTool(session=session).execute(file_path=str(target), old_string="v1", new_string="v2")
+
+        assert session.checkpoints.list_turns(session.id) == [(1, 2), (2, 1)]
+
+        session.checkpoints.rollback(session.id, 1)
+        assert target.read_text() == "v1"
+        assert (work / "new.txt").exists()
+
+        session.checkpoints.rollback(session.id, 0)
+        assert target.read_text() == "v0"
+        assert not (work / "new.txt").exists()
+
+    def test_checkpoint_rollback_restores_mode(self, tmp_path):
+        """Test rollback restores an executable file's permissions."""
+        import stat
+        from goopenbot.core.checkpoint import CheckpointStore
+        from goopenbot.core.session import Session
 
+        script = tmp_path / "run.sh"
+        script.write_text("#!/bin/sh\necho v0\n")
+        script.chmod(0o755)
+
+        session = Session.create()
+        session.checkpoints = CheckpointStore(data_dir=tmp_path)
+        session.add_message("user", "turn 1")
+        EditTool(session=session).execute(file_path=str(script), old_string="v0", new_string="v1")
+        script.chmod(0o600)
+
+        session.checkpoints.rollback(session.id, 0)
+        assert script.read_text() == "#!/bin/sh\necho v0\n"
+        assert stat.S_IMODE(script.stat().st_mode) == 0o755
+
+
+class TestWorkspace:
+    """Test workspace snapshots."""
+
+    def test_workspace_snapshot_prunes_and_relists(self, tmp_path, monkeypatch):
+        """Test snapshots skip ignored directories and re-list only changed ones."""
+        import goopenbot.core.workspace as workspace_module
+
+        monkeypatch.setattr(workspace_module, "INotify", None)
+        (tmp_path / ".gitignore").write_text("build/\n")
+        (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+        (tmp_path / "node_modules" / "dep" / "index.js").write_text("")
+        (tmp_path / "build").mkdir()
+        (tmp_path / "build" / "out.py").write_text("")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.py").write_text("")
+
+        snapshot = workspace_module.WorkspaceSnapshot(tmp_path)
+        assert "node_modules" in snapshot.entries and "build" in snapshot.entries
+        assert not any(rel.startswith(("node_modules/", "build/")) for rel in snapshot.entries)
+        assert "node_modules" not in snapshot.dir_mtimes
+
+        rebuild = snapshot.rebuild
+        monkeypatch.setattr(snapshot, "rebuild", lambda: pytest.fail("full rebuild"))
+        (tmp_path / "src" / "a.py").unlink()
+        (tmp_path / "src" / "b.py").write_text("")
+        (tmp_path / "src" / "sub").mkdir()
+        (tmp_path / "src" / "sub" / "c.py").write_text("")
+        (tmp_path / "node_modules" / "dep" / "more.js").write_text("")
+        snapshot.ensure_fresh()
+        assert sorted(rel for rel, *_ in snapshot.match("src/**/*.py")) == ["src/b.py", "src/sub/c.py"]
+        assert "node_modules/dep/more.js" not in snapshot.entries
+
+        monkeypatch.setattr(snapshot, "rebuild", rebuild)
+        (tmp_path / ".gitignore").write_text("")
+        snapshot.refresh_path(".gitignore")
+        assert "build/out.py" in snapshot.entries
+
+
+class TestOrchestrator:
+    """Test the agent loop and sub-agents."""
+
+    def test_task_tool_runs_scoped_sub_agents(self, tmp_path, monkeypatch):
+        """Test sub-agents run concurrently, scoped to their directories."""
+        import json
+
+        import goopenbot.core.provider as provider_module
+        from goopenbot.core.config import Config, ProviderConfig
+        from goopenbot.core.checkpoint import CheckpointStore
+        from goopenbot.core.session import Session
+        from goopenbot.tools.task import TaskTool
+
+        def reply(body):
+            messages = body["messages"]
+            prompt = next(m["content"] for m in messages if m["role"] == "user")
+            if messages[-1]["role"] == "tool":
+                return f"Wrote {prompt}"
+            return json.dumps(
+                {"name": "write", "arguments": {"file_path": "out.txt", "content": prompt}}
+            )
+
+        server, state = start_chat_server(reply, delay=0.1)
+        config = Config(
+            provider=ProviderConfig(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+        )
+        monkeypatch.setattr(provider_module, "load_config", lambda: config)
+        isolate_data_dir(monkeypatch, tmp_path / "data")
+        parent = Session.create()
+        parent.checkpoints = CheckpointStore(data_dir=tmp_path / "data")
+        parent.add_message("user", "split the work")
+
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
         try:
-            store = SessionStore()
-            session = Session.create(model="test")
-            session.add_message("user", "Test")
+            result = TaskTool(session=parent).execute(
+                tasks=[{"prompt": name, "path": str(tmp_path / name)} for name in ("a", "b", "c")],
+                max_parallel=2,
+            )
+        finally:
+            server.shutdown()
+
+        assert result["success"] is True
+        assert "## Task 2" in result["output"] and "Wrote b" in result["output"]
+        for name in ("a", "b", "c"):
+            assert (tmp_path / name / "out.txt").read_text() == name
+        assert state["peak"] == 2
+
+        # Sub-agent writes belong to the parent's turn
+        outputs = {str(tmp_path / name / "out.txt") for name in ("a", "b", "c")}
+        assert parent.changed_files == outputs
+        assert parent.checkpoints.list_turns(parent.id) == [(1, 3)]
+        parent.checkpoints.rollback(parent.id, 0)
+        assert not any((tmp_path / name / "out.txt").exists() for name in ("a", "b", "c"))
 
-            store.save(session)
-            loaded = store.get(session.id)
+    def test_constrained_tool_calls(self, tmp_path, monkeypatch):
+        """Test models without native tools get a JSON action schema every turn."""
+        import asyncio
+        import json
 
-            assert loaded is not None
-            assert loaded.id == session.id
-            assert loaded.model == "test"
-            assert len(loaded.messages) == 1
+        import goopenbot.core.provider as provider_module
+        from goopenbot.core.config import Config, ProviderConfig
+        from goopenbot.core.orchestrator import run_agent
+        from goopenbot.core.session import Session
+
+        (tmp_path / "notes.txt").write_text("notes")
+        formats = []
+
+        def reply(body):
+            schema = body["response_format"]["json_schema"]["schema"]
+            formats.append({v["properties"]["name"]["const"] for v in schema["anyOf"]})
+            if body["messages"][-1]["role"] == "user":
+                action = {"name": "read", "arguments": {"file_path": str(tmp_path / "notes.txt")}}
+            else:
+                action = {"name": "final_answer", "arguments": {"answer": "The notes say notes"}}
+            return json.dumps(action)
+
+        server, _ = start_chat_server(reply)
+        config = Config(
+            provider=ProviderConfig(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+        )
+        monkeypatch.setattr(provider_module, "load_config", lambda: config)
+        isolate_data_dir(monkeypatch, tmp_path / "data")
+
+        session = Session.create(model="phi")
+        session.add_message("user", "read my notes")
+        try:
+            answer = asyncio.run(
+                run_agent(provider_module.OllamaProvider(model="phi"), session, ["read", "grep"])
+            )
         finally:
-            goopenbot.core.config.get_data_dir = original_data_dir
+            server.shutdown()
+
+        assert answer == "The notes say notes"
+        assert formats == [{"read", "grep", "final_answer"}] * 2
+        # Model stats are only kept for the router
+        assert not (tmp_path / "data" / "model_stats.db").exists()
+        assert json.loads(session.messages[2]["content"])["success"] is True
+
+
+class TestBatch:
+    """Test headless batch runs."""
+
+    def test_batch_streams_results_and_resumes(self, tmp_path, monkeypatch):
+        """Test batch runs write JSONL results and resume skips finished tasks."""
+        import asyncio
+        import json
+
+        import goopenbot.core.batch as batch_module
+        import goopenbot.core.provider as provider_module
+        from goopenbot.core.config import Config, ProviderConfig
+
+        def reply(body):
+            prompt = body["messages"][-1]["content"]
+            if prompt == "slow":
+                import time
+
+                time.sleep(0.5)
+            return f"answer to {prompt}"
+
+        server, state = start_chat_server(reply)
+        config = Config(
+            provider=ProviderConfig(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+        )
+        monkeypatch.setattr(provider_module, "load_config", lambda: config)
+        isolate_data_dir(monkeypatch, tmp_path)
+
+        tasks_file = tmp_path / "tasks.jsonl"
+        tasks_file.write_text(
+            '{"id": "one", "message": "hello"}\n'
+            '{"message": "slow", "timeout": 0.1}\n'
+        )
+        output = tmp_path / "results.jsonl"
+        tasks = batch_module.load_tasks(tasks_file)
+        try:
+            asyncio.run(batch_module.run_batch(tasks, output, lambda agent: "system"))
+            results = {r["id"]: r for r in map(json.loads, output.read_text().splitlines())}
+            assert results["one"]["status"] == "ok"
+            assert results["one"]["answer"] == "answer to hello"
+            assert results["one"]["prompt_tokens"] == 10
+            assert results["one"]["session_id"]
+            assert results["2"]["status"] == "timeout"
+
+            requests = state["requests"]
+            del tasks[1]["timeout"]
+            asyncio.run(
+                batch_module.run_batch(tasks, output, lambda agent: "system", timeout=5, resume=True)
+            )
+        finally:
+            server.shutdown()
+        assert state["requests"] == requests + 1
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [r["id"] for r in lines] == ["one", "2", "2"]
+        assert lines[-1]["answer"] == "answer to slow"
+
+
+class TestDaemon:
+    """Test the long-lived daemon."""
+
+    def test_daemon_serves_runs_and_sessions(self, tmp_path, monkeypatch):
+        """Test the daemon streams run events and answers session requests."""
+        import asyncio
+        import json
+
+        import goopenbot.core.provider as provider_module
+        from goopenbot.core.config import Config, ProviderConfig
+        from goopenbot.core.client import open_client
+        from goopenbot.core.daemon import Daemon
+
+        def reply(body):
+            if body["messages"][-1]["role"] == "tool":
+                return "Done"
+            return json.dumps({"name": "write", "arguments": {"file_path": "out.txt", "content": "hi"}})
+
+        server, state = start_chat_server(reply, delay=0.2)
+        config = Config(
+            provider=ProviderConfig(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+        )
+        monkeypatch.setattr(provider_module, "load_config", lambda: config)
+        isolate_data_dir(monkeypatch, tmp_path)
+        workdirs = [tmp_path / "work", tmp_path / "other"]
+        for workdir in workdirs:
+            workdir.mkdir()
+
+        async def scenario():
+            daemon = Daemon(lambda agent: "system", path=tmp_path / "d.sock")
+            await daemon.start()
+            serving = asyncio.create_task(daemon.serve_forever())
+
+            async def run(workdir):
+                client = await open_client(daemon.path)
+                return [e async for e in client.request("run", message="go", dir=str(workdir))]
+
+            try:
+                runs = await asyncio.gather(*(run(workdir) for workdir in workdirs))
+                client = await open_client(daemon.path)
+                sessions = await client.call("sessions")
+            finally:
+                serving.cancel()
+            return runs, sessions
+
+        try:
+            runs, sessions = asyncio.run(scenario())
+        finally:
+            server.shutdown()
+
+        for events, workdir in zip(runs, workdirs):
+            kinds = [e["type"] for e in events]
+            assert kinds == ["session", "tool", "tool_result", "assistant", "done"]
+            assert events[2]["success"] is True
+            assert (workdir / "out.txt").read_text() == "hi"
+        # Runs from two clients overlap instead of queueing
+        assert state["peak"] == 2
+        assert {s["id"] for s in sessions["sessions"]} == {
+            events[-1]["session_id"] for events in runs
+        }
+        assert not (tmp_path / "d.sock").exists()
+
+
+class TestRouter:
+    """Test per-turn model routing."""
+
+    def test_router_picks_model_per_turn(self, tmp_path, monkeypatch):
+        """Test tool turns go to the small model and final answers to the large one."""
+        import asyncio
+        import json
+
+        import goopenbot.core.provider as provider_module
+        from goopenbot.core.config import Config, ProviderConfig, RouterConfig
+        from goopenbot.core.orchestrator import run_agent
+        from goopenbot.core.router import ModelStatsStore, choose_model
+        from goopenbot.core.session import Session
+
+        router = RouterConfig(enabled=True, tool_model="small", escalate_after=2)
+        failed = {"role": "tool", "content": json.dumps({"success": False})}
+        user = {"role": "user", "content": "hi"}
+        assert choose_model([user], router, "big") == "big"
+        assert choose_model([user, failed], router, "big") == "small"
+        assert choose_model([user, failed, failed], router, "big") == "big"
+
+        (tmp_path / "notes.txt").write_text("notes")
+        seen = []
+
+        def reply(body):
+            seen.append(body["model"])
+            if body["messages"][-1]["role"] == "user":
+                return json.dumps({"name": "read", "arguments": {"file_path": str(tmp_path / "notes.txt")}})
+            return f"answer from {body['model']}"
+
+        server, _ = start_chat_server(reply)
+        config = Config(
+            provider=ProviderConfig(base_url=f"http://127.0.0.1:{server.server_port}/v1"),
+            router=router,
+        )
+        monkeypatch.setattr(provider_module, "load_config", lambda: config)
+        isolate_data_dir(monkeypatch, tmp_path)
+
+        session = Session.create(model="big")
+        session.add_message("user", "read my notes")
+        try:
+            answer = asyncio.run(run_agent(provider_module.OllamaProvider(model="big"), session))
+        finally:
+            server.shutdown()
+
+        assert seen == ["big", "small", "big"]
+        assert answer == "answer from big"
+        stats = {row["model"]: row for row in ModelStatsStore().list()}
+        assert stats["big"]["calls"] == 2 and stats["small"]["calls"] == 1
+        assert stats["big"]["tool_calls"] == 1 and stats["big"]["tool_failures"] == 0
+
+
+class TestMemo:
+    """Test tool result memoisation."""
+
+    def test_tool_memo(self, tmp_path, monkeypatch):
+        """Test pure tool calls are memoised until a write bumps the generation."""
+        import goopenbot.core.memo as memo_module
+        from goopenbot.core.memo import ToolMemo, execute_tool
+        from goopenbot.core.session import Session
+
+        memo = ToolMemo(max_bytes=10_000)
+        monkeypatch.setattr(memo_module, "_memo", memo)
+        (tmp_path / "a.py").write_text("x = 1\n")
+
+        first = execute_tool(GlobTool(), {"pattern": "*.py", "path": str(tmp_path)})
+        second = execute_tool(GlobTool(), {"path": str(tmp_path), "pattern": "*.py"})
+        assert second == first
+        assert memo.stats()["hits"] == 1
+
+        execute_tool(WriteTool(), {"file_path": str(tmp_path / "b.py"), "content": "y = 2\n"})
+        third = execute_tool(GlobTool(), {"pattern": "*.py", "path": str(tmp_path)})
+        assert "b.py" in third["output"]
+        assert memo.stats()["hits"] == 1
+
+        # Session re-reads are left to the read tool's own stub, and forced
+        # reads always go to the disk
+        session = Session.create()
+        assert ReadTool().memoizable(file_path="a.py")
+        assert not ReadTool(session=session).memoizable(file_path="a.py")
+        assert not ReadTool().memoizable(file_path="a.py", force=True)
+        args = {"file_path": str(tmp_path / "a.py"), "force": True}
+        execute_tool(ReadTool(session=session), args)
+        (tmp_path / "a.py").write_text("x = 3\n")
+        assert "x = 3" in execute_tool(ReadTool(session=session), args)["output"]
+
+        # Least recently used results are evicted to stay within the byte budget
+        (tmp_path / "big.txt").write_text(("z" * 79 + "\n") * 50)
+        for _ in range(2):
+            for offset in range(3):
+                execute_tool(ReadTool(), {"file_path": str(tmp_path / "big.txt"), "offset": offset})
+        stats = memo.stats()
+        assert stats["bytes"] <= 10_000 and stats["evictions"] > 0
+
+
+class TestPrefetch:
+    """Test speculative prefetch."""
+
+    def test_prefetch_serves_likely_reads(self, tmp_path, monkeypatch):
+        """Test imports of a read module are prefetched and served to later reads."""
+        import time
+
+        import goopenbot.core.prefetch as prefetch_module
+        from goopenbot.core.memo import execute_tool
+        from goopenbot.core.prefetch import Prefetcher, grep_candidates
+
+        prefetcher = Prefetcher(max_bytes=100_000)
+        monkeypatch.setattr(prefetch_module, "_prefetcher", prefetcher)
+        pkg = tmp_path / "pkg"
+        pkg.mkdir()
+        (pkg / "__init__.py").write_text("")
+        (pkg / "main.py").write_text("import os\nimport pkg.models\nfrom .util import helper\n")
+        (pkg / "util.py").write_text("def helper():\n    return 1\n")
+        (pkg / "models.py").write_text("class Model:\n    pass\n")
+
+        assert grep_candidates(f"{pkg}/a.py:3: x\n{pkg}/a.py:9: y\n{pkg}/b.py:1: z") == [
+            pkg / "a.py",
+            pkg / "b.py",
+        ]
+
+        execute_tool(ReadTool(), {"file_path": str(pkg / "main.py")})
+        deadline = time.monotonic() + 5
+        while prefetcher.stats()["prefetched"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert prefetcher.stats()["prefetched"] == 2
+
+        result = ReadTool().execute(file_path=str(pkg / "models.py"))
+        assert "class Model" in result["output"]
+        assert prefetcher.stats()["used"] == 1
+
+        # A file changed after it was prefetched is read from disk again
+        (pkg / "util.py").write_text("def helper():\n    return 22\n")
+        result = ReadTool().execute(file_path=str(pkg / "util.py"))
+        assert "return 22" in result["output"]
+        stats = prefetcher.stats()
+        assert stats["used"] == 1 and stats["accuracy"] == 0.5 and stats["wasted_bytes"] > 0
 
 
 if __name__ == "__main__":